@@ -1,2 +1,5 @@
-from .incraf import IncrAFSolver, make_argument, make_attack
-from .vcsolver import SimpleVertexCoverSolver, BussSolver
\ No newline at end of file
+from .incraf import IncrAFSolver, SolveStatus, SolveProfile, SymbolTable, PROFILES, make_argument, make_attack, argument_id, argument_term, to_argument, to_attack
+from .vcsolver import SimpleVertexCoverSolver, BussSolver
+from .parallel import ParallelAFSolver
+from .propagator import PropagatorAFSolver
+from .sharding import ShardedAFSolver
@@ -0,0 +1,6 @@
+"""
+Benchmarks for the incremental AF solver.
+
+The benchmarks load encodings by relative paths, so they are meant to be run
+from the repository root, e.g. `python -m benchmarks.bulk`.
+"""
@@ -0,0 +1,105 @@
+"""
+The solvers compared by the benchmarks, all behind the `AFSolver` interface.
+"""
+import os
+
+from clingo.control import Control
+from clingo.symbol import Function, Number
+
+from ipafair import AFSolver
+from incraf import ENCODINGS, IncrAFSolver
+
+from typing import Callable, Dict, List, Set, Tuple
+
+# The static ASPARTIX encoding of every semantics. Preferred extensions are found by the saturation encoding.
+STATIC_ENCODINGS = {
+    "naive": "dung/naive.dl",
+    "adm": "dung/adm.dl",
+    "stable": "dung/stable.dl",
+    "comp": "dung/comp.dl",
+    "pref": "dung/prefex_gringo.lp",
+}
+
+class StaticSolver(AFSolver):
+    """
+    Baseline that grounds and solves the static ASPARTIX encoding of the semantics, see `STATIC_ENCODINGS`,
+    in a fresh `Control` for every query, from facts for the current AF.
+    """
+    def __init__(self, sigma: str, af_file: str | None = None):
+        self.sigma = sigma
+        self.arguments: Set[int] = set()
+        self.attacks: Set[Tuple[int, int]] = set()
+        self.witness: List[int] = []
+
+    def __del__(self):
+        pass
+
+    def add_argument(self, arg: int):
+        self.arguments.add(arg)
+
+    def del_argument(self, arg: int):
+        self.arguments.discard(arg)
+        self.attacks = {(s, t) for s, t in self.attacks if arg != s and arg != t}
+
+    def add_attack(self, source: int, target: int):
+        self.attacks.add((source, target))
+
+    def del_attack(self, source: int, target: int):
+        self.attacks.discard((source, target))
+
+    def __control(self) -> Control:
+        ctl = Control(arguments=["--models=0"])
+        ctl.load(STATIC_ENCODINGS[self.sigma])
+        facts = [f"arg({a})." for a in self.arguments] + [f"att({s},{t})." for s, t in self.attacks]
+        ctl.add("base", [], "\n".join(facts) + "\n#show in/1.")
+        ctl.ground([("base", [])])
+        return ctl
+
+    def __first_model(self, ctl: Control, assumptions: List[Tuple[Function, bool]]) -> List[int] | None:
+        model = None
+        def on_model(m):
+            nonlocal model
+            model = [s.arguments[0].number for s in m.symbols(shown=True)]
+            return False
+
+        ctl.solve(assumptions, on_model=on_model)
+        return model
+
+    def solve_cred(self, assumps: List[int]) -> bool:
+        ctl = self.__control()
+        model = self.__first_model(ctl, [(Function("in", [Number(a)]), True) for a in assumps])
+        self.witness = model or []
+        return model is not None
+
+    def solve_skept(self, assumps: List[int]) -> bool:
+        ctl = self.__control()
+        for a in assumps:
+            model = self.__first_model(ctl, [(Function("in", [Number(a)]), False)])
+            if model is not None:
+                self.witness = model
+                return False
+        self.witness = []
+        return True
+
+    def extract_witness(self) -> List[int]:
+        return self.witness
+
+def naive_solver(sigma: str) -> AFSolver:
+    """
+    Returns the SAT-based `NaiveSolver` from `ipafair/solver.py`, which needs its shared library built
+    with `make` in `ipafair/`. Raises `IOError` if it is missing and `KeyError` for semantics it lacks.
+    """
+    from ipafair.solver import NaiveSolver, LIBPATH
+    if not os.path.exists(LIBPATH):
+        raise IOError("Shared library not found. Please run 'make' in ipafair/ to build.")
+    return NaiveSolver({"adm": "AD", "stable": "ST"}[sigma])
+
+# Factories by name, each taking the semantics.
+BACKENDS: Dict[str, Callable[[str], AFSolver]] = {
+    "incr": IncrAFSolver,
+    "static": StaticSolver,
+    "naive": naive_solver,
+}
+
+# The semantics supported by any of the backends. Runs of a backend lacking one are skipped.
+SEMANTICS = list(dict.fromkeys([*ENCODINGS, *STATIC_ENCODINGS]))
@@ -0,0 +1,48 @@
+"""
+Compares loading an AF into `IncrAFSolver` one argument and attack at a time
+with loading it through the bulk methods `add_arguments` and `add_attacks`.
+"""
+import argparse
+import time
+
+from incraf import IncrAFSolver
+from benchmarks.generators import random_af
+
+def load_per_item(sigma: str, args, attacks) -> IncrAFSolver:
+    af = IncrAFSolver(sigma)
+    for a in args:
+        af.add_argument(a)
+    for s, t in attacks:
+        af.add_attack(s, t)
+    return af
+
+def load_bulk(sigma: str, args, attacks) -> IncrAFSolver:
+    af = IncrAFSolver(sigma)
+    af.add_arguments(args)
+    af.add_attacks(attacks)
+    return af
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sigma", default="stable", choices=["naive", "adm", "stable"])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 20000])
+    parser.add_argument("--density", type=float, default=2.0, help="attacks per argument")
+    parser.add_argument("--seed", type=int, default=0)
+    options = parser.parse_args()
+
+    print(f"{'n':>8} {'m':>9} {'per-item [s]':>13} {'bulk [s]':>9} {'speedup':>8}")
+    for n in options.sizes:
+        args, attacks = random_af(n, int(n * options.density), options.seed)
+
+        start = time.perf_counter()
+        load_per_item(options.sigma, args, attacks)
+        per_item = time.perf_counter() - start
+
+        start = time.perf_counter()
+        load_bulk(options.sigma, args, attacks)
+        bulk = time.perf_counter() - start
+
+        print(f"{n:>8} {len(attacks):>9} {per_item:>13.3f} {bulk:>9.3f} {per_item / bulk:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
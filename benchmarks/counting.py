@@ -0,0 +1,50 @@
+"""
+Compares counting the extensions of an AF with a Python callback per model,
+as `SimpleVertexCoverSolver.solve` does, against `IncrAFSolver.count_extensions`,
+which lets clasp count them.
+"""
+import argparse
+import time
+
+from incraf import IncrAFSolver
+from benchmarks.generators import random_af
+
+def count_by_callback(solver: IncrAFSolver) -> int:
+    count = 0
+    def on_model(m):
+        nonlocal count
+        count += 1
+
+    solver.ctl.configuration.solve.enum_mode = "auto"
+    solver.ctl.solve(on_model=on_model)
+    return count
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sigma", default="adm", choices=["naive", "adm", "stable"])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20, 30, 40])
+    parser.add_argument("--density", type=float, default=1.0, help="attacks per argument")
+    parser.add_argument("--seed", type=int, default=0)
+    options = parser.parse_args()
+
+    print(f"{'n':>6} {'m':>6} {'extensions':>11} {'callback [s]':>13} {'count [s]':>10} {'speedup':>8}")
+    for n in options.sizes:
+        args, attacks = random_af(n, int(n * options.density), options.seed)
+        solver = IncrAFSolver(options.sigma)
+        solver.add_arguments(args)
+        solver.add_attacks(attacks)
+        solver.count_extensions(cap=1)  # grounds the AF before timing
+
+        start = time.perf_counter()
+        expected = count_by_callback(solver)
+        callback = time.perf_counter() - start
+
+        start = time.perf_counter()
+        count, _ = solver.count_extensions()
+        counted = time.perf_counter() - start
+        assert count == expected
+
+        print(f"{n:>6} {len(attacks):>6} {count:>11} {callback:>13.3f} {counted:>10.3f} {callback / counted:>7.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+Generators for random argumentation frameworks.
+"""
+import random
+
+from typing import List, Tuple
+
+def random_af(n: int, m: int, seed: int = 0) -> Tuple[List[int], List[Tuple[int, int]]]:
+    """
+    Returns an AF with the arguments `1..n` and `m` distinct attacks drawn uniformly at random.
+    """
+    rnd = random.Random(seed)
+    m = min(m, n * n)
+
+    attacks = set()
+    while len(attacks) < m:
+        attacks.add((rnd.randint(1, n), rnd.randint(1, n)))
+
+    return list(range(1, n+1)), sorted(attacks)
+
+def erdos_renyi(n: int, p: float, seed: int = 0) -> Tuple[List[int], List[Tuple[int, int]]]:
+    """
+    Returns an Erdős–Rényi AF with the arguments `1..n`, where every attack `(s,t)` with `s != t`
+    is present independently with probability `p`.
+    """
+    rnd = random.Random(seed)
+    attacks = [(s, t) for s in range(1, n+1) for t in range(1, n+1) if s != t and rnd.random() < p]
+    return list(range(1, n+1)), attacks
+
+def scale_free(n: int, k: int = 2, seed: int = 0) -> Tuple[List[int], List[Tuple[int, int]]]:
+    """
+    Returns a scale-free AF with the arguments `1..n` grown by preferential attachment:
+    every new argument is connected to `k` earlier arguments, picked with probability proportional
+    to their degree, and each connection becomes an attack in a random direction.
+    """
+    rnd = random.Random(seed)
+    attacks = set()
+    # Every argument occurs here once per incident attack, plus once so that isolated ones can be picked.
+    ends: List[int] = []
+
+    for v in range(1, n+1):
+        targets = set()
+        while ends and len(targets) < min(k, v - 1):
+            targets.add(rnd.choice(ends))
+        for u in targets:
+            attacks.add((v, u) if rnd.random() < 0.5 else (u, v))
+            ends.append(u)
+            ends.append(v)
+        ends.append(v)
+
+    return list(range(1, n+1)), sorted(attacks)
+
+def grid(rows: int, cols: int, seed: int = 0, mutual: float = 0.5) -> Tuple[List[int], List[Tuple[int, int]]]:
+    """
+    Returns an AF on a `rows` x `cols` grid, numbered row by row from 1, where neighbouring arguments
+    attack each other with probability `mutual` and otherwise one attacks the other in a random direction.
+    """
+    rnd = random.Random(seed)
+    attacks = []
+
+    for r in range(rows):
+        for c in range(cols):
+            v = r * cols + c + 1
+            for u in ([v + 1] if c + 1 < cols else []) + ([v + cols] if r + 1 < rows else []):
+                if rnd.random() < mutual:
+                    attacks.extend([(v, u), (u, v)])
+                else:
+                    attacks.append((v, u) if rnd.random() < 0.5 else (u, v))
+
+    return list(range(1, rows * cols + 1)), sorted(attacks)
+
+def layered(layers: int, width: int, size: int = 4, chords: float = 0.2, seed: int = 0) -> Tuple[List[int], List[Tuple[int, int]]]:
+    """
+    Returns an AF of `layers` layers of `width` arguments each, numbered layer by layer from 1.
+    Every layer is cut into groups of `size` arguments that attack each other in a cycle, plus every other
+    attack within the group with probability `chords`, so the groups are its strongly connected components.
+    Every argument also attacks one random argument of the next layer.
+    """
+    rnd = random.Random(seed)
+    attacks = set()
+
+    for layer in range(layers):
+        first = layer * width + 1
+        for start in range(first, first + width, size):
+            group = list(range(start, min(start + size, first + width)))
+            for i, v in enumerate(group):
+                attacks.add((v, group[(i + 1) % len(group)]))
+                attacks.update((v, u) for u in group if u != v and rnd.random() < chords)
+        if layer + 1 < layers:
+            for v in range(first, first + width):
+                attacks.add((v, rnd.randint(first + width, first + 2 * width - 1)))
+
+    return list(range(1, layers * width + 1)), sorted(attacks)
+
+def clusters(count: int, size: int, density: float = 2.0, seed: int = 0) -> Tuple[List[int], List[Tuple[int, int]]]:
+    """
+    Returns an AF of `count` disjoint random AFs of `size` arguments each, numbered cluster by cluster from 1,
+    with about `density` attacks per argument drawn uniformly within its cluster.
+    Most clusters are weakly connected components of their own.
+    """
+    rnd = random.Random(seed)
+    attacks = set()
+    for cluster in range(count):
+        first = cluster * size + 1
+        for _ in range(int(size * density)):
+            attacks.add((rnd.randint(first, first + size - 1), rnd.randint(first, first + size - 1)))
+    return list(range(1, count * size + 1)), sorted(attacks)
+
+# Generators by name, each taking the number of arguments and a seed, with about two attacks per argument.
+GRAPHS = {
+    "uniform": lambda n, seed: random_af(n, 2 * n, seed),
+    "er": lambda n, seed: erdos_renyi(n, 2.0 / max(n - 1, 1), seed),
+    "sf": lambda n, seed: scale_free(n, 2, seed),
+    "grid": lambda n, seed: grid(max(int(n ** 0.5), 1), max(n // max(int(n ** 0.5), 1), 1), seed),
+}
+
+def random_trace(args: List[int], attacks: List[Tuple[int, int]], steps: int, seed: int = 0,
+                 queries: float = 0.3, skept: float = 0.5) -> List[tuple]:
+    """
+    Returns a random trace of `steps` calls on an AF that initially consists of `args` and `attacks`,
+    as tuples `(method, *arguments)` naming the `AFSolver` methods.
+
+    A fraction `queries` of the calls are `solve_cred` or `solve_skept` calls, the latter with probability
+    `skept`, for a single random live argument. The rest add or delete random arguments and attacks,
+    always keeping the trace valid: only live arguments and attacks are deleted, and new attacks
+    are only added between live arguments.
+    """
+    rnd = random.Random(seed)
+    live = set(args)
+    live_attacks = set(attacks)
+    next_arg = max(args, default=0) + 1
+    trace: List[tuple] = []
+
+    while len(trace) < steps:
+        x = rnd.random()
+        if x < queries:
+            if not live:
+                continue
+            method = "solve_skept" if rnd.random() < skept else "solve_cred"
+            trace.append((method, [rnd.choice(sorted(live))]))
+        elif x < queries + (1 - queries) / 4:
+            trace.append(("add_argument", next_arg))
+            live.add(next_arg)
+            next_arg += 1
+        elif x < queries + (1 - queries) / 2:
+            if len(live) < 2:
+                continue
+            v = rnd.choice(sorted(live))
+            trace.append(("del_argument", v))
+            live.discard(v)
+            live_attacks = {(s, t) for s, t in live_attacks if v != s and v != t}
+        elif x < queries + 3 * (1 - queries) / 4:
+            if not live:
+                continue
+            s, t = rnd.choice(sorted(live)), rnd.choice(sorted(live))
+            if (s, t) in live_attacks:
+                continue
+            trace.append(("add_attack", s, t))
+            live_attacks.add((s, t))
+        else:
+            if not live_attacks:
+                continue
+            s, t = rnd.choice(sorted(live_attacks))
+            trace.append(("del_attack", s, t))
+            live_attacks.discard((s, t))
+
+    return trace
@@ -0,0 +1,60 @@
+"""
+Replays random traces on `IncrAFSolver` with and without the grounded labelling (`labelling=True`)
+and reports how many queries the labelling decides on its own, and the mean time per query and per mutation
+of both runs. The result cache is disabled, so every query reaches the labelling or the solver.
+"""
+import argparse
+import time
+
+from incraf import IncrAFSolver
+from benchmarks.generators import GRAPHS, random_trace
+
+def replay(solver: IncrAFSolver, trace) -> tuple:
+    queries = mutations = 0.0
+    answers = []
+    for method, *params in trace:
+        start = time.perf_counter()
+        answer = getattr(solver, method)(*params)
+        elapsed = time.perf_counter() - start
+        if method.startswith("solve_"):
+            queries += elapsed
+            answers.append(answer)
+        else:
+            mutations += elapsed
+    return answers, queries, mutations
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sigma", default="adm", choices=["adm", "stable"])
+    parser.add_argument("--graphs", nargs="+", default=list(GRAPHS), choices=list(GRAPHS))
+    parser.add_argument("--sizes", type=int, nargs="+", default=[200, 1000])
+    parser.add_argument("--steps", type=int, default=2000)
+    parser.add_argument("--queries", type=float, default=0.3, help="fraction of queries in the trace")
+    parser.add_argument("--seed", type=int, default=0)
+    options = parser.parse_args()
+
+    print(f"{'graph':>8} {'n':>6} {'hit rate':>9} {'query plain [ms]':>17} {'query labelled [ms]':>20} "
+          f"{'update plain [ms]':>18} {'update labelled [ms]':>21}")
+    for graph in options.graphs:
+        for n in options.sizes:
+            args, attacks = GRAPHS[graph](n, options.seed)
+            trace = random_trace(args, attacks, options.steps, options.seed, options.queries)
+            count = sum(1 for method, *_ in trace if method.startswith("solve_"))
+
+            results = []
+            for labelling in (False, True):
+                solver = IncrAFSolver(options.sigma, cache_size=0, labelling=labelling)
+                solver.add_arguments(args)
+                solver.add_attacks(attacks)
+                solver.solve_cred([])  # grounds the AF before timing
+                results.append(replay(solver, trace))
+            (plain, plain_q, plain_u), (labelled, labelled_q, labelled_u) = results
+            assert plain == labelled
+
+            stats = solver.labelling
+            print(f"{graph:>8} {n:>6} {stats.hits / stats.queries:>8.1%} {plain_q / count * 1000:>17.3f} "
+                  f"{labelled_q / count * 1000:>20.3f} {plain_u / (len(trace) - count) * 1000:>18.3f} "
+                  f"{labelled_u / (len(trace) - count) * 1000:>21.3f}")
+
+if __name__ == "__main__":
+    main()
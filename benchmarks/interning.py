@@ -0,0 +1,71 @@
+"""
+Measures the Python-side overhead of `IncrAFSolver`: the heap held by its index of the AF,
+and the time per mutation and per query call.
+
+Mutations run in deferred mode, so only the bookkeeping is timed and not the grounding.
+"""
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+
+from incraf import IncrAFSolver
+from benchmarks.generators import random_af
+
+def per_call(f, calls: int) -> float:
+    start = time.perf_counter()
+    for i in range(calls):
+        f(i)
+    return (time.perf_counter() - start) / calls * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sigma", default="adm", choices=["naive", "adm", "stable"])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--density", type=float, default=2.0, help="attacks per argument")
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=0)
+    options = parser.parse_args()
+
+    print(f"{'n':>8} {'m':>8} {'heap [MB]':>10} {'arg [us]':>9} {'att [us]':>9} {'cred [us]':>10}")
+    for n in options.sizes:
+        args, attacks = random_af(n, int(n * options.density), options.seed)
+        rnd = random.Random(options.seed)
+
+        gc.collect()
+        tracemalloc.start()
+        solver = IncrAFSolver(options.sigma, deferred=True, compact_threshold=None, cache_size=0)
+        solver.add_arguments(args)
+        solver.add_attacks(attacks)
+        solver.flush()
+        heap = tracemalloc.get_traced_memory()[0] / 2**20
+        tracemalloc.stop()
+
+        # Deleting and restoring an argument with its attacks, and toggling single attacks.
+        picks = [rnd.choice(args) for _ in range(options.calls)]
+        def toggle_argument(i):
+            x = picks[i]
+            solver.del_argument(x)
+            solver.add_argument(x)
+        arg = per_call(toggle_argument, options.calls)
+
+        edges = [rnd.choice(attacks) for _ in range(options.calls)]
+        def toggle_attack(i):
+            s, t = edges[i]
+            solver.del_attack(s, t)
+            solver.add_attack(s, t)
+        att = per_call(toggle_attack, options.calls)
+
+        # Queries on a small AF, where the overhead around the search matters most.
+        small = IncrAFSolver(options.sigma, cache_size=0)
+        small_args, small_attacks = random_af(50, 100, options.seed)
+        small.add_arguments(small_args)
+        small.add_attacks(small_attacks)
+        queries = [[rnd.choice(small_args)] for _ in range(options.calls // 10)]
+        cred = per_call(lambda i: small.solve_cred(queries[i]), len(queries))
+
+        print(f"{n:>8} {len(attacks):>8} {heap:>10.1f} {arg:>9.2f} {att:>9.2f} {cred:>10.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Measures the query throughput of `ParallelAFSolver` for a growing number of workers,
+answering the credulous acceptance of every argument of a random AF.
+"""
+import argparse
+import time
+
+from parallel import ParallelAFSolver
+from benchmarks.generators import random_af
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sigma", default="stable", choices=["naive", "adm", "stable"])
+    parser.add_argument("--size", type=int, default=400)
+    parser.add_argument("--density", type=float, default=3.0, help="attacks per argument")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--seed", type=int, default=0)
+    options = parser.parse_args()
+
+    args, attacks = random_af(options.size, int(options.size * options.density), options.seed)
+    queries = [[a] for a in args]
+
+    print(f"{'workers':>7} {'queries':>8} {'time [s]':>9} {'queries/s':>10} {'speedup':>8}")
+    base = None
+    for workers in options.workers:
+        # The cache would answer repeated queries without solving, so it is disabled here.
+        solver = ParallelAFSolver(options.sigma, workers=workers, cache_size=0)
+        solver.add_arguments(args)
+        solver.add_attacks(attacks)
+        solver.solve_cred_many([[]] * workers)  # waits until every replica has the AF
+
+        start = time.perf_counter()
+        solver.solve_cred_many(queries)
+        elapsed = time.perf_counter() - start
+        del solver
+
+        base = base or elapsed
+        print(f"{workers:>7} {len(queries):>8} {elapsed:>9.3f} {len(queries) / elapsed:>10.1f} {base / elapsed:>7.2f}x")
+
+if __name__ == "__main__":
+    main()
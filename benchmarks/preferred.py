@@ -0,0 +1,64 @@
+"""
+Compares the `pref` semantics of `IncrAFSolver`, which grows complete extensions to preferred ones and answers
+skeptical queries in a loop of incremental solve calls, with the static saturation encoding
+`dung/prefex_gringo.lp`, grounded from scratch for every query, on random AFs. Every step of the trace adds
+or deletes an attack and asks a credulous or skeptical query; the mean time per query is reported by mode.
+The result cache of `IncrAFSolver` is disabled.
+"""
+import argparse
+import random
+import time
+
+from incraf import IncrAFSolver
+from benchmarks.backends import StaticSolver
+from benchmarks.generators import random_af
+
+def make_trace(args, attacks, steps: int, seed: int):
+    rnd = random.Random(seed)
+    live = set(attacks)
+    trace = []
+    for _ in range(steps):
+        if live and rnd.random() < 0.5:
+            edit = ("del_attack", rnd.choice(sorted(live)))
+            live.discard(edit[1])
+        else:
+            edit = ("add_attack", (rnd.choice(args), rnd.choice(args)))
+            live.add(edit[1])
+        trace.append((edit, rnd.choice(["cred", "skept"]), [rnd.choice(args)]))
+    return trace
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 100, 200])
+    parser.add_argument("--density", type=float, default=1.5, help="attacks per argument")
+    parser.add_argument("--steps", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    options = parser.parse_args()
+
+    print(f"{'n':>5} {'solver':>7} {'cred [ms]':>10} {'skept [ms]':>11} {'yes':>5}")
+    for n in options.sizes:
+        args, attacks = random_af(n, int(n * options.density), options.seed)
+        trace = make_trace(args, attacks, options.steps, options.seed)
+
+        expected = None
+        for name, solver in (("incr", IncrAFSolver("pref", cache_size=0)), ("static", StaticSolver("pref"))):
+            for a in args:
+                solver.add_argument(a)
+            for s, t in attacks:
+                solver.add_attack(s, t)
+
+            times = {"cred": [], "skept": []}
+            answers = []
+            for (edit, attack), mode, assumps in trace:
+                getattr(solver, edit)(*attack)
+                start = time.perf_counter()
+                answers.append(solver.solve_cred(assumps) if mode == "cred" else solver.solve_skept(assumps))
+                times[mode].append(time.perf_counter() - start)
+
+            expected = expected or answers
+            assert answers == expected
+            cred, skept = (sum(times[m]) / max(len(times[m]), 1) * 1000 for m in ("cred", "skept"))
+            print(f"{n:>5} {name:>7} {cred:>10.2f} {skept:>11.2f} {sum(answers):>5}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Compares `PropagatorAFSolver`, which only grounds the arguments and checks the attacks in a propagator,
+with the grounded `incr-dung` encodings of `IncrAFSolver` on dense random AFs:
+the time to load the AF, the time for credulous and skeptical queries, the size of the ground program
+and the peak memory. Every run is done in a fresh process, so the peak memory is its own.
+"""
+import argparse
+import multiprocessing
+import random
+import resource
+import time
+
+from incraf import IncrAFSolver
+from propagator import PropagatorAFSolver
+from benchmarks.generators import erdos_renyi
+
+BACKENDS = {"ground": IncrAFSolver, "propagator": PropagatorAFSolver}
+
+def run(backend: str, sigma: str, n: int, p: float, queries: int, seed: int) -> dict:
+    args, attacks = erdos_renyi(n, p, seed)
+    rnd = random.Random(seed)
+    picks = [[rnd.choice(args)] for _ in range(queries)]
+
+    start = time.perf_counter()
+    solver = BACKENDS[backend](sigma)
+    solver.add_arguments(args)
+    solver.add_attacks(attacks)
+    solver.solve_cred([])
+    load = time.perf_counter() - start
+
+    start = time.perf_counter()
+    answers = [solver.solve_cred(q) for q in picks] + [solver.solve_skept(q) for q in picks]
+    query = (time.perf_counter() - start) / (2 * queries)
+
+    lp = solver.ctl.statistics["problem"]["lp"]
+    return {
+        "attacks": len(attacks),
+        "load": load,
+        "query": query,
+        "rules": int(lp["rules"]),
+        "atoms": int(lp["atoms"]),
+        "rss": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "answers": answers,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sigma", default="stable", choices=["adm", "stable"])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 150, 200])
+    parser.add_argument("--p", type=float, default=0.2, help="probability of every attack")
+    parser.add_argument("--queries", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    options = parser.parse_args()
+
+    print(f"{'n':>6} {'m':>8} {'backend':>11} {'load [s]':>9} {'query [ms]':>11} {'lp rules':>9} {'lp atoms':>9} {'peak [MB]':>10}")
+    with multiprocessing.get_context("spawn").Pool(1, maxtasksperchild=1) as pool:
+        for n in options.sizes:
+            results = {}
+            for backend in BACKENDS:
+                r = results[backend] = pool.apply(run, (backend, options.sigma, n, options.p, options.queries, options.seed))
+                print(f"{n:>6} {r['attacks']:>8} {backend:>11} {r['load']:>9.3f} {r['query'] * 1000:>11.2f} "
+                      f"{r['rules']:>9} {r['atoms']:>9} {r['rss']:>10.1f}")
+            assert results["ground"]["answers"] == results["propagator"]["answers"]
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Compares `stable` queries on the whole ground program of `IncrAFSolver` with the SCC-recursive search
+of `IncrAFSolver(sigma, scc=True)` on layered AFs, whose layers are cut into small strongly connected
+components. The trace alternates a random attack edit with a random credulous or skeptical query.
+Edits are either confined to the last layer, so that everything upstream stays as it is,
+or spread over the whole AF. The result cache is disabled.
+"""
+import argparse
+import random
+import time
+
+from incraf import IncrAFSolver
+from benchmarks.generators import layered
+
+def make_trace(args, attacks, width: int, steps: int, tail: bool, seed: int) -> list:
+    rnd = random.Random(seed)
+    live = set(attacks)
+    pool = args[-width:] if tail else args
+    trace = []
+    for _ in range(steps):
+        s, t = rnd.choice(pool), rnd.choice(pool)
+        if (s, t) in live:
+            trace.append(("del_attack", s, t))
+            live.discard((s, t))
+        else:
+            trace.append(("add_attack", s, t))
+            live.add((s, t))
+        trace.append(("solve_skept" if rnd.random() < 0.5 else "solve_cred", [rnd.choice(args)]))
+    return trace
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--layers", type=int, nargs="+", default=[20, 50])
+    parser.add_argument("--width", type=int, default=100)
+    parser.add_argument("--size", type=int, default=4, help="arguments per component")
+    parser.add_argument("--chords", type=float, default=0.0, help="probability of every other attack in a component")
+    parser.add_argument("--steps", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    options = parser.parse_args()
+
+    print(f"{'n':>6} {'edits':>6} {'ground [ms]':>12} {'components [ms]':>16} {'whole [ms]':>11} {'scc [ms]':>9} "
+          f"{'solved':>7} {'reused':>8} {'abandoned':>10} {'yes':>4}")
+    for layers in options.layers:
+        args, attacks = layered(layers, options.width, options.size, options.chords, options.seed)
+        for tail in (True, False):
+            trace = make_trace(args, attacks, options.width, options.steps, tail, options.seed)
+
+            results = []
+            for scc in (False, True):
+                solver = IncrAFSolver("stable", cache_size=0, scc=scc)
+                solver.add_arguments(args)
+                solver.add_attacks(attacks)
+                start = time.perf_counter()
+                solver.solve_cred([])  # grounds the AF, or computes the components and their local extensions
+                build = time.perf_counter() - start
+
+                answers, elapsed = [], 0.0
+                for method, *params in trace:
+                    start = time.perf_counter()
+                    answers.append(getattr(solver, method)(*params))
+                    elapsed += time.perf_counter() - start
+                results.append((answers, build, elapsed / options.steps))
+            (whole, whole_build, whole_time), (answers, build, scc_time) = results
+            assert whole == answers
+
+            stats = solver.condensation
+            print(f"{len(args):>6} {'tail' if tail else 'all':>6} {whole_build * 1000:>12.1f} {build * 1000:>16.1f} "
+                  f"{whole_time * 1000:>11.2f} {scc_time * 1000:>9.2f} {stats.solved:>7} {stats.reused:>8} {stats.abandoned:>10} {sum(a is True for a in answers):>4}")
+
+if __name__ == "__main__":
+    main()
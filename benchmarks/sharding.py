@@ -0,0 +1,72 @@
+"""
+Compares `ShardedAFSolver` for a growing number of shards with a single `IncrAFSolver` on AFs made up of
+many small clusters: the time to load the AF and answer a first query, and the mean time per step of a trace
+where every step adds an attack, mostly within a cluster and sometimes between two, and asks a random query.
+Attacks between clusters on different shards move a cluster. The result caches are disabled.
+"""
+import argparse
+import random
+import time
+
+from incraf import IncrAFSolver
+from sharding import ShardedAFSolver
+from benchmarks.generators import clusters
+
+def make_trace(args, size: int, steps: int, bridges: float, seed: int):
+    rnd = random.Random(seed)
+    trace = []
+    for _ in range(steps):
+        s = rnd.choice(args)
+        if rnd.random() < bridges:
+            t = rnd.choice(args)
+        else:
+            first = (s - 1) // size * size + 1
+            t = rnd.randint(first, first + size - 1)
+        trace.append(((s, t), rnd.choice(["cred", "skept"]), [rnd.choice(args)]))
+    return trace
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sigma", default="stable", choices=["naive", "adm", "stable"])
+    parser.add_argument("--clusters", type=int, nargs="+", default=[200, 1000])
+    parser.add_argument("--size", type=int, default=20, help="arguments per cluster")
+    parser.add_argument("--density", type=float, default=2.0, help="attacks per argument")
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--steps", type=int, default=200)
+    parser.add_argument("--bridges", type=float, default=0.05, help="fraction of attacks between clusters")
+    parser.add_argument("--seed", type=int, default=0)
+    options = parser.parse_args()
+
+    print(f"{'n':>7} {'solver':>10} {'load [s]':>9} {'step [ms]':>10} {'moves':>6} {'moved':>7} {'yes':>5}")
+    for count in options.clusters:
+        args, attacks = clusters(count, options.size, options.density, options.seed)
+        trace = make_trace(args, options.size, options.steps, options.bridges, options.seed)
+
+        expected = None
+        for shards in [0] + options.shards:
+            name = f"{shards} shards" if shards else "single"
+            start = time.perf_counter()
+            if shards:
+                solver = ShardedAFSolver(options.sigma, workers=shards, cache_size=0)
+            else:
+                solver = IncrAFSolver(options.sigma, cache_size=0)
+            solver.add_arguments(args)
+            solver.add_attacks(attacks)
+            solver.solve_cred([])
+            load = time.perf_counter() - start
+
+            answers = []
+            start = time.perf_counter()
+            for attack, mode, assumps in trace:
+                solver.add_attacks([attack])
+                answers.append(solver.solve_cred(assumps) if mode == "cred" else solver.solve_skept(assumps))
+            step = (time.perf_counter() - start) / len(trace)
+
+            expected = expected or answers
+            assert answers == expected
+            moves, moved = (solver.moves, solver.moved) if shards else (0, 0)
+            print(f"{len(args):>7} {name:>10} {load:>9.3f} {step * 1000:>10.2f} {moves:>6} {moved:>7} {sum(answers):>5}")
+            del solver
+
+if __name__ == "__main__":
+    main()
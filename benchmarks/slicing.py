@@ -0,0 +1,68 @@
+"""
+Compares credulous `adm` queries on the whole AF with queries decided on their relevance slice
+(`IncrAFSolver(sigma, slicing=k)`) on large scale-free AFs. With one connection per new argument,
+the AF is a tree of attacks and most slices are small; with two, there is a large core of arguments
+reaching each other, whose queries fall back to the whole AF.
+
+Every query is timed twice in a row, the second time with an up-to-date slice solver.
+The result cache is disabled.
+"""
+import argparse
+import random
+import time
+from collections import defaultdict
+
+from incraf import SLICE_MAX_FRACTION, IncrAFSolver
+from benchmarks.generators import scale_free
+
+def slice_size(attackers, x: int) -> int:
+    seen = {x}
+    queue = [x]
+    while queue:
+        for s in attackers[queue.pop()]:
+            if s not in seen:
+                seen.add(s)
+                queue.append(s)
+    return len(seen)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 50000])
+    parser.add_argument("--k", type=int, nargs="+", default=[1, 2], help="connections per new argument")
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--slices", type=int, default=8, help="slice solvers to keep")
+    parser.add_argument("--seed", type=int, default=0)
+    options = parser.parse_args()
+
+    print(f"{'n':>7} {'k':>3} {'sliced':>7} {'mean slice':>11} {'whole [ms]':>11} {'slice [ms]':>11} {'again [ms]':>11}")
+    for n in options.sizes:
+        for k in options.k:
+            args, attacks = scale_free(n, k, options.seed)
+            picks = random.Random(options.seed).sample(args, options.queries)
+            attackers = defaultdict(list)
+            for s, t in attacks:
+                attackers[t].append(s)
+            sizes = [size for size in (slice_size(attackers, x) for x in picks) if size <= SLICE_MAX_FRACTION * n]
+
+            solvers = [IncrAFSolver("adm", cache_size=0, slicing=slicing) for slicing in (0, options.slices)]
+            for solver in solvers:
+                solver.add_arguments(args)
+                solver.add_attacks(attacks)
+                solver.solve_cred([])  # grounds the AF before timing
+            whole, sliced = solvers
+
+            times = [0.0, 0.0, 0.0]
+            for x in picks:
+                start = time.perf_counter()
+                expected = whole.solve_cred([x])
+                times[0] += time.perf_counter() - start
+                for i in (1, 2):
+                    start = time.perf_counter()
+                    assert sliced.solve_cred([x]) == expected
+                    times[i] += time.perf_counter() - start
+
+            print(f"{n:>7} {k:>3} {len(sizes) / len(picks):>6.0%} {sum(sizes) / max(len(sizes), 1):>11.1f} "
+                  + " ".join(f"{t / len(picks) * 1000:>11.2f}" for t in times))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Compares a cold start of `IncrAFSolver` from an AF file in the `p af` format
+with a warm restore from a snapshot written by `save`, in time and file size.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from incraf import IncrAFSolver
+from benchmarks.generators import random_af
+
+def write_af(path: str, n: int, attacks):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"p af {n}\n")
+        f.writelines(f"{s} {t}\n" for s, t in attacks)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sigma", default="stable", choices=["naive", "adm", "stable"])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--density", type=float, default=2.0, help="attacks per argument")
+    parser.add_argument("--seed", type=int, default=0)
+    options = parser.parse_args()
+
+    print(f"{'n':>8} {'m':>9} {'af [kB]':>8} {'snapshot [kB]':>14} {'cold [s]':>9} {'save [s]':>9} {'restore [s]':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        af_file, snapshot = os.path.join(tmp, "af.txt"), os.path.join(tmp, "af.snap")
+        for n in options.sizes:
+            args, attacks = random_af(n, int(n * options.density), options.seed)
+            write_af(af_file, n, attacks)
+
+            start = time.perf_counter()
+            solver = IncrAFSolver(options.sigma, af_file)
+            cold = time.perf_counter() - start
+
+            start = time.perf_counter()
+            solver.save(snapshot)
+            save = time.perf_counter() - start
+            del solver
+
+            start = time.perf_counter()
+            IncrAFSolver.load(snapshot)
+            restore = time.perf_counter() - start
+
+            print(f"{n:>8} {len(attacks):>9} {os.path.getsize(af_file) / 1024:>8.1f} {os.path.getsize(snapshot) / 1024:>14.1f} "
+                  f"{cold:>9.3f} {save:>9.3f} {restore:>12.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Times the solver backends on random AFs and dynamic traces across sizes, semantics and graph classes.
+
+For every combination, the initial AF is loaded one argument and attack at a time, followed by
+a random trace of mutations and queries. One JSON object per run is written to `--out`
+(or stdout), with the load time, the total time and number of calls per method, and a digest
+of all answers, which has to agree between the backends.
+"""
+import argparse
+import hashlib
+import json
+import platform
+import sys
+import time
+
+import clingo
+
+from benchmarks.backends import BACKENDS, SEMANTICS
+from benchmarks.generators import GRAPHS, random_trace
+
+def run(backend: str, sigma: str, graph: str, n: int, steps: int, seed: int) -> dict:
+    args, attacks = GRAPHS[graph](n, seed)
+    trace = random_trace(args, attacks, steps, seed)
+    result = {"backend": backend, "sigma": sigma, "graph": graph, "n": n, "m": len(attacks),
+              "steps": steps, "seed": seed}
+
+    try:
+        solver = BACKENDS[backend](sigma)
+    except (IOError, KeyError) as e:
+        result["skipped"] = str(e)
+        return result
+
+    start = time.perf_counter()
+    for a in args:
+        solver.add_argument(a)
+    for s, t in attacks:
+        solver.add_attack(s, t)
+    result["load_time"] = time.perf_counter() - start
+
+    calls: dict = {}
+    answers = []
+    start = time.perf_counter()
+    for method, *params in trace:
+        t = time.perf_counter()
+        answer = getattr(solver, method)(*params)
+        entry = calls.setdefault(method, {"calls": 0, "time": 0.0})
+        entry["calls"] += 1
+        entry["time"] += time.perf_counter() - t
+        if answer is not None:
+            answers.append(answer)
+    result["trace_time"] = time.perf_counter() - start
+    result["calls"] = calls
+    result["answers"] = hashlib.sha1(json.dumps(answers).encode()).hexdigest()[:12]
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--backends", nargs="+", default=["incr", "static"], choices=list(BACKENDS))
+    parser.add_argument("--sigmas", nargs="+", default=["adm", "stable"], choices=SEMANTICS)
+    parser.add_argument("--graphs", nargs="+", default=["er", "sf", "grid"], choices=list(GRAPHS))
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 200])
+    parser.add_argument("--steps", type=int, default=200, help="length of the mutation and query trace")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="file to append the JSON lines to, instead of stdout")
+    options = parser.parse_args()
+
+    meta = {"clingo": clingo.__version__, "python": platform.python_version(), "time": time.time()}
+    out = open(options.out, "a", encoding="utf-8") if options.out else sys.stdout
+    try:
+        for sigma in options.sigmas:
+            for graph in options.graphs:
+                for n in options.sizes:
+                    for backend in options.backends:
+                        result = run(backend, sigma, graph, n, options.steps, options.seed)
+                        out.write(json.dumps({**result, **meta}) + "\n")
+                        out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,12 @@
 from clingo.control import Control
-from clingo.solving import Model
+from clingo.solving import Model, SolveHandle
+
+from typing import Tuple, cast
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
 
 def dump_symbolic_atoms(ctl: Control):
     print(" === Symbolic atoms ===")
@@ -10,4 +17,65 @@ def solve_and_dump_model(ctl: Control):
     def on_model(m: Model):
         print(m)
         
-    print(ctl.solve(on_model=on_model))
\ No newline at end of file
+    print(ctl.solve(on_model=on_model))
+
+def program_stats(ctl: Control) -> dict:
+    """
+    Returns the size of the ground program in `ctl` and, if it has been solved since it was created,
+    the program and solver statistics of the last `solve` call.
+    The resident memory of the process is added if `psutil` is available.
+
+    Do not call this on a `Control` that is going to be solved but has not been yet: clingo caches
+    the statistics by the number of the solve call, which is the same before and after the first one,
+    so those read here would be returned again after it, see `count_models`.
+    """
+    result = {"symbolic_atoms": len(ctl.symbolic_atoms)}
+
+    stats = ctl.statistics
+    if "user_step" in stats:
+        generator = stats["problem"]["generator"]
+        result["lp_atoms"] = stats["problem"]["lp"]["atoms"]
+        result["lp_rules"] = stats["problem"]["lp"]["rules"]
+        result["vars"] = generator["vars"]
+        result["constraints"] = generator["constraints"] + generator["constraints_binary"] + generator["constraints_ternary"]
+        result["solve_time"] = stats["summary"]["times"]["solve"]
+
+    if psutil is not None:
+        result["rss"] = psutil.Process().memory_info().rss
+
+    return result
+
+def count_models(ctl: Control, assumptions: list = [], cap: int | None = None, timeout: float | None = None) -> Tuple[int, bool]:
+    """
+    Counts the models of the ground program in `ctl` under `assumptions` inside the solver,
+    without a Python callback per model, reading the count from the statistics afterwards.
+
+    Stops after `cap` models or `timeout` seconds. Returns the number of models found
+    (at most `cap`) and whether these are all of them.
+    """
+    # One model beyond the cap tells whether there are more.
+    ctl.configuration.solve.models = str(cap + 1) if cap is not None else "0"
+    try:
+        with cast(SolveHandle, ctl.solve(assumptions, async_=True)) as handle:
+            finished = handle.wait(timeout)
+            if not finished:
+                handle.cancel()
+            handle.get()
+    finally:
+        ctl.configuration.solve.models = "0"
+
+    stats = ctl.statistics
+    if "user_step" not in stats:
+        # The statistics were read before the first solve call and clingo returns that stale copy again.
+        stats = refresh_statistics(ctl)
+    count = int(stats["summary"]["models"]["enumerated"])
+    complete = finished and (cap is None or count <= cap)
+    return min(count, cap) if cap is not None else count, complete
+
+def refresh_statistics(ctl: Control) -> dict:
+    """
+    Returns the statistics of `ctl` without clingo's cached copy, which is keyed by the number of
+    the solve call and thus outlives the first call if it was made before it.
+    """
+    ctl._statistics = None
+    return ctl.statistics
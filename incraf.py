@@ -2,92 +2,292 @@ from ipafair import AFSolver
 
 from clingo.core import TruthValue
 from clingo.control import Control
-from clingo.symbol import Number, Function, Symbol
+from clingo.symbol import Number, Function, Symbol, SymbolType, parse_term
 from clingo.solving import Model, SolveHandle
 
 from clingox.program import Program, ProgramObserver
 from clingox.backend import SymbolicBackend
 
-from typing import List, cast
+from debug import count_models, program_stats
+from metrics import Metrics
+from ipafair.loaders import read_af
+from grounded import ASSUME_IN, GroundedLabelling
+from scc import Condensation, SearchLimit
+
+import asyncio
+import json
+import math
+import os
+import struct
+import sys
+import time
+import zlib
+from array import array
+from collections import defaultdict, OrderedDict
+from contextlib import asynccontextmanager, closing, contextmanager, nullcontext
+from enum import IntEnum
+from typing import Dict, FrozenSet, Generator, Iterable, Iterator, List, NamedTuple, Set, Tuple, cast
+
+# The encoding files of every semantics. The complete semantics adds a part to the admissible encoding,
+# and the preferred semantics searches complete extensions and grows them to maximal ones, see `__maximal`.
+ENCODINGS = {
+    "naive": ["incr-dung/naive.lp"],
+    "adm": ["incr-dung/adm.lp"],
+    "stable": ["incr-dung/stable.lp"],
+    "comp": ["incr-dung/adm.lp", "incr-dung/comp.lp"],
+    "pref": ["incr-dung/adm.lp", "incr-dung/comp.lp"],
+}
+
+# Magic bytes and version of the snapshots written by `IncrAFSolver.save`.
+SNAPSHOT_MAGIC = b"IAFS\x01"
+
+# Below this many grounded arguments and attacks, a rebuild of the ground program is not worth it.
+COMPACT_MIN_ATOMS = 1024
+
+# Beyond this many arguments weakly connected to a mutation, the cached answers with assumptions are all dropped
+# instead of searching further, see `IncrAFSolver.keep_cached`.
+CACHE_MAX_TOUCHED = 4096
+
+# Relevance slices larger than this fraction of the live arguments are not worth a solver of their own.
+SLICE_MAX_FRACTION = 0.5
+
+# The number of backjumps after which a search over the components is left to the whole ground program,
+# and the size and number of local extensions of a single component beyond which it is, too.
+SCC_BUDGET = 100
+SCC_MAX_SIZE = 256
+SCC_MAX_EXTENSIONS = 64
+
+class SolveStatus(IntEnum):
+    """
+    Return codes of the IPAFAIR C API for `solve_cred` and `solve_skept`, as returned by the
+    asynchronous `solve_*_async` methods. `UNKNOWN` is returned when a call runs out of time,
+    like an interrupted call in IPASIR.
+    """
+    UNKNOWN = 0
+    YES = 10
+    NO = 20
+    ERROR = -1
 
-def make_argument(name: int | str) -> Symbol:
+class SolveProfile(NamedTuple):
     """
-    Creates a clingo `Symbol` representing an argument `name`.
+    Solver settings for the `solve_*` calls of an `IncrAFSolver`.
+
+    `threads` is the number of clasp solver threads and `parallel_mode` either `"compete"`,
+    where every thread searches the whole space, or `"split"`, where the space is divided among them
+    (clasp `--parallel-mode`). `configuration` is the clasp configuration (`--configuration`),
+    e.g. `"auto"`, `"frumpy"`, `"jumpy"`, `"tweety"`, `"trendy"`, `"crafty"`, `"handy"`,
+    or `"many"` for a portfolio of different configurations across the threads.
+    """
+    threads: int = 1
+    parallel_mode: str = "compete"
+    configuration: str = "auto"
+
+# Named profiles that can be passed instead of a `SolveProfile`.
+# The multi-threaded ones use all cores, which pays off on hard stable and admissible instances.
+PROFILES = {
+    "default": SolveProfile(),
+    "portfolio": SolveProfile(threads=os.cpu_count() or 1, parallel_mode="compete", configuration="many"),
+    "split": SolveProfile(threads=os.cpu_count() or 1, parallel_mode="split"),
+}
+
+def to_profile(profile: SolveProfile | str) -> SolveProfile:
+    """
+    Returns `profile`, or the profile of that name in `PROFILES`.
+    """
+    if isinstance(profile, str):
+        if profile not in PROFILES:
+            raise KeyError("Solving profile is not known")
+        return PROFILES[profile]
+    if not isinstance(profile.threads, int) or profile.threads < 1:
+        raise ValueError("Thread count must be a positive integer")
+    if profile.parallel_mode not in ("compete", "split"):
+        raise ValueError("Parallel mode must be 'compete' or 'split'")
+    return profile
+
+def argument_term(name: int | str) -> Symbol:
+    """
+    Returns the term naming the argument `name`, i.e. `x` in `arg(x)`. Inverse of `argument_id`.
     """
     if isinstance(name, int):
-        return Function("arg", [Number(name)])
+        return Number(name)
     elif isinstance(name, str):
-        return Function("arg", [Function(name, [])])
+        return Function(name, [])
     else:
         raise TypeError("Arguments can only be named by strings or integers.")
 
+def make_argument(name: int | str) -> Symbol:
+    """
+    Creates a clingo `Symbol` representing an argument `name`.
+    """
+    return Function("arg", [argument_term(name)])
+
 def make_attack(source: int | str, target: int | str) -> Symbol:
     """
     Creates a clingo `Symbol` representing an attack from argument `source` to argument `target`.
     """
-    if isinstance(source, int):
-        s = Number(source)
-    elif isinstance(source, str):
-        s = Function(source, [])
-    else:
-        raise TypeError("Arguments can only be named by strings or integers.")
+    return Function("att", [argument_term(source), argument_term(target)])
+
+def to_argument(arg: int | str | Symbol) -> Symbol:
+    """
+    Returns the clingo `Symbol` for an argument given either by its id (`int` or `str`) or as a `Symbol`.
+    """
+    if isinstance(arg,int) or isinstance(arg,str):
+        return make_argument(arg)
+    elif not isinstance(arg,Symbol):
+        raise TypeError("arg must be an argument id (int or str) or a clingo Symbol.")
+    return arg
 
-    if isinstance(target, int):
-        t = Number(target)
-    elif isinstance(target, str):
-        t = Function(target, [])
+def to_attack(source: int | str | None = None, target: int | str | None = None, attack: Symbol | None = None) -> Symbol:
+    """
+    Returns the clingo `Symbol` for an attack given either by a pair of `source` and `target` or as a `Symbol`.
+    """
+    if source != None and target != None and attack == None:
+        attack = make_attack(source, target)
+    elif isinstance(attack, Symbol) and (source != None or target != None):
+        raise TypeError("attack and (source,target) parameters are mutually exclusive.")
+
+    assert(isinstance(attack, Symbol))
+    return attack
+
+def argument_id(term: Symbol) -> int | str:
+    """
+    Returns the argument id (an `int` or a `str`) for the term inside an `arg/1` `Symbol`.
+    This is the inverse of `make_argument`, i.e. `argument_id(make_argument(x).arguments[0]) == x`.
+    """
+    if term.type == SymbolType.Number:
+        return term.number
     else:
-        raise TypeError("Arguments can only be named by strings or integers.")
+        return term.name
+
+# An argument or attack in the index and the journal of an `IncrAFSolver`:
+# the index of the argument, or the pair of the indices of the source and target of the attack.
+Key = int | Tuple[int, int]
+
+# A search of several solve calls, like `IncrAFSolver.__maximal`: it yields the assumptions of every call,
+# receives the ids of the first model or `None`, and returns its result, which is run by `__run` or `__run_async`.
+Search = Generator[List[int], List[int | str] | None, List[int | str] | None]
+
+class SymbolTable:
+    """
+    Interns the arguments of an AF. Every argument id (`int` or `str`) gets a dense index
+    on its first occurrence, and its term `x` and atom `arg(x)` are created once and kept for that index.
+    Indices are never reused, so they stay valid after the argument is deleted.
+    """
+    def __init__(self):
+        self.ids: List[int | str] = []
+        self.terms: List[Symbol] = []
+        self.atoms: List[Symbol] = []
+        self.index: Dict[int | str, int] = {}
+
+        # Maps the `in(x)` atoms of models to the indices. Filled as they occur.
+        self.shown: Dict[Symbol, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def intern(self, arg: int | str | Symbol) -> int:
+        '''
+        Returns the index of the argument `arg`, given by its id or as a clingo `Symbol` `arg(x)`,
+        assigning the next one on its first occurrence.
+        '''
+        if isinstance(arg, Symbol):
+            arg = argument_id(arg.arguments[0])
+        i = self.index.get(arg)
+        if i is None:
+            term = argument_term(arg)
+            i = self.index[arg] = len(self.ids)
+            self.ids.append(arg)
+            self.terms.append(term)
+            self.atoms.append(Function("arg", [term]))
+        return i
+
+    def find(self, arg: int | str | Symbol) -> int | None:
+        '''
+        Returns the index of the argument `arg` like `intern`, or `None` if it has never occurred.
+        '''
+        if isinstance(arg, Symbol):
+            arg = argument_id(arg.arguments[0])
+        return self.index.get(arg)
+
+    def attack(self, source: int, target: int) -> Symbol:
+        '''
+        Returns the atom `att(x,y)` for the attack between the arguments with indices `source` and `target`.
+        '''
+        return Function("att", [self.terms[source], self.terms[target]])
+
+    def of_shown(self, atom: Symbol) -> int:
+        '''
+        Returns the index of the argument in a shown atom `in(x)` of a model.
+        '''
+        i = self.shown.get(atom)
+        if i is None:
+            i = self.shown[atom] = self.intern(argument_id(atom.arguments[0]))
+        return i
 
-    return Function("att", [s, t])
+    def extension(self, symbols: Iterable[Symbol]) -> List[int | str]:
+        '''
+        Returns the ids of the arguments in the shown atoms `in(x)` of a model.
+        '''
+        return [self.ids[self.of_shown(atom)] for atom in symbols]
 
 class IncrAFSolver(AFSolver):
-    def __init__(self, sigma: str, af_file: str | None = None):
+    def __init__(self, sigma: str, af_file: str | None = None, deferred: bool = False, compact_threshold: float | None = 0.75,
+                 cache_size: int = 1024, profile: SolveProfile | str = "default", labelling: bool = False,
+                 slicing: int = 0, scc: bool = False, metrics: bool = False, debug: bool = False):
         """
         Initializes an `AFSolver` instance using the initial argumentation framework (AF) provided in `af_file`
-        and the semantics sigma (`CO`, `PR`, or `ST`).
+        and the semantics `sigma`: `naive`, `adm`, `stable`, `comp` (complete) or `pref` (preferred), see `ENCODINGS`.
         If `af_file` is `None`, the initial AF is assumed to be empty.
         If `af_file` is not a valid file, changes the state of `AFSolver` to `ERROR`.
+        The `af_file` may be in the ICCMA `p af` format, APX or TGF, see `ipafair.loaders.read_af`.
+        Other logic programs are grounded to find their `arg/1` and `att/2` atoms.
+
+        If `deferred` is set, mutations are only recorded in a journal, where an addition and a deletion
+        of the same argument or attack cancel out. The net changes are grounded and assigned in one pass
+        before the next `solve_*` call, or on an explicit call to `flush`.
+
+        If the fraction of deleted arguments and attacks among the grounded ones exceeds `compact_threshold`,
+        the ground program is rebuilt from the live AF before the next `solve_*` call.
+        `None` disables the automatic rebuild.
+
+        Up to `cache_size` answers of `solve_cred` and `solve_skept` are cached until a mutation
+        invalidates them, see `keep_cached`. A `cache_size` of 0 disables the cache.
+
+        The `profile` sets the thread count and clasp configuration for all `solve_*` calls,
+        either as a `SolveProfile` or by its name in `PROFILES`. The query methods accept
+        a `profile` that overrides it for a single call.
+
+        If `labelling` is set, the grounded labelling of the AF is maintained in `self.labelling`,
+        see `grounded.GroundedLabelling`. The `solve_cred` and `solve_skept` calls it decides are answered
+        without the solver, and for the others its labels are passed to the solver as assumptions where sound.
+
+        If `slicing` is positive, credulous `adm`, `comp` and `pref` queries are decided on their relevance slice
+        only: the arguments from which one of the assumptions can be reached along the attacks. An admissible set
+        of this subframework is admissible in the whole AF, and the slice of every admissible set is one of it.
+        Under `comp` and `pref`, which have the same credulously accepted arguments as `adm`, the slice is solved
+        under `adm` too, and the witness is only searched on the whole AF when `extract_witness` asks for it.
+        Up to `slicing` solvers for recent slices are kept and updated to the next slice they are used for.
+
+        If `scc` is set, the strongly connected components of the AF are maintained in `self.condensation`,
+        see `scc.Condensation`, and `stable` queries are solved component by component in topological order.
+        The local extensions of every component are cached until its inner attacks change,
+        so only the components downstream of a mutation have to be solved again.
+        Queries that take more than `SCC_BUDGET` backjumps, or meet a component with more than `SCC_MAX_SIZE`
+        arguments or `SCC_MAX_EXTENSIONS` local extensions, are passed on to the whole ground program.
+
+        Under `pref`, the complete extensions found by the solver are grown to preferred ones by further calls,
+        each requiring a strictly larger one. Skeptical queries look for a preferred extension without the argument
+        in a loop that blocks every complete extension below one found to contain it, see `__counter_model`.
+        The rules these loops add are switched on by a fresh external per call and released afterwards,
+        so the grounding of the AF is never touched.
+
+        If `metrics` is set, the wall time of every mutation, grounding step, solve call and rebuild
+        is recorded in `self.metrics`, see `metrics.Metrics`, along with the size of the ground program
+        and the solver statistics. If `debug` is set, a copy of the ground program is kept in `self.prg`.
         """
-        def load_dimacs(af_file: str):
-            """
-            An internal method to load an AF from a DIMACS-like format.
-            """
-            with open(af_file, "r", encoding="utf-8") as f:
-                line_no = 0
-
-                # Initialization step, getting the first `p` line from the input.
-                parameters = f.readline().strip().split(" ")
-                line_no += 1
-                while parameters[0] == "c":
-                    parameters = f.readline().strip().split(" ")
-                    line_no += 1
-                if parameters[0] != "p" or parameters[1] != "af":
-                    raise StopIteration
-
-                n = int(parameters[2])
-                with SymbolicBackend(self.ctl.backend()) as backend:
-                    # We initialize the arguments according to the header
-                    for v in range(1, n+1):
-                        backend.add_external(Function("arg", [Number(v)]), TruthValue(True))
-
-                    # Every line in the input constitutes one attack.
-                    for line in f:
-                        line_no += 1
-                        arguments = line.strip().split(" ")
-                        if arguments[0] == "c":
-                            continue
-                        if len(arguments) != 2:
-                            raise SyntaxError("Malformed attack in line " + str(line_no))
-
-                        v, u = arguments
-                        v, u = int(v), int(u)
-
-                        self.add_attack(v, u)
-
         def load_asp(af_file: str):
             """
-            An internal method to load an AF from a given logic program.
+            An internal method to load an AF from a logic program that is not plain APX, e.g. one with rules.
             """
             # We basically let the grounder do the parsing of an instance file by throwing 
             # the instance into a temporary context to get objects for the atoms.
@@ -101,83 +301,301 @@ class IncrAFSolver(AFSolver):
                 tmp.ground()
                 tmp.ground([("instance", [])])
 
-                for v in tmp.symbolic_atoms.by_signature("arg", 1):
-                    self.add_argument(v.symbol)
-
-                for e in tmp.symbolic_atoms.by_signature("att", 2):
-                    self.add_attack(attack=e.symbol)
+                self.add_arguments(v.symbol for v in tmp.symbolic_atoms.by_signature("arg", 1))
+                self.add_attacks(e.symbol for e in tmp.symbolic_atoms.by_signature("att", 2))
       
-        self.ctl = Control(arguments=["--models=0"])
-
-        # `Program` is for pretty-printing a ground program. Useful for debugging.
-        self.prg = Program()
-        self.ctl.register_observer(ProgramObserver(self.prg))
-
-        if sigma == "naive":
-            self.ctl.load("incr-dung/naive.lp")
-        elif sigma == "adm":
-            self.ctl.load("incr-dung/adm.lp")
-        elif sigma == "stable":
-            self.ctl.load("incr-dung/stable.lp")
-        else:
+        # All arguments that ever occurred, with their indices. The index and the journal below
+        # only hold these indices, and the clingo symbols are built from the table when needed.
+        self.table = SymbolTable()
+
+        # Adjacency index of the live attacks, keyed by the argument indices.
+        # `attackers[x]` are the sources of attacks on `x`, `targets[x]` the targets of attacks by `x`.
+        self.attackers: Dict[int, Set[int]] = defaultdict(set)
+        self.targets: Dict[int, Set[int]] = defaultdict(set)
+
+        # The live arguments, again by their indices.
+        self.arguments: Set[int] = set()
+
+        # In deferred mode, maps every argument or attack changed since the last flush, by its `Key`,
+        # to its truth value before the change.
+        self.deferred = deferred
+        self.journal: Dict[Key, bool] = {}
+
+        # Number of grounded `add_attack` parts incident to each argument.
+        # The encodings use it to chain the rules of later attacks onto earlier ones.
+        self.degree: Dict[int, int] = defaultdict(int)
+
+        # Deleted arguments and attacks stay in the ground program as false externals.
+        # Once more than `compact_threshold` of the grounded ones are dead, the program is rebuilt,
+        # see `compact`. The statistics of every rebuild are appended to `compactions`.
+        self.compact_threshold = compact_threshold
+        self.grounded = 0
+        self.live = 0
+        self.compactions: List[dict] = []
+
+        # Answers of `solve_cred` and `solve_skept` with their witnesses and the AF version they hold for,
+        # keyed by `(sigma, mode, assumptions)` and kept in LRU order. Every mutation bumps `version`,
+        # and only the entries `keep_cached` accepts are carried over to the new version, in place.
+        self.version = 0
+        self.cache_size = cache_size
+        self.cache: OrderedDict[tuple, Tuple[bool, List[int | str] | None, int]] = OrderedDict()
+        self.__touched: Set[int] | None = None
+        self.__touched_stale = True
+
+        self.labelling = GroundedLabelling(self.arguments, self.attackers, self.targets) if labelling else None
+
+        # Solvers for the relevance slices of credulous queries, keyed by the argument indices of their slice
+        # and kept in LRU order, each with the AF version it was last updated at, see `__solve_slice`.
+        self.slicing = slicing
+        self.slices: OrderedDict[FrozenSet[int], Tuple[IncrAFSolver, int]] = OrderedDict()
+
+        # The components of the AF and the solver for the subframeworks of single components, see `__solve_components`.
+        self.condensation = Condensation(self.arguments, self.attackers, self.targets) if scc else None
+        self.component_solver: IncrAFSolver | None = None
+
+        # While checkpoints are open, every change `(key, before)` is appended to the undo log.
+        # `checkpoints` holds the log position of every open checkpoint, innermost last.
+        self.undo: List[Tuple[Key, bool]] = []
+        self.checkpoints: List[int] = []
+
+        if sigma not in ENCODINGS:
             raise KeyError("Semantics name is not known")
+        self.sigma = sigma
+        self.profile = to_profile(profile)
+        self.metrics = Metrics() if metrics else None
+        self.debug = debug
+        self.__make_control()
+
+        # Serializes the asynchronous `solve_*_async` calls, since a `Control` can only run one search at a time.
+        # Mutations made while one of them runs are journaled, as in deferred mode.
+        self.lock = asyncio.Lock()
+        self.solving = False
 
         if af_file:
             try:
-                load_dimacs(af_file)
-            except StopIteration:
+                args, attacks = read_af(af_file)
+            except ValueError:
                 load_asp(af_file)
+            else:
+                self.__load_index(args, attacks)
+            self.flush()
 
-        self.ctl.add("output_filter", [], "#show in/1.")
-    
-        self.ctl.ground()
+        with self.__measure("ground"):
+            self.ctl.ground()
 
         # When solving credulously or skeptically, we only return `True` or `False`.
         # A witness can be found with `extract_witness` and this is where it is stored.
-        self.witness: List[Symbol] = []
+        self.witness: List[int | str] | None = []
+        self.last_query: tuple | None = None
 
     def __del__(self):
         pass
 
-    def add_argument(self, arg: int | str | Symbol):
+    def __make_control(self):
         '''
-        Adds the argument `arg` to the current AF instance.
+        Sets up a fresh `Control` with the encoding for the semantics, without any arguments or attacks.
+        '''
+        self.ctl = Control(arguments=["--models=0"])
+        # The solver literals of the `in(x)` atoms, by argument index, and those fixed by the labelling.
+        self.literals: Dict[int, int] = {}
+        self.fixed: Dict[bool, Tuple[int, List[int]]] = {}
+        self.applied_profile: SolveProfile | None = None
 
-        If `arg` is given as `int` or `str`, it gets wrapped as a clingo `Symbol` first.
+        # `Program` is for pretty-printing a ground program. Useful for debugging.
+        self.prg: Program | None = None
+        if self.debug:
+            self.prg = Program()
+            self.ctl.register_observer(ProgramObserver(self.prg))
+        if self.metrics is not None:
+            self.metrics.attach(self.ctl)
+
+        for path in ENCODINGS[self.sigma]:
+            self.ctl.load(path)
+        self.ctl.add("output_filter", [], "#show in/1.")
 
-        If directly providing a clingo `Symbol`, no sanity checks are performed.
+    def __measure(self, op: str, **fields):
+        '''
+        Returns a context manager recording the enclosed operation in `self.metrics`, if enabled.
         '''
-        if isinstance(arg,int) or isinstance(arg,str):
-            arg = make_argument(arg)
-        elif not isinstance(arg,Symbol):
-            raise TypeError("arg must be an argument id (int or str) or a clingo Symbol.")
+        if self.metrics is None:
+            return nullcontext({})
+        return self.metrics.measure(op, self, **fields)
 
-        old = arg in self.ctl.symbolic_atoms
+    def dead_fraction(self) -> float:
+        '''
+        Returns the fraction of the grounded arguments and attacks that have been deleted since.
+        '''
+        if self.grounded == 0:
+            return 0.0
+        return 1 - self.live / self.grounded
 
-        with SymbolicBackend(self.ctl.backend()) as backend:
-            backend.add_external(arg, TruthValue(True))
-        
-        if not old: self.ctl.ground([("add_argument", arg.arguments)])
+    def compact(self):
+        '''
+        Rebuilds the ground program in a fresh `Control` from the live arguments and attacks only,
+        dropping the rules of all deleted ones.
 
-    def del_argument(self, arg: int | str | Symbol):
+        Appends the program statistics before the rebuild to `compactions`. Those after it are
+        filled in by the next `solve_*` call, since the statistics of a `Control` must not be read before
+        its first `solve` call.
+
+        Raises `RuntimeError` while checkpoints are open.
         '''
-        Deletes the argument `arg` from the current AF instance.
+        if self.checkpoints:
+            raise RuntimeError("Cannot compact while checkpoints are open")
+        self.flush()
+        stats = {"dead_fraction": self.dead_fraction(), "before": program_stats(self.ctl)}
+        start = time.perf_counter()
 
-        If `arg` is given as `int` or `str`, it gets wrapped as a clingo `Symbol` first.
+        with self.__measure("compact"):
+            self.__make_control()
+            self.degree.clear()
+            self.grounded = 0
 
-        If directly providing a clingo `Symbol`, no sanity checks are performed.
+            self.__ground_all()
+            self.ctl.ground()
+
+        stats["rebuild_time"] = time.perf_counter() - start
+        stats["after"] = None
+        self.compactions.append(stats)
+
+    def __prepare_solve(self, profile: SolveProfile | str | None = None):
+        '''
+        Brings the ground program up to date before a `solve_*` call
+        and configures the solver for `profile`, or the profile of the solver if it is `None`.
+        '''
+        self.flush()
+        # A rebuild drops the rules of deleted atoms, which a rollback might need again.
+        if self.compact_threshold is not None and self.grounded >= COMPACT_MIN_ATOMS and not self.checkpoints \
+                and self.dead_fraction() > self.compact_threshold:
+            self.compact()
+
+        profile = to_profile(profile) if profile is not None else self.profile
+        if profile != self.applied_profile:
+            self.ctl.configuration.solve.parallel_mode = f"{profile.threads},{profile.parallel_mode}"
+            self.ctl.configuration.configuration = profile.configuration
+            self.applied_profile = profile
+
+    def __finish_solve(self):
         '''
-        if isinstance(arg,int) or isinstance(arg,str):
-            arg = make_argument(arg)
-        elif not isinstance(arg,Symbol):
-            raise TypeError("arg must be an argument id (int or str) or a clingo Symbol.")
+        Completes the statistics of a preceding rebuild with those of the first solve call after it.
+        '''
+        if self.compactions and self.compactions[-1]["after"] is None:
+            self.compactions[-1]["after"] = program_stats(self.ctl)
 
-        self.ctl.assign_external(arg, False)
+    def __cache_hit(self, key: tuple) -> bool | None:
+        '''
+        Returns the cached answer for `key` and sets its witness, or `None` if there is none for the current AF.
+        '''
+        entry = self.cache.get(key)
+        if entry is None or entry[2] != self.version:
+            return None
+        self.cache.move_to_end(key)
+        result, self.witness, _ = entry
+        self.last_query = key
+        return result
+
+    def __cache_store(self, key: tuple, result: bool, version: int | None = None):
+        '''
+        Caches the answer for `key`, found on the AF of `version`, by default the current one.
+        Answers that a mutation made while they were searched are dropped.
+        '''
+        self.last_query = key
+        if self.cache_size <= 0 or version is not None and version != self.version:
+            return
+        self.cache[key] = (result, self.witness, self.version)
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+
+    def __invalidate(self, changes: List[Tuple[Key, bool, bool]]):
+        '''
+        Bumps the AF version after a mutation and moves the cache entries that `keep_cached` accepts
+        over to the new version, in place. Their witnesses are dropped, since they are extensions of the old AF.
+        The other entries are evicted.
+        '''
+        self.version += 1
+        self.__touched_stale = True
+        if not self.cache:
+            return
+
+        evicted = []
+        for key, (result, _, version) in self.cache.items():
+            if version == self.version - 1 and self.keep_cached(changes, (*key, version)):
+                self.cache[key] = (result, None, self.version)
+            else:
+                evicted.append(key)
+        for key in evicted:
+            del self.cache[key]
+
+    def keep_cached(self, changes: List[Tuple[Key, bool, bool]], key: tuple) -> bool:
+        '''
+        Decides whether the cached answer for `key`, i.e. `(sigma, mode, assumptions, version)`, stays valid
+        after the mutation given by `changes`, a list of `(key, before, after)` for the changed arguments and attacks,
+        see `Key`.
+
+        The default keeps an entry if it has assumptions and none of them is weakly connected to a changed
+        argument, for the semantics where the extensions of an AF are the products of those of its components,
+        and every component has at least one (`naive` and `adm`). If more than `CACHE_MAX_TOUCHED` arguments
+        are connected to the change, no entry is kept.
+        Replace or override this method to plug in a different policy.
+        '''
+        sigma, mode, assumps, _ = key
+        if sigma not in ("naive", "adm") or not assumps:
+            return False
+
+        touched = self.__touched_component(changes)
+        return touched is not None and not any(self.table.find(a) in touched for a in assumps)
 
-        for edge in self.ctl.symbolic_atoms.by_signature("att", 2):
-            A, B = edge.symbol.arguments
-            if arg.arguments[0] == A or arg.arguments[0] == B:
-                self.ctl.assign_external(Function("att", [A, B]), False)
+    def __touched_component(self, changes: List[Tuple[Key, bool, bool]]) -> Set[int] | None:
+        '''
+        Returns the arguments weakly connected to any argument in `changes`, in the AF that
+        contains both the current attacks and those deleted by the mutation, or `None` once there are
+        more than `CACHE_MAX_TOUCHED` of them. Computed once per mutation.
+        '''
+        if not self.__touched_stale:
+            return self.__touched
+        self.__touched_stale = False
+        self.__touched = None
+
+        deleted: Dict[int, Set[int]] = defaultdict(set)
+        queue = []
+        for key, _, after in changes:
+            if isinstance(key, int):
+                queue.append(key)
+                continue
+            s, t = key
+            queue.extend(key)
+            if not after:
+                deleted[s].add(t)
+                deleted[t].add(s)
+
+        touched = set(queue)
+        while queue:
+            x = queue.pop()
+            for y in (*self.attackers.get(x, ()), *self.targets.get(x, ()), *deleted.get(x, ())):
+                if y not in touched:
+                    touched.add(y)
+                    queue.append(y)
+            if len(touched) > CACHE_MAX_TOUCHED:
+                return None
+
+        self.__touched = touched
+        return touched
+
+    def add_argument(self, arg: int | str | Symbol):
+        '''
+        Adds the argument `arg` to the current AF instance.
+
+        The argument is given by its id (`int` or `str`) or as a clingo `Symbol` `arg(x)`.
+        '''
+        self.add_arguments([arg])
+
+    def del_argument(self, arg: int | str | Symbol):
+        '''
+        Deletes the argument `arg` from the current AF instance.
+
+        The argument is given by its id (`int` or `str`) or as a clingo `Symbol` `arg(x)`.
+        '''
+        self.del_arguments([arg])
 
     def add_attack(self, source: int | str | None = None, target: int | str | None = None, attack: Symbol | None = None):
         '''
@@ -188,18 +606,7 @@ class IncrAFSolver(AFSolver):
 
         If directly providing a clingo `Symbol`, no sanity checks are performed.
         '''
-        if source != None and target != None and attack == None:
-            attack = make_attack(source, target)
-        elif isinstance(attack, Symbol) and (source != None or target != None):
-            raise TypeError("attack and (source,target) parameters are mutually exclusive.")
-        
-        assert(isinstance(attack, Symbol))
-        old = attack in self.ctl.symbolic_atoms
-
-        with SymbolicBackend(self.ctl.backend()) as backend:
-            backend.add_external(attack, TruthValue(True))
-
-        if not old: self.ctl.ground([("add_attack", attack.arguments)])        
+        self.add_attacks([self.__attack(source, target, attack)])
 
     def del_attack(self, source: int | str | None = None, target: int | str | None = None, attack: Symbol | None = None):
         '''
@@ -210,43 +617,561 @@ class IncrAFSolver(AFSolver):
 
         If directly providing a clingo `Symbol`, no sanity checks are performed.
         '''
-        if source != None and target != None and attack == None:
-            attack = make_attack(source, target)
-        elif isinstance(attack, Symbol) and (source != None or target != None):
-            raise TypeError("attack and (source,target) parameters are mutually exclusive.")
-        
-        assert(isinstance(attack, Symbol))
+        self.del_attacks([self.__attack(source, target, attack)])
+
+    @staticmethod
+    def __attack(source: int | str | None, target: int | str | None, attack: Symbol | None) -> Tuple[int | str, int | str] | Symbol:
+        '''
+        Returns the pair `(source, target)` if given, without building a `Symbol` for it, or else `attack`.
+        '''
+        if attack is None and source is not None and target is not None:
+            return source, target
+        return to_attack(source, target, attack)
+
+    def add_arguments(self, args: Iterable[int | str | Symbol]):
+        '''
+        Adds all arguments in `args` to the current AF instance.
+
+        The externals of the whole batch are set in a single backend session and
+        the parts for the new arguments are grounded in a single `ground` call.
+        '''
+        changes = []
+        for arg in args:
+            x = self.table.intern(arg)
+            if x not in self.arguments:
+                self.arguments.add(x)
+                changes.append((x, False, True))
+
+        self.__commit(changes)
+
+    def del_arguments(self, args: Iterable[int | str | Symbol]):
+        '''
+        Deletes all arguments in `args`, together with their incident attacks, from the current AF instance.
+        '''
+        changes = []
+        for arg in args:
+            x = self.table.find(arg)
+            if x is None:
+                continue
+            if x in self.arguments:
+                self.arguments.discard(x)
+                changes.append((x, True, False))
+
+            # Only the attacks incident to `arg` need to be disabled, so we look them up in the index.
+            for s in self.attackers.pop(x, ()):
+                self.targets[s].discard(x)
+                changes.append(((s, x), True, False))
+            for t in self.targets.pop(x, ()):
+                self.attackers[t].discard(x)
+                changes.append(((x, t), True, False))
+
+        self.__commit(changes)
+
+    def add_attacks(self, attacks: Iterable[Tuple[int | str, int | str] | Symbol]):
+        '''
+        Adds all attacks in `attacks` to the current AF instance.
+        An attack is either given as a pair `(source, target)` or as a clingo `Symbol`.
+
+        The externals of the whole batch are set in a single backend session and
+        the parts for the new attacks are grounded in a single `ground` call.
+        '''
+        changes = []
+        for attack in attacks:
+            if isinstance(attack, Symbol):
+                attack = map(argument_id, attack.arguments)
+            s, t = map(self.table.intern, attack)
+
+            if s not in self.attackers[t]:
+                self.attackers[t].add(s)
+                self.targets[s].add(t)
+                changes.append(((s, t), False, True))
+
+        self.__commit(changes)
+
+    def del_attacks(self, attacks: Iterable[Tuple[int | str, int | str] | Symbol]):
+        '''
+        Deletes all attacks in `attacks` from the current AF instance.
+        An attack is either given as a pair `(source, target)` or as a clingo `Symbol`.
+        '''
+        changes = []
+        for attack in attacks:
+            if isinstance(attack, Symbol):
+                attack = map(argument_id, attack.arguments)
+            s, t = map(self.table.find, attack)
+
+            if s is not None and s in self.attackers.get(t, ()):
+                self.attackers[t].discard(s)
+                self.targets[s].discard(t)
+                changes.append(((s, t), True, False))
+
+        self.__commit(changes)
+
+    def __commit(self, changes: List[Tuple[Key, bool, bool]], log: bool = True):
+        '''
+        Takes the changes `(key, before, after)` of the arguments and attacks made by a mutation.
+        They are applied to clingo right away, or recorded in the journal in deferred mode
+        and while an asynchronous `solve` call is running.
+        If checkpoints are open and `log` is set, they are also appended to the undo log.
+        '''
+        if not changes:
+            return
+        if log and self.checkpoints:
+            self.undo.extend((key, before) for key, before, _ in changes)
+        if self.labelling is not None:
+            # An argument's label only depends on its attackers, so the targets of changed attacks are touched.
+            self.labelling.touch(key if isinstance(key, int) else key[1] for key, _, _ in changes)
+        if self.condensation is not None:
+            self.condensation.touch(changes)
+        with self.__measure("mutate", changes=len(changes)):
+            self.__invalidate(changes)
+            self.live += sum(1 if after else -1 for _, _, after in changes)
+
+            if not self.deferred and not self.solving:
+                self.__apply([(key, after) for key, _, after in changes])
+                return
+
+            for key, before, after in changes:
+                if key not in self.journal:
+                    self.journal[key] = before
+                elif self.journal[key] == after:
+                    # The change reverts an earlier one since the last flush, so the pair cancels out.
+                    del self.journal[key]
+
+    def checkpoint(self) -> int:
+        '''
+        Opens a checkpoint of the current AF and returns its handle for `rollback` or `release`.
+        Checkpoints can be nested. While any is open, the ground program is not compacted.
+        '''
+        self.checkpoints.append(len(self.undo))
+        return len(self.checkpoints) - 1
+
+    def rollback(self, cp: int):
+        '''
+        Restores the AF at checkpoint `cp` and closes it, along with all checkpoints opened after it.
+
+        Every argument and attack that changed since is reset to its state at the checkpoint
+        by assigning its external in one batch. Since the ground program only grows,
+        nothing has to be grounded again.
+        '''
+        position = self.__close(cp)
+
+        # The earliest change of every atom since the checkpoint holds its value at the checkpoint.
+        restore: Dict[Key, bool] = {}
+        for key, before in reversed(self.undo[position:]):
+            restore[key] = before
+        del self.undo[position:]
+        if not self.checkpoints:
+            self.undo.clear()
+
+        changes = [(key, not value, value) for key, value in restore.items() if self.__set_index(key, value)]
+        self.__commit(changes, log=False)
+
+    def release(self, cp: int):
+        '''
+        Closes checkpoint `cp`, along with all checkpoints opened after it, keeping the changes since.
+        '''
+        self.__close(cp)
+        if not self.checkpoints:
+            self.undo.clear()
+
+    @contextmanager
+    def transaction(self, commit: bool = False):
+        '''
+        Opens a checkpoint for the enclosed block and yields its handle.
+        By default, all changes of the block are rolled back when it is left, so it can be used
+        for what-if queries. With `commit`, they are kept, unless the block raises an exception.
+        '''
+        cp = self.checkpoint()
+        try:
+            yield cp
+        except BaseException:
+            if cp < len(self.checkpoints):
+                self.rollback(cp)
+            raise
+        if cp < len(self.checkpoints):
+            if commit:
+                self.release(cp)
+            else:
+                self.rollback(cp)
+
+    def __close(self, cp: int) -> int:
+        '''
+        Closes checkpoint `cp` and all later ones, and returns the undo log position of `cp`.
+        '''
+        if not 0 <= cp < len(self.checkpoints):
+            raise ValueError("Checkpoint is not open")
+        position = self.checkpoints[cp]
+        del self.checkpoints[cp:]
+        return position
+
+    def __set_index(self, key: Key, value: bool) -> bool:
+        '''
+        Adds the argument or attack `key` to the index, or removes it if `value` is `False`.
+        Returns whether this changed the index.
+        '''
+        if isinstance(key, int):
+            x = key
+            if (x in self.arguments) == value:
+                return False
+            if value:
+                self.arguments.add(x)
+            else:
+                self.arguments.discard(x)
+            return True
+
+        s, t = key
+        if (s in self.attackers.get(t, ())) == value:
+            return False
+        if value:
+            self.attackers[t].add(s)
+            self.targets[s].add(t)
+        else:
+            self.attackers[t].discard(s)
+            self.targets[s].discard(t)
+        return True
+
+    def flush(self):
+        '''
+        Applies the net changes recorded in the journal, if the solver runs in deferred mode.
+        This happens automatically before every `solve_*` call.
+        '''
+        if self.journal:
+            changes = [(key, not before) for key, before in self.journal.items()]
+            self.journal.clear()
+            self.__apply(changes)
+
+    def __apply(self, changes: List[Tuple[Key, bool]]):
+        '''
+        Assigns the externals of the arguments and attacks in `changes` and grounds the parts of those
+        that are new to clingo, using a single backend session and a single `ground` call.
 
-        self.ctl.assign_external(attack, False)
+        An attack is grounded together with the argument parts of its endpoints, if they are not grounded yet,
+        with a false external for those that are not in the AF. Otherwise clingo would take `in(x)` to be false
+        for good in the rules of the attack, also once `x` is added.
+        '''
+        table = self.table
+        symbolic_atoms = self.ctl.symbolic_atoms
+        atoms = [(table.atoms[key] if isinstance(key, int) else table.attack(*key), value) for key, value in changes]
+
+        parts = []
+        arguments: Set[int] = set()
+        endpoints: Dict[int, None] = {}
+        for (key, value), (atom, _) in zip(changes, atoms):
+            if not value or atom in symbolic_atoms:
+                continue
+            if isinstance(key, int):
+                arguments.add(key)
+                parts.append(("add_argument", [table.terms[key]]))
+            else:
+                s, t = key
+                endpoints[s] = endpoints[t] = None
+                parts.append(("add_attack", [table.terms[s], table.terms[t], Number(self.degree[s]), Number(self.degree[t])]))
+                self.degree[s] += 1
+                if s != t: self.degree[t] += 1
+
+        missing = [x for x in endpoints if x not in arguments and table.atoms[x] not in symbolic_atoms]
+        parts.extend(("add_argument", [table.terms[x]]) for x in missing)
+
+        with self.__measure("ground", parts=len(parts)):
+            with SymbolicBackend(self.ctl.backend()) as backend:
+                for atom, value in atoms:
+                    if value: backend.add_external(atom, TruthValue(True))
+                for x in missing:
+                    backend.add_external(table.atoms[x], TruthValue.False_)
+
+            for atom, value in atoms:
+                if not value: self.ctl.assign_external(atom, False)
+
+            if parts: self.ctl.ground(parts)
+        self.grounded += len(parts)
+
+    def __ground_all(self):
+        '''
+        Grounds all live arguments and attacks into a fresh `Control` in a single `ground` call.
+        Unlike `__apply`, this skips the lookups for atoms that are already grounded.
+        The endpoints of attacks that are not in the AF get their argument parts with a false external, as in `__apply`.
+        '''
+        table = self.table
+        parts = []
+        externals = []
+        missing = set()
+        for x in self.arguments:
+            parts.append(("add_argument", [table.terms[x]]))
+            externals.append(table.atoms[x])
+        for t, sources in self.attackers.items():
+            for s in sources:
+                parts.append(("add_attack", [table.terms[s], table.terms[t], Number(self.degree[s]), Number(self.degree[t])]))
+                externals.append(table.attack(s, t))
+                self.degree[s] += 1
+                if s != t: self.degree[t] += 1
+                missing.add(s)
+                missing.add(t)
+        missing -= self.arguments
+        parts.extend(("add_argument", [table.terms[x]]) for x in missing)
+
+        with self.__measure("ground", parts=len(parts)):
+            with SymbolicBackend(self.ctl.backend()) as backend:
+                for atom in externals:
+                    backend.add_external(atom, TruthValue(True))
+                for x in missing:
+                    backend.add_external(table.atoms[x], TruthValue.False_)
+            if parts: self.ctl.ground(parts)
+        self.grounded += len(parts)
+
+    def attackers_of(self, arg: int | str | Symbol) -> List[int | str]:
+        '''
+        Returns the arguments that currently attack the argument `arg`.
 
-    def solve_enum(self, assumps: List[int] = [], verbose = False) -> List[List[Symbol]]:
+        Answered from the adjacency index, so this costs O(in-degree of `arg`).
+        '''
+        return [self.table.ids[s] for s in self.attackers.get(self.table.find(arg), ())]
+
+    def attacked_by(self, arg: int | str | Symbol) -> List[int | str]:
+        '''
+        Returns the arguments that are currently attacked by the argument `arg`.
+
+        Answered from the adjacency index, so this costs O(out-degree of `arg`).
+        '''
+        return [self.table.ids[t] for t in self.targets.get(self.table.find(arg), ())]
+
+    def save(self, path: str):
+        '''
+        Writes a snapshot of the live AF, the semantics and the solver options to `path`,
+        from which `IncrAFSolver.load` restores an equivalent solver.
+
+        The arguments are stored as 64-bit integers if all of them are numbers and as terms otherwise,
+        the attacks as pairs of 32-bit indices into the arguments, both compressed with zlib.
+        Attacks may involve arguments that are not in the AF, which are stored after the live ones.
+        '''
+        args = sorted(self.arguments)
+        args.extend(sorted({i for t in self.attackers for s in self.attackers[t] for i in (s, t)} - self.arguments))
+        index = {x: i for i, x in enumerate(args)}
+
+        ids = self.table.ids
+        numeric = all(isinstance(ids[x], int) for x in args)
+        if numeric:
+            arg_data = array("q", (ids[x] for x in args)).tobytes()
+        else:
+            arg_data = "\n".join(str(self.table.terms[x]) for x in args).encode("utf-8")
+        att_data = array("I", (index[i] for t in self.attackers for s in self.attackers[t] for i in (s, t))).tobytes()
+
+        header = json.dumps({
+            "sigma": self.sigma,
+            "numeric": numeric,
+            "live": len(self.arguments),
+            "byteorder": sys.byteorder,
+            "options": {
+                "deferred": self.deferred,
+                "compact_threshold": self.compact_threshold,
+                "cache_size": self.cache_size,
+                "profile": list(self.profile),
+                "labelling": self.labelling is not None,
+                "slicing": self.slicing,
+                "scc": self.condensation is not None,
+            },
+        }).encode("utf-8")
+
+        with open(path, "wb") as f:
+            f.write(SNAPSHOT_MAGIC)
+            for block in (header, zlib.compress(arg_data), zlib.compress(att_data)):
+                f.write(struct.pack("<Q", len(block)))
+                f.write(block)
+
+    @classmethod
+    def load(cls, path: str, **options) -> "IncrAFSolver":
+        '''
+        Restores a solver from a snapshot written by `save`. The `options` override the saved
+        constructor options, e.g. to enable `metrics`.
+
+        The AF goes straight into the index and is grounded in a single pass, like in `compact`.
+        '''
+        with open(path, "rb") as f:
+            if f.read(len(SNAPSHOT_MAGIC)) != SNAPSHOT_MAGIC:
+                raise ValueError(f"{path} is not an AF snapshot")
+            blocks = []
+            for _ in range(3):
+                size, = struct.unpack("<Q", f.read(8))
+                blocks.append(f.read(size))
+
+        header = json.loads(blocks[0])
+        saved = header["options"]
+        saved["profile"] = SolveProfile(*saved["profile"])
+        solver = cls(header["sigma"], **{**saved, **options})
+
+        if header["numeric"]:
+            numbers = array("q")
+            numbers.frombytes(zlib.decompress(blocks[1]))
+            if header["byteorder"] != sys.byteorder: numbers.byteswap()
+            args: List[int | str] = numbers.tolist()
+        else:
+            data = zlib.decompress(blocks[1]).decode("utf-8")
+            args = [argument_id(parse_term(x)) for x in data.split("\n")] if data else []
+
+        indices = array("I")
+        indices.frombytes(zlib.decompress(blocks[2]))
+        if header["byteorder"] != sys.byteorder: indices.byteswap()
+
+        attacks = ((args[indices[i]], args[indices[i+1]]) for i in range(0, len(indices), 2))
+        solver.__load_index(args[:header.get("live", len(args))], attacks)
+        return solver
+
+    def __load_index(self, args: Iterable[int | str], attacks: Iterable[Tuple[int | str, int | str]]):
+        '''
+        Loads arguments and attacks, given by their ids, into a solver that has none yet,
+        straight into the index and grounded in a single pass. Endpoints of attacks that are not among `args`
+        stay out of the AF, but their argument parts are grounded too, see `__ground_all`.
+        '''
+        intern = self.table.intern
+        self.arguments.update(map(intern, args))
+        for s, t in attacks:
+            s, t = intern(s), intern(t)
+            self.attackers[t].add(s)
+            self.targets[s].add(t)
+        self.live = len(self.arguments) + sum(len(sources) for sources in self.attackers.values())
+        if self.labelling is not None:
+            self.labelling.reset()
+        if self.condensation is not None:
+            self.condensation.reset()
+        self.__ground_all()
+
+    def solve_enum(self, assumps: List[int] = [], verbose = False, profile: SolveProfile | str | None = None) -> List[List[int | str]]:
         '''
         Solves the current AF instance and enumerates all models 
         under assumptions that all arguments in `assumps` are contained in an extension.
         
-        Returns `True` if the answer is "yes" and `False` if the answer is "no".
-        Other return codes indicate that the solver is in state `ERROR`.
+        Returns the argument ids of every extension.
+        Use `iter_extensions` to stream the extensions instead of collecting them all.
         
         The `verbose` flag causes the model(s) to be pretty printed during the `solve` call.
+        A `profile` overrides the solving profile for this call.
         '''
+        self.__prepare_solve(profile)
         self.ctl.configuration.solve.enum_mode = "record"
 
+        literals = self.__literals(assumps)
+        if literals is None:
+            return []
+
         def on_model(m: Model):
             if verbose: print(f"DEBUG Model {m.number}:", m)
 
-        result = cast(SolveHandle, self.ctl.solve(assumps, on_model=on_model, yield_=True))
-
         models = []
 
-        for i, m in enumerate(result):
-            models.append(list(m.symbols(shown=True)))
+        with self.__measure("solve", mode="enum"):
+            if self.sigma == "pref":
+                models.extend(self.__preferred_extensions(literals))
+            else:
+                with cast(SolveHandle, self.ctl.solve(literals, on_model=on_model, yield_=True)) as result:
+                    for i, m in enumerate(result):
+                        models.append(self.table.extension(m.symbols(shown=True)))
+        self.__finish_solve()
 
         return models
 
-    def __prepare_pretty_print_model(self, model: List[Symbol]):
-        return [f"{s.name}({','.join(map(str, s.arguments))})" for s in model]
+    def iter_extensions(self, limit: int | None = None, assumps: List[int] = [], bitset: bool = False,
+                        profile: SolveProfile | str | None = None) -> Iterator[array | int]:
+        '''
+        Yields the extensions of the current AF instance that contain all arguments in `assumps`,
+        one at a time and at most `limit` of them.
+
+        Every extension is an `array` of the indices of its arguments in `table`, or with `bitset`
+        an `int` with the bits of these indices set. `argument_ids` translates both back to ids.
+        Nothing is kept between extensions, so memory use does not grow with their number, except under `pref`:
+        every preferred extension found is blocked by a rule with a literal per argument, which stays in the ground
+        program while the generator runs. These rules are switched off for good when it is exhausted or closed.
+
+        The solver is busy until the generator is exhausted or closed: mutations are journaled
+        meanwhile, and no other query may be run. A `profile` overrides the solving profile.
+        '''
+        self.__prepare_solve(profile)
+        # Unlike "record", the default backtracking enumeration does not add a nogood per model.
+        self.ctl.configuration.solve.enum_mode = "auto"
+
+        literals = self.__literals(assumps)
+        if literals is None or limit == 0:
+            return
+
+        self.solving = True
+        try:
+            with self.__measure("solve", mode="iter"), closing(self.__extension_indices(literals)) as extensions:
+                for count, indices in enumerate(extensions, start=1):
+                    if bitset:
+                        bits = bytearray((len(self.table) + 7) // 8)
+                        for i in indices:
+                            bits[i >> 3] |= 1 << (i & 7)
+                        yield int.from_bytes(bits, "little")
+                    else:
+                        yield indices
+                    if limit is not None and count >= limit:
+                        break
+        finally:
+            self.solving = False
+        self.__finish_solve()
+
+    def __extension_indices(self, literals: List[int]) -> Iterator[array]:
+        '''
+        Yields the extensions containing the arguments with the solver literals `literals` as sorted arrays of indices.
+        '''
+        if self.sigma == "pref":
+            for model in self.__preferred_extensions(literals):
+                yield array("I", sorted(map(self.table.index.__getitem__, model)))
+            return
+        with cast(SolveHandle, self.ctl.solve(literals, yield_=True)) as handle:
+            for m in handle:
+                yield array("I", sorted(map(self.table.of_shown, m.symbols(shown=True))))
+
+    def count_extensions(self, cap: int | None = None, timeout: float | None = None, assumps: List[int] = [],
+                         profile: SolveProfile | str | None = None) -> Tuple[int, bool]:
+        '''
+        Counts the extensions of the current AF instance that contain all arguments in `assumps`.
+        The models are counted by clasp itself, without building any Python objects for them.
+
+        Stops after `cap` extensions or `timeout` seconds. Returns the number of extensions found
+        (at most `cap`) and whether these are all of them. A `profile` overrides the solving profile.
+        '''
+        self.__prepare_solve(profile)
+        self.ctl.configuration.solve.enum_mode = "auto"
+
+        literals = self.__literals(assumps)
+        if literals is None:
+            return 0, True
+
+        with self.__measure("solve", mode="count"):
+            if self.sigma == "pref":
+                result = self.__count_preferred(literals, cap, timeout)
+            else:
+                result = count_models(self.ctl, literals, cap, timeout)
+        self.__finish_solve()
+        return result
+
+    def __count_preferred(self, literals: List[int], cap: int | None, timeout: float | None) -> Tuple[int, bool]:
+        '''
+        Like `debug.count_models` for the preferred extensions, which are found one at a time,
+        so the `timeout` is only checked between them.
+        '''
+        deadline = time.perf_counter() + timeout if timeout is not None else math.inf
+        count = 0
+        with closing(self.__preferred_extensions(literals)) as extensions:
+            for _ in extensions:
+                if cap is not None and count == cap:
+                    return cap, False
+                count += 1
+                if time.perf_counter() > deadline:
+                    return count, False
+        return count, True
+
+    def argument_ids(self, extension: Iterable[int] | int) -> List[int | str]:
+        '''
+        Translates an extension yielded by `iter_extensions`, as indices or as a bitset, to the argument ids.
+        '''
+        if isinstance(extension, int):
+            extension = [i for i in range(extension.bit_length()) if extension >> i & 1]
+        return [self.table.ids[i] for i in extension]
+
+    def __prepare_pretty_print_model(self, model: List[int | str]):
+        return [f"in({argument_term(x)})" for x in model]
 
-    def solve_cred(self, assumps: List[int] = [], verbose = False) -> bool:
+    def solve_cred(self, assumps: List[int] = [], verbose = False, profile: SolveProfile | str | None = None) -> bool:
         '''
         Solves the current AF instance under the specified semantics in the
         credulous reasoning mode under assumptions that all arguments in `assumps`
@@ -256,53 +1181,634 @@ class IncrAFSolver(AFSolver):
 
         Other return codes indicate that the solver is in state `ERROR`.
 
-        The `verbose` flag causes the model(s) to be pretty printed during the `solve` call.
+        The search stops at the first extension containing `assumps`, which becomes the witness.
+        Use `accepted_cred` to get all credulously accepted arguments at once.
+
+        The `verbose` flag causes the witness to be pretty printed.
+        A `profile` overrides the solving profile for this call.
         '''
-        self.ctl.configuration.solve.enum_mode = "brave"
+        key = (self.sigma, "cred", frozenset(assumps))
+        cached = self.__cache_hit(key)
+        if cached is not None:
+            return cached
+
+        result = self.__solve_cred(assumps, verbose, profile)
+        self.__cache_store(key, result)
+        return result
+
+    def __solve_cred(self, assumps: List[int], verbose = False, profile: SolveProfile | str | None = None,
+                     slicing: bool = True) -> bool:
+        answer = self.__decide("cred", assumps)
+        if answer is None and slicing:
+            answer = self.__solve_slice(assumps)
+        if answer is None:
+            answer = self.__solve_components("cred", assumps)
+        if answer is not None:
+            return answer
+        self.__prepare_solve(profile)
+
+        literals = self.__literals(assumps)
+        model = self.__run(self.__cred_search(literals + self.__fixed_literals("cred"))) if literals is not None else None
+
+        if verbose and model: print("DEBUG Credulous witness:", *self.__prepare_pretty_print_model(model))
+        self.witness = model if model is not None else []
+
+        return model is not None
+
+    def solve_skept(self, assumps: List[int] = [], verbose = False, profile: SolveProfile | str | None = None) -> bool:
+        '''
+        Solves the current AF instance under the specified semantics in the
+        skeptical reasoning mode under assumptions that all arguments in `assumps`
+        are contained in all extensions.
 
-        model: List[Symbol] = []
+        Returns `True` if the answer is "yes" and `False` if the answer is "no".
+
+        Other return codes indicate that the solver is in state `ERROR`.
+
+        The search stops at the first extension missing an argument in `assumps`, which becomes the witness.
+        Use `accepted_skept` to get all skeptically accepted arguments at once.
+
+        The `verbose` flag causes the witness to be pretty printed.
+        A `profile` overrides the solving profile for this call.
+        '''
+        key = (self.sigma, "skept", frozenset(assumps))
+        cached = self.__cache_hit(key)
+        if cached is not None:
+            return cached
+
+        result = self.__solve_skept(assumps, verbose, profile)
+        self.__cache_store(key, result)
+        return result
+
+    def __solve_skept(self, assumps: List[int], verbose = False, profile: SolveProfile | str | None = None) -> bool:
+        answer = self.__decide("skept", assumps)
+        if answer is None:
+            answer = self.__solve_components("skept", assumps)
+        if answer is not None:
+            return answer
+        self.__prepare_solve(profile)
+        fixed = self.__fixed_literals("skept")
+
+        # An argument is skeptically accepted unless there is a counter-model, i.e. an extension without it.
+        # Any extension is one if the argument has never been grounded.
+        model = None
+        for arg in assumps:
+            model = self.__run(self.__skept_search(self.__literal(arg), fixed))
+            if model is not None:
+                break
+
+        if verbose and model: print("DEBUG Skeptical counter-model:", *self.__prepare_pretty_print_model(model))
+        self.witness = model if model is not None else []
+
+        return model is None
+
+    def __literal(self, arg: int | str | Symbol) -> int | None:
+        '''
+        Returns the solver literal of `in(x)` for the argument `arg`, or `None` if that atom has never been grounded.
+        The literals are cached, since they stay the same for the lifetime of a `Control`.
+        '''
+        x = self.table.find(arg)
+        return self.__index_literal(x) if x is not None else None
+
+    def __index_literal(self, x: int) -> int | None:
+        '''
+        Like `__literal`, for the argument with index `x`.
+        '''
+        literal = self.literals.get(x)
+        if literal is None:
+            atom = self.ctl.symbolic_atoms[Function("in", [self.table.terms[x]])]
+            if atom is None:
+                return None
+            literal = self.literals[x] = atom.literal
+        return literal
+
+    def __literals(self, assumps: List[int]) -> List[int] | None:
+        '''
+        Translates the arguments in `assumps` to the assumption literals requiring them to be in an extension,
+        or returns `None` if one of them can never be.
+        '''
+        literals = []
+        for arg in assumps:
+            literal = self.__literal(arg)
+            if literal is None:
+                return None
+            literals.append(literal)
+        return literals
+
+    def __decide(self, mode: str, assumps: List[int]) -> bool | None:
+        '''
+        Answers a query in `mode` from the grounded labelling, if it is maintained and decides the query,
+        and sets the witness. Returns `None` otherwise.
+        '''
+        if self.labelling is None:
+            return None
+        args = [self.table.find(arg) for arg in assumps]
+        if not all(x in self.arguments for x in args):
+            return None
+
+        answer = self.labelling.decide(self.sigma, mode, cast(List[int], args))
+        if answer is not None:
+            # Only answers the grounded extension, which is complete, witnesses are decided, see `ANSWERS`,
+            # except for skeptical `adm` queries, which are decided without the labels: the empty set
+            # is admissible and a counter-model to every one of them.
+            if answer != (mode == "cred") or mode == "skept" and self.sigma == "adm":
+                self.witness = []
+            else:
+                self.witness = [self.table.ids[x] for x in self.labelling.inn]
+        return answer
+
+    def __slice(self, args: Iterable[int]) -> Set[int] | None:
+        '''
+        Returns the relevance slice of the live arguments with the indices `args`: the live arguments that reach
+        one of them along the attacks, including `args`, found backwards through `attackers`.
+        Returns `None` once it exceeds `SLICE_MAX_FRACTION` of the AF.
+        '''
+        limit = SLICE_MAX_FRACTION * len(self.arguments)
+        queue = list(args)
+        region = set(queue)
+        while queue:
+            x = queue.pop()
+            for s in self.attackers.get(x, ()):
+                if s not in region and s in self.arguments:
+                    region.add(s)
+                    queue.append(s)
+                    if len(region) > limit:
+                        return None
+        return region
+
+    def __solve_slice(self, assumps: List[int]) -> bool | None:
+        '''
+        Answers a credulous `adm`, `comp` or `pref` query on the relevance slice of `assumps`, if `slicing`
+        is enabled and the slice is small enough, and sets the witness. Returns `None` otherwise.
+
+        The slice solvers are `adm` solvers. Their admissible witnesses are not complete in general, so under
+        `comp` and `pref` the witness of an accepted query is left unset for `extract_witness` to find.
+
+        The solver of the slice is the cached one for the same slice, or else a new one while there are
+        fewer than `slicing`, or else the least recently used one. It is brought up to date with the slice
+        by adding and deleting arguments and attacks, so its ground program is reused.
+        '''
+        if not self.slicing or self.sigma not in ("adm", "comp", "pref") or not assumps:
+            return None
+        args = [self.table.find(arg) for arg in assumps]
+        if not all(x in self.arguments for x in args):
+            return None
+        region = self.__slice(cast(List[int], args))
+        if region is None:
+            return None
+
+        key = frozenset(region)
+        if key in self.slices:
+            self.slices.move_to_end(key)
+            solver, version = self.slices[key]
+        else:
+            if len(self.slices) < self.slicing:
+                solver = IncrAFSolver("adm", compact_threshold=self.compact_threshold, cache_size=0, profile=self.profile)
+            else:
+                _, (solver, _) = self.slices.popitem(last=False)
+            version = -1
+        if version != self.version:
+            self.__update_slice(solver, region)
+        self.slices[key] = (solver, self.version)
+
+        result = solver.solve_cred([self.table.ids[x] for x in cast(List[int], args)])
+        self.witness = solver.extract_witness() if self.sigma == "adm" or not result else None
+        return result
+
+    def __update_slice(self, solver: "IncrAFSolver", region: Set[int]):
+        '''
+        Makes the AF of the slice solver `solver` the subframework of the current AF on the arguments in `region`.
+        '''
+        ids, sub = self.table.ids, solver.table.ids
+        live = {sub[y] for y in solver.arguments}
+        wanted = {ids[x] for x in region}
+        solver.del_arguments(live - wanted)
+        solver.add_arguments(wanted - live)
+
+        # The live attackers of arguments in the slice are in the slice as well.
+        attacks = {(ids[s], ids[t]) for t in region for s in self.attackers.get(t, ()) if s in region}
+        current = {(sub[s], sub[t]) for t, sources in solver.attackers.items() for s in sources}
+        solver.del_attacks(current - attacks)
+        solver.add_attacks(attacks - current)
+
+    def __solve_components(self, mode: str, assumps: List[int]) -> bool | None:
+        '''
+        Answers a `stable` query in `mode` by the search over the components in `condensation`, if it is maintained,
+        and sets the witness. Returns `None` otherwise.
+        '''
+        if self.condensation is None or self.sigma != "stable":
+            return None
+        args = [self.table.find(arg) for arg in assumps]
+        if not all(x in self.arguments for x in args):
+            return None
+
+        search = self.condensation.search
+        try:
+            if mode == "cred":
+                extension = search(self.__local_extensions, inn=set(cast(List[int], args)), budget=SCC_BUDGET)
+                answer = extension is not None
+            else:
+                # As in `__solve_skept`, the arguments are skeptically accepted unless an extension misses one of them.
+                extension = None
+                for x in args:
+                    extension = search(self.__local_extensions, out={cast(int, x)}, budget=SCC_BUDGET)
+                    if extension is not None:
+                        break
+                answer = extension is None
+        except SearchLimit:
+            return None
+        self.witness = [self.table.ids[x] for x in extension] if extension is not None else []
+        return answer
+
+    def __local_extensions(self, region: FrozenSet[int]) -> List[FrozenSet[int]] | None:
+        '''
+        Returns the stable extensions of the subframework on the argument indices in `region`,
+        enumerated by `component_solver` after making the subframework its AF, as in `__update_slice`,
+        or `None` if it has more than `SCC_MAX_SIZE` arguments or more than `SCC_MAX_EXTENSIONS` extensions.
+        '''
+        if len(region) > SCC_MAX_SIZE:
+            return None
+        if self.component_solver is None:
+            self.component_solver = IncrAFSolver(self.sigma, compact_threshold=self.compact_threshold,
+                                                 cache_size=0, profile=self.profile)
+        solver = self.component_solver
+        self.__update_slice(solver, set(region))
+
+        find, ids = self.table.find, solver.table.ids
+        extensions = [frozenset(cast(int, find(ids[i])) for i in extension)
+                      for extension in solver.iter_extensions(limit=SCC_MAX_EXTENSIONS + 1)]
+        return extensions if len(extensions) <= SCC_MAX_EXTENSIONS else None
+
+    def __fixed_literals(self, mode: str) -> List[int]:
+        '''
+        Returns the assumptions fixed by the grounded labelling for a query in `mode`, if it is maintained:
+        the `OUT` arguments are not in the extension, and the `IN` arguments are where `ASSUME_IN` allows it.
+        The lists are kept until the labels or the `Control` change.
+        '''
+        if self.labelling is None or self.sigma not in ASSUME_IN:
+            return []
+        self.labelling.update()
+
+        with_in = ASSUME_IN[self.sigma][mode]
+        version, literals = self.fixed.get(with_in, (-1, []))
+        if version != self.labelling.version:
+            literals = [-literal for literal in map(self.__index_literal, self.labelling.out) if literal is not None]
+            if with_in:
+                literals += [literal for literal in map(self.__index_literal, self.labelling.inn) if literal is not None]
+            self.fixed[with_in] = (self.labelling.version, literals)
+        return literals
+
+    def __first_model(self, assumptions: List[int]) -> List[int | str] | None:
+        '''
+        Searches for a single model under the given solver literals and stops right after it,
+        returning the ids of its extension, or `None` if there is no model.
+        '''
+        self.ctl.configuration.solve.enum_mode = "auto"
+
+        model: List[int | str] | None = None
         def on_model(m: Model):
             nonlocal model
-            model = list(m.symbols(shown=True))
-        
-        self.ctl.solve(assumps, on_model = on_model)
+            model = self.table.extension(m.symbols(shown=True))
+            return False
 
-        if verbose and len(model) > 0: print("DEBUG Credulous arguments:", *self.__prepare_pretty_print_model(model))
-        self.witness = model
+        with self.__measure("solve", mode="first"):
+            self.ctl.solve(assumptions, on_model = on_model)
+        self.__finish_solve()
 
-        return len(model) != 0
+        return model
 
-    def solve_skept(self, assumps: List[int] = [], verbose = False) -> bool:
+    def __run(self, search: Search) -> List[int | str] | None:
         '''
-        Solves the current AF instance under the specified semantics in the
-        skeptical reasoning mode under assumptions that all arguments in `assumps`
-        are contained in all extensions.
+        Runs the `search`, answering every call with `__first_model`, and returns its result.
+        '''
+        try:
+            assumptions = next(search)
+            while True:
+                assumptions = search.send(self.__first_model(assumptions))
+        except StopIteration as stop:
+            return stop.value
+
+    def __cred_search(self, assumptions: List[int]) -> Search:
+        '''
+        Searches for an extension under the solver literals `assumptions`, which are those of a credulous query.
+        '''
+        if self.sigma == "pref":
+            return (yield from self.__maximal(assumptions))
+        return (yield assumptions)
 
-        Returns `True` if the answer is "yes" and `False` if the answer is "no".
+    def __skept_search(self, literal: int | None, fixed: List[int]) -> Search:
+        '''
+        Searches for an extension without the argument with the solver literal `literal`, or any extension
+        if it has never been grounded, under the `fixed` literals of a skeptical query.
+        '''
+        if self.sigma == "pref":
+            return (yield from self.__counter_model(literal, fixed))
+        return (yield ([-literal] if literal is not None else []) + fixed)
 
-        Other return codes indicate that the solver is in state `ERROR`.
+    def __activation(self) -> int:
+        '''
+        Adds a fresh free external atom and returns its literal. It switches on the rules added for
+        a single search when assumed, and is released, i.e. made false for good, once the search is done.
+        '''
+        with self.ctl.backend() as backend:
+            atom = backend.add_atom()
+            backend.add_external(atom, TruthValue.Free)
+        return atom
 
-        The `verbose` flag causes the model(s) to be pretty printed during the `solve` call.
+    def __require_outside(self, activation: int, extension: List[int | str]):
         '''
-        self.ctl.configuration.solve.enum_mode = "cautious"
+        Adds the rule that, if `activation` holds, an argument that is not in `extension` is in the extension.
+        Deleted arguments, which can never be in an extension, are included, so the rule also holds
+        while mutations are journaled.
+        '''
+        inside = {self.table.find(x) for x in extension}
+        body = [-literal for x in range(len(self.table)) if x not in inside
+                for literal in (self.__index_literal(x),) if literal is not None]
+        with self.ctl.backend() as backend:
+            backend.add_rule([], [activation] + body)
+
+    def __extend(self, extension: List[int | str], assumptions: List[int]) -> Search:
+        '''
+        Searches for an extension under the solver literals `assumptions` that strictly contains `extension`.
+        '''
+        activation = self.__activation()
+        self.__require_outside(activation, extension)
+        try:
+            return (yield assumptions + [activation] + cast(List[int], self.__literals(extension)))
+        finally:
+            self.ctl.release_external(activation)
+
+    def __maximal(self, assumptions: List[int]) -> Search:
+        '''
+        Searches for a complete extension under the solver literals `assumptions` that is subset-maximal
+        among those satisfying them, by growing the first one with `__extend` until it cannot be.
+        It is preferred if every superset of it satisfies `assumptions`, e.g. if they only require arguments
+        to be in it, or are the literals fixed by the grounded labelling.
+        '''
+        model = yield assumptions
+        while model is not None:
+            larger = yield from self.__extend(model, assumptions)
+            if larger is None:
+                return model
+            model = larger
+        return None
+
+    def __counter_model(self, literal: int | None, fixed: List[int]) -> Search:
+        '''
+        Searches for a preferred extension without the argument with the solver literal `literal`,
+        or any preferred extension if it has never been grounded, under the `fixed` literals of the labelling.
+
+        A complete extension that is maximal among those without the argument is preferred unless `__extend`
+        finds a larger one, which contains the argument. No preferred extension without it is a subset
+        of that one, so the subsets of it are blocked for the rest of the search.
+        '''
+        without = ([-literal] if literal is not None else []) + fixed
+        activation = self.__activation()
+        try:
+            while True:
+                model = yield from self.__maximal(without + [activation])
+                if model is None:
+                    return None
+                larger = yield from self.__extend(model, fixed)
+                if larger is None:
+                    return model
+                self.__require_outside(activation, larger)
+        finally:
+            self.ctl.release_external(activation)
+
+    def __preferred_extensions(self, literals: List[int]) -> Iterator[List[int | str]]:
+        '''
+        Yields the ids of the preferred extensions containing the arguments with the solver literals `literals`.
+        Every one found is blocked with its subsets, so the next search finds another one. The blocking rules
+        are guarded by an activation atom, which is released once the generator is exhausted or closed.
+        '''
+        activation = self.__activation()
+        try:
+            while True:
+                model = self.__run(self.__maximal(literals + [activation]))
+                if model is None:
+                    return
+                yield model
+                self.__require_outside(activation, model)
+        finally:
+            self.ctl.release_external(activation)
+
+    async def solve_cred_async(self, assumps: List[int] = [], timeout: float | None = None,
+                               profile: SolveProfile | str | None = None) -> SolveStatus:
+        '''
+        Asynchronous version of `solve_cred`, for use with `asyncio`.
+
+        Returns `SolveStatus.YES` or `SolveStatus.NO`, or `SolveStatus.UNKNOWN` if no answer was found
+        within `timeout` seconds, in which case the search is cancelled. The time spent waiting for
+        other asynchronous calls on this solver counts towards the timeout.
+        A `profile` overrides the solving profile for this call.
+        '''
+        key, version = (self.sigma, "cred", frozenset(assumps)), self.version
+        cached = self.__cache_hit(key)
+        if cached is not None:
+            return SolveStatus.YES if cached else SolveStatus.NO
+
+        answer = self.__decide("cred", assumps)
+        if answer is not None:
+            self.__cache_store(key, answer)
+            return SolveStatus.YES if answer else SolveStatus.NO
+
+        async with self.__acquire(timeout) as deadline:
+            if deadline is None:
+                return SolveStatus.UNKNOWN
+            self.__prepare_solve(profile)
+
+            literals = self.__literals(assumps)
+            if literals is None:
+                status, model = SolveStatus.NO, None
+            else:
+                status, model = await self.__run_async(self.__cred_search(literals + self.__fixed_literals("cred")), deadline)
+
+        if status != SolveStatus.UNKNOWN:
+            self.witness = model if model is not None else []
+            self.__cache_store(key, status == SolveStatus.YES, version)
+        return status
+
+    async def solve_skept_async(self, assumps: List[int] = [], timeout: float | None = None,
+                                profile: SolveProfile | str | None = None) -> SolveStatus:
+        '''
+        Asynchronous version of `solve_skept`, for use with `asyncio`.
+
+        Returns `SolveStatus.YES` or `SolveStatus.NO`, or `SolveStatus.UNKNOWN` if no answer was found
+        within `timeout` seconds, in which case the search is cancelled. The time spent waiting for
+        other asynchronous calls on this solver counts towards the timeout.
+        A `profile` overrides the solving profile for this call.
+        '''
+        key, version = (self.sigma, "skept", frozenset(assumps)), self.version
+        cached = self.__cache_hit(key)
+        if cached is not None:
+            return SolveStatus.YES if cached else SolveStatus.NO
+
+        answer = self.__decide("skept", assumps)
+        if answer is not None:
+            self.__cache_store(key, answer)
+            return SolveStatus.YES if answer else SolveStatus.NO
+
+        async with self.__acquire(timeout) as deadline:
+            if deadline is None:
+                return SolveStatus.UNKNOWN
+            self.__prepare_solve(profile)
+            fixed = self.__fixed_literals("skept")
+
+            status, model = SolveStatus.YES, None
+            for arg in assumps:
+                found, model = await self.__run_async(self.__skept_search(self.__literal(arg), fixed), deadline)
+                if found != SolveStatus.NO:
+                    status = SolveStatus.NO if found == SolveStatus.YES else SolveStatus.UNKNOWN
+                    break
+
+        if status != SolveStatus.UNKNOWN:
+            self.witness = model if model is not None else []
+            self.__cache_store(key, status == SolveStatus.YES, version)
+        return status
+
+    @asynccontextmanager
+    async def __acquire(self, timeout: float | None):
+        '''
+        Waits for the other asynchronous calls on this solver, at most `timeout` seconds,
+        and yields the deadline for the search as `loop.time()`, `math.inf` without a timeout,
+        or `None` if the timeout ran out while waiting.
+        '''
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout if timeout is not None else math.inf
+
+        try:
+            await asyncio.wait_for(self.lock.acquire(), timeout)
+        except asyncio.TimeoutError:
+            yield None
+            return
+
+        try:
+            yield deadline
+        finally:
+            self.lock.release()
+
+    async def __run_async(self, search: Search, deadline: float) -> Tuple[SolveStatus, List[int | str] | None]:
+        '''
+        Like `__run`, with `__first_model_async` for every call. Returns `SolveStatus.YES` with the result,
+        `SolveStatus.NO` if it is `None`, or `SolveStatus.UNKNOWN` once a call times out.
+        '''
+        try:
+            assumptions = next(search)
+            while True:
+                status, model = await self.__first_model_async(assumptions, deadline)
+                if status == SolveStatus.UNKNOWN:
+                    search.close()
+                    return SolveStatus.UNKNOWN, None
+                assumptions = search.send(model)
+        except StopIteration as stop:
+            return (SolveStatus.YES, stop.value) if stop.value is not None else (SolveStatus.NO, None)
+
+    async def __first_model_async(self, assumptions: List[int], deadline: float) -> Tuple[SolveStatus, List[int | str] | None]:
+        '''
+        Like `__first_model`, but runs the search in the background and cancels it at `deadline`.
+        Returns `SolveStatus.YES` with the model, `SolveStatus.NO`, or `SolveStatus.UNKNOWN` on timeout.
+        '''
+        loop = asyncio.get_running_loop()
+        self.ctl.configuration.solve.enum_mode = "auto"
+
+        model: List[int | str] | None = None
+        def on_model(m: Model):
+            nonlocal model
+            model = self.table.extension(m.symbols(shown=True))
+            return False
+
+        self.solving = True
+        try:
+            with self.__measure("solve", mode="async") as record, \
+                    cast(SolveHandle, self.ctl.solve(assumptions, on_model = on_model, async_=True)) as handle:
+                remaining = deadline - loop.time()
+                finished = await loop.run_in_executor(None, handle.wait, None if remaining == math.inf else max(remaining, 0))
+                if not finished:
+                    handle.cancel()
+                    record["timeout"] = True
+                    return SolveStatus.UNKNOWN, None
+                handle.get()
+        finally:
+            self.solving = False
+
+        self.__finish_solve()
+        return (SolveStatus.YES, model) if model is not None else (SolveStatus.NO, None)
+
+    def accepted_cred(self, profile: SolveProfile | str | None = None) -> FrozenSet[int | str]:
+        '''
+        Returns the ids of all arguments that are credulously accepted in the current AF instance
+        under the specified semantics, i.e. the brave consequences, computed in a single `solve` call.
+        A `profile` overrides the solving profile for this call.
+        '''
+        self.__prepare_solve(profile)
+        self.ctl.configuration.solve.enum_mode = "brave"
 
         model: List[Symbol] = []
         def on_model(m: Model):
             nonlocal model
-            model = list(m.symbols(shown=True))
-        
-        self.ctl.solve(assumps, on_model = on_model)
+            model = m.symbols(shown=True)
+
+        with self.__measure("solve", mode="brave"):
+            self.ctl.solve(on_model = on_model)
+        self.__finish_solve()
+
+        return frozenset(self.table.extension(model))
+
+    def accepted_skept(self, profile: SolveProfile | str | None = None) -> FrozenSet[int | str]:
+        '''
+        Returns the ids of all arguments that are skeptically accepted in the current AF instance
+        under the specified semantics, i.e. the cautious consequences, computed in a single `solve` call.
 
-        if verbose and len(model) > 0: print("DEBUG Skeptical arguments:", *self.__prepare_pretty_print_model(model))
-        self.witness = model
+        If there is no extension at all, every argument is skeptically accepted.
+        A `profile` overrides the solving profile for this call.
+        '''
+        self.__prepare_solve(profile)
+        if self.sigma == "pref":
+            return self.__accepted_preferred()
+        self.ctl.configuration.solve.enum_mode = "cautious"
 
-        return len(model) != 0
+        model: List[Symbol] | None = None
+        def on_model(m: Model):
+            nonlocal model
+            model = m.symbols(shown=True)
 
-    def extract_witness(self) -> List[int]:
+        with self.__measure("solve", mode="cautious"):
+            self.ctl.solve(on_model = on_model)
+        self.__finish_solve()
+
+        if model is None:
+            return frozenset(self.table.ids[x] for x in self.arguments)
+        return frozenset(self.table.extension(model))
+
+    def __accepted_preferred(self) -> FrozenSet[int | str]:
+        '''
+        Returns the intersection of the preferred extensions, which are enumerated until it is empty.
+        The cautious consequences of the complete extensions would only be the grounded extension.
+        '''
+        self.ctl.configuration.solve.enum_mode = "auto"
+        accepted: Set[int | str] | None = None
+        with self.__measure("solve", mode="cautious"), closing(self.__preferred_extensions([])) as extensions:
+            for model in extensions:
+                accepted = set(model) if accepted is None else accepted & set(model)
+                if not accepted:
+                    break
+        self.__finish_solve()
+        return frozenset(accepted or ())
+
+    def extract_witness(self) -> List[int | str]:
         '''
         If the previous call of `solve_cred` returned `True`, or the previous call to
-        `solve_skept` returned `False`, returns the witnessing extension. 
+        `solve_skept` returned `False`, returns the argument ids of the witnessing extension.
         '''
+        if self.witness is None:
+            # The answer came from a cache entry that outlived a mutation, so its witness is gone,
+            # or from a relevance slice, which does not give a complete extension.
+            _, mode, assumps = self.last_query
+            if mode == "cred":
+                self.__solve_cred(list(assumps), slicing=False)
+            else:
+                self.__solve_skept(list(assumps))
         return self.witness
 
 if __name__ == "__main__":
@@ -0,0 +1,224 @@
+"""
+Single-pass loaders for AF instances in the ICCMA `p af` format, APX and TGF,
+and for vertex cover instances in the `p vc` format.
+
+The files are memory-mapped and read in chunks of whole lines, each tokenized at once
+without per-line string handling, or scanned by a regular expression directly on the map,
+so the file is never copied as a whole.
+The loaders return plain argument ids (`int`, or `str` for named APX/TGF arguments),
+which the solvers insert in bulk.
+"""
+import mmap
+import re
+
+from typing import Iterator, List, Tuple
+
+Id = int | str
+
+# The size of the chunks the files are read in, see `chunks`.
+CHUNK_SIZE = 1 << 20
+
+# An APX fact, or a comment, which is matched as a whole so that no fact is found inside it.
+APX_FACT = re.compile(rb"%[^\n]*|(arg|att)\(\s*([A-Za-z0-9_']+)\s*(?:,\s*([A-Za-z0-9_']+)\s*)?\)\s*\.")
+NON_SPACE = re.compile(rb"\S")
+COMMENT_LINE = re.compile(rb"(?m)^[#c][^\n]*")
+ICCMA_HEADER = re.compile(rb"\s*p[ \t]+af[ \t]+(\d+)[ \t]*\r?(?:\n|\Z)")
+ICCMA_ATTACK = re.compile(rb"[ \t]*(?:\d+[ \t]+\d+[ \t]*)?\r?")
+ICCMA_ATTACKS = re.compile(rb"(?:[ \t]*(?:\d+[ \t]+\d+[ \t]*)?\r?\n)*[ \t]*(?:\d+[ \t]+\d+[ \t]*)?\r?")
+TGF_SEPARATOR = re.compile(rb"(?m)^#[ \t\r]*$")
+
+def read_bytes(path: str) -> bytes | mmap.mmap:
+    """
+    Maps the file at `path` into memory, read-only.
+    """
+    with open(path, "rb") as f:
+        try:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped.
+            return b""
+
+def chunks(data, size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Yields `data` in pieces of about `size` bytes that end at a line break, so that no line is split.
+    """
+    start, end = 0, len(data)
+    while start < end:
+        stop = data.find(b"\n", min(start + size, end))
+        stop = end if stop < 0 else stop + 1
+        yield data[start:stop]
+        start = stop
+
+def to_id(token: bytes) -> Id:
+    return int(token) if token.isdigit() else token.decode("utf-8")
+
+def pairs(ids: list) -> List[Tuple]:
+    it = iter(ids)
+    return list(zip(it, it))
+
+def detect_format(path: str, data) -> str:
+    """
+    Guesses the format of an AF file from its extension, or else from its contents.
+    Raises `ValueError` if it is none of them.
+    """
+    for ext, format in ((".apx", "apx"), (".lp", "apx"), (".tgf", "tgf")):
+        if path.endswith(ext):
+            return format
+
+    start = data[:256].lstrip()
+    if start.startswith(b"p ") or start.startswith(b"#") or start.startswith(b"c "):
+        return "iccma"
+    if start.startswith(b"arg(") or start.startswith(b"att(") or start.startswith(b"%"):
+        return "apx"
+    if TGF_SEPARATOR.search(data):
+        return "tgf"
+    raise ValueError(f"Unknown format of {path}")
+
+def read_iccma(data) -> Tuple[List[int], List[Tuple[int, int]]]:
+    """
+    Parses the ICCMA'23 format: a header `p af <n>` declaring the arguments `1..n`,
+    followed by one attack `<source> <target>` per line. Lines starting with `#`,
+    or with `c` as in earlier versions of this repository, are comments.
+
+    Every chunk is checked by a single regular expression before it is split into the ids.
+    Raises `SyntaxError` with the line number if the header or an attack is malformed.
+    """
+    n = None
+    attacks: List[Tuple[int, int]] = []
+    line = 1
+    for chunk in chunks(data):
+        if b"#" in chunk or b"c" in chunk:
+            chunk = COMMENT_LINE.sub(b"", chunk)
+
+        if n is None:
+            header = ICCMA_HEADER.match(chunk)
+            if header is None:
+                if chunk.strip():
+                    raise SyntaxError(f"Missing 'p af <n>' header in line {line + blank_lines(chunk)}")
+                line += chunk.count(b"\n")
+                continue
+            n = int(header.group(1))
+            line += chunk.count(b"\n", 0, header.end())
+            chunk = chunk[header.end():]
+
+        if not ICCMA_ATTACKS.fullmatch(chunk):
+            raise SyntaxError(f"Malformed attack in line {line + malformed_line(chunk)}")
+        attacks.extend(pairs(list(map(int, chunk.split()))))
+        line += chunk.count(b"\n")
+
+    if n is None:
+        raise SyntaxError("Missing 'p af <n>' header")
+    return list(range(1, n+1)), attacks
+
+def blank_lines(chunk: bytes) -> int:
+    """
+    Returns the number of blank lines at the start of `chunk`.
+    """
+    return chunk[:len(chunk) - len(chunk.lstrip())].count(b"\n")
+
+def malformed_line(chunk: bytes) -> int:
+    """
+    Returns the number of the first line in `chunk` that is not an attack, counted from 0.
+    """
+    for i, line in enumerate(chunk.split(b"\n")):
+        if not ICCMA_ATTACK.fullmatch(line):
+            return i
+    return 0
+
+def read_apx(data) -> Tuple[List[Id], List[Tuple[Id, Id]]]:
+    """
+    Parses APX facts `arg(a).` and `att(a,b).`, with `%` comments.
+    Raises `ValueError` if the file contains anything else, e.g. rules.
+    """
+    args: List[Id] = []
+    attacks: List[Id] = []
+    end = 0
+    for m in APX_FACT.finditer(data):
+        if NON_SPACE.search(data, end, m.start()):
+            raise ValueError("Not a plain APX file")
+        end = m.end()
+        kind, a, b = m.groups()
+        if kind is None:
+            continue
+        if kind == b"arg" and b is None:
+            args.append(to_id(a))
+        elif kind == b"att" and b is not None:
+            attacks.append(to_id(a))
+            attacks.append(to_id(b))
+        else:
+            raise ValueError(f"Malformed fact {m.group(0).decode()}")
+
+    if NON_SPACE.search(data, end):
+        raise ValueError("Not a plain APX file")
+    return args, pairs(attacks)
+
+def read_tgf(data) -> Tuple[List[Id], List[Tuple[Id, Id]]]:
+    """
+    Parses the trivial graph format: one argument per line, a line `#`, then one attack `a b` per line.
+    Anything after the first token of an argument line or the second of an attack line is a label and ignored.
+    """
+    args: List[Id] = []
+    attacks: List[Tuple[Id, Id]] = []
+    separated = False
+    for chunk in chunks(data):
+        for line in chunk.splitlines():
+            if separated:
+                tokens = line.split()
+                if len(tokens) >= 2:
+                    attacks.append((to_id(tokens[0]), to_id(tokens[1])))
+            elif line.startswith(b"#"):
+                separated = True
+            elif line.strip():
+                args.append(to_id(line.split()[0]))
+    return args, attacks
+
+READERS = {"iccma": read_iccma, "apx": read_apx, "tgf": read_tgf}
+
+def read_af(path: str, format: str | None = None) -> Tuple[List[Id], List[Tuple[Id, Id]]]:
+    """
+    Reads the AF in `path` and returns its argument ids and attacks.
+    The `format` is `"iccma"`, `"apx"` or `"tgf"`, and guessed by `detect_format` if `None`.
+
+    Raises `ValueError` if the file is not in a known format, and `SyntaxError` if it is a malformed ICCMA file.
+    """
+    data = read_bytes(path)
+    try:
+        return READERS[format or detect_format(path, data)](data)
+    finally:
+        if isinstance(data, mmap.mmap):
+            data.close()
+
+def read_vc(path: str) -> Tuple[int, bool, List[Tuple[int, int]]]:
+    """
+    Reads a vertex cover instance with a header `p vc <n>`, or just `<n>`, optionally followed by `<->`
+    for an undirected graph, and one line `<v> | <u1> <u2> ...` per vertex listing its neighbours.
+    Lines starting with `c` are comments.
+
+    Returns the number of vertices, whether the graph is undirected, and the edges as listed.
+    """
+    header = None
+    edges = []
+    data = read_bytes(path)
+    try:
+        for chunk in chunks(data):
+            for line in chunk.splitlines():
+                if not line.strip() or line.startswith(b"c") or line.startswith(b"#"):
+                    continue
+                if header is None:
+                    header = line.split()
+                    continue
+                v, sep, neighbours = line.partition(b"|")
+                if not sep:
+                    raise ValueError(f"Malformed line {line.decode()}")
+                v = int(v)
+                edges.extend((v, int(u)) for u in neighbours.split())
+    finally:
+        if isinstance(data, mmap.mmap):
+            data.close()
+
+    if header is not None and header[:2] == [b"p", b"vc"]:
+        header = header[2:]
+    if not header:
+        raise ValueError("Missing 'p vc <n>' header")
+
+    return int(header[0]), b"<->" in header, edges
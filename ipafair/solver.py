@@ -2,6 +2,8 @@ import ipafair
 import os
 from ctypes import cdll, c_void_p, c_int
 
+from .loaders import read_af
+
 LIBNAME = "libipafairsolver.so"
 LIBPATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), LIBNAME)
 
@@ -35,13 +37,8 @@ class NaiveSolver(ipafair.AFSolver):
         self.last_call = ""
 
         if af_file is not None:
-            contents = [line.strip() for line in open(af_file).read().split("\n") if not line.startswith("#")]
-            p_line = contents[0]
-            assert(p_line.startswith("p af "))
-            self.n = int(p_line[5:])
-            args = list(range(1, self.n+1))
-            atts = [ list(map(int, line.split())) for line in contents[1:] ]
-            assert(all(len(att) == 2 for att in atts))
+            args, atts = read_af(af_file, "iccma")
+            self.n = len(args)
             for a in args:
                 self.add_argument(a)
             for s,t in atts:
@@ -1,4 +1,4 @@
-from solver import NaiveSolver as AFSolver
+from ipafair.solver import NaiveSolver as AFSolver
 import os
 
 path = os.path.dirname(os.path.abspath(__file__))
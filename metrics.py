@@ -0,0 +1,122 @@
+from clingo.control import Control
+
+import csv
+import json
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List
+
+class ProgramCounter:
+    """
+    A lightweight observer counting the rules and externals passed to the solver,
+    without keeping a copy of the ground program like `clingox.program.ProgramObserver`.
+    """
+    def __init__(self):
+        self.rules = 0
+        self.externals = 0
+
+    def rule(self, choice, head, body):
+        self.rules += 1
+
+    def weight_rule(self, choice, head, lower_bound, body):
+        self.rules += 1
+
+    def external(self, atom, value):
+        self.externals += 1
+
+class Metrics:
+    """
+    Opt-in instrumentation of a solver. Every measured operation appends a record with its name,
+    wall time, the size of the ground program after it and, for solve calls,
+    selected fields of `ctl.statistics`.
+
+    The records can be summed up per operation with `summary` and exported with `to_json` or `to_csv`.
+    """
+    def __init__(self):
+        self.records: List[dict] = []
+        self.counter = ProgramCounter()
+
+    def attach(self, ctl: Control):
+        '''
+        Counts the rules and externals grounded in `ctl` from now on.
+        Called whenever a solver sets up a fresh `Control`, so the counts restart with it.
+        '''
+        self.counter = ProgramCounter()
+        ctl.register_observer(self.counter)
+
+    @contextmanager
+    def measure(self, op: str, solver, **fields) -> Iterator[dict]:
+        '''
+        Times the enclosed block as operation `op` and appends its record, including the given `fields`
+        and the program size of `solver.ctl` after the block, which may have replaced it.
+        The record is yielded so the block can add more fields.
+        '''
+        record = {"op": op, **fields}
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record["time"] = time.perf_counter() - start
+            ctl = solver.ctl
+            record["atoms"] = len(ctl.symbolic_atoms)
+            record["rules"] = self.counter.rules
+            record["externals"] = self.counter.externals
+            if op == "solve":
+                record.update(solve_statistics(ctl))
+            self.records.append(record)
+
+    def summary(self) -> Dict[str, dict]:
+        '''
+        Returns the number of calls and the total wall time of every operation.
+        '''
+        result: Dict[str, dict] = {}
+        for record in self.records:
+            entry = result.setdefault(record["op"], {"calls": 0, "time": 0.0})
+            entry["calls"] += 1
+            entry["time"] += record["time"]
+        return result
+
+    def clear(self):
+        self.records.clear()
+
+    def to_json(self, path: str):
+        '''
+        Writes the records to `path` as JSON lines.
+        '''
+        with open(path, "w", encoding="utf-8") as f:
+            for record in self.records:
+                f.write(json.dumps(record) + "\n")
+
+    def to_csv(self, path: str):
+        '''
+        Writes the records to `path` as CSV, with a column for every field that occurs in any record.
+        '''
+        fields: Dict[str, None] = {}
+        for record in self.records:
+            fields.update(dict.fromkeys(record))
+
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(fields))
+            writer.writeheader()
+            writer.writerows(self.records)
+
+def solve_statistics(ctl: Control) -> dict:
+    """
+    Returns selected statistics of the last `solve` call in `ctl`.
+    """
+    stats = ctl.statistics
+    if "user_step" not in stats:
+        return {}
+
+    summary = stats["summary"]
+    solvers = stats["solving"]["solvers"]
+    return {
+        "solve_time": summary["times"]["solve"],
+        "cpu_time": summary["times"]["cpu"],
+        "models": summary["models"]["enumerated"],
+        "choices": solvers["choices"],
+        "conflicts": solvers["conflicts"],
+        "restarts": solvers["restarts"],
+        "lp_atoms": stats["problem"]["lp"]["atoms"],
+        "lp_rules": stats["problem"]["lp"]["rules"],
+    }
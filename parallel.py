@@ -0,0 +1,222 @@
+from ipafair import AFSolver
+
+from incraf import IncrAFSolver
+
+import itertools
+import multiprocessing
+import os
+from array import array
+from multiprocessing.connection import Connection
+from typing import Iterable, Iterator, List, Tuple
+
+class Replica:
+    '''
+    The state of a worker process of `ParallelAFSolver` or `ShardedAFSolver`: a warm `IncrAFSolver`
+    and the calls that only make sense on the worker side.
+    '''
+    def __init__(self, sigma: str, af_file: str | None, options: dict):
+        self.solver = IncrAFSolver(sigma, af_file, **options)
+        self.stream: Iterator[array] | None = None
+
+    def __getattr__(self, name: str):
+        return getattr(self.solver, name)
+
+    def solve_many(self, mode: str, queries: List[List[int]]) -> List[bool]:
+        solve = self.solver.solve_cred if mode == "cred" else self.solver.solve_skept
+        return [solve(assumps) for assumps in queries]
+
+    def witness(self) -> List[int | str]:
+        return self.solver.extract_witness()
+
+    def any_extension(self) -> List[int | str]:
+        self.solver.solve_cred([])
+        return self.solver.extract_witness()
+
+    def open_extensions(self, assumps: List[int]):
+        self.stream = self.solver.iter_extensions(assumps=assumps)
+
+    def next_extensions(self, n: int) -> List[List[int | str]]:
+        '''
+        Returns the argument ids of the next `n` extensions of the stream opened by `open_extensions`,
+        or fewer once it is exhausted.
+        '''
+        return [self.solver.argument_ids(extension) for extension in itertools.islice(self.stream, n)]
+
+    def close_extensions(self):
+        if self.stream is not None:
+            self.stream.close()
+        self.stream = None
+
+def serve(conn: Connection, sigma: str, af_file: str | None, options: dict):
+    '''
+    The main loop of a worker process. It receives
+    `("cast", name, args)` to call a method without a reply, used for the broadcast mutations,
+    `("call", name, args)` to call a method and send back `("ok", result)` or `("error", exception)`,
+    and `("stop",)`. An exception raised by a cast is sent back with the reply to the next call.
+    '''
+    try:
+        replica = Replica(sigma, af_file, options)
+        failure = None
+    except Exception as e:
+        replica, failure = None, e
+
+    # The pending exception of a failed cast, or the one of the failed setup, which stays.
+    error = failure
+    while True:
+        message = conn.recv()
+        if message[0] == "stop":
+            break
+
+        kind, name, args = message
+        try:
+            if error is not None:
+                e, error = error, failure
+                raise e
+            result = getattr(replica, name)(*args)
+        except Exception as e:
+            if kind == "call":
+                conn.send(("error", e))
+            else:
+                error = e
+            continue
+
+        if kind == "call":
+            conn.send(("ok", result))
+
+    conn.close()
+
+class ParallelAFSolver(AFSolver):
+    def __init__(self, sigma: str, af_file: str | None = None, workers: int | None = None, **options):
+        """
+        Initializes an `AFSolver` that keeps `workers` processes (by default one per core),
+        each of them with its own warm `IncrAFSolver` replica of the same AF.
+        The `options` are passed on to the `IncrAFSolver` of every worker.
+
+        Mutations are broadcast to every replica without waiting for them.
+        Single queries are answered by the replicas in turn, and the queries of
+        `solve_cred_many` and `solve_skept_many` are spread over all of them.
+        """
+        self.conns: List[Connection] = []
+        self.processes: List[multiprocessing.Process] = []
+
+        for _ in range(workers or os.cpu_count() or 1):
+            conn, child = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=serve, args=(child, sigma, af_file, options), daemon=True)
+            process.start()
+            child.close()
+            self.conns.append(conn)
+            self.processes.append(process)
+
+        # The worker that answered the last query, which holds its witness.
+        self.next = 0
+        self.last = 0
+
+    def __del__(self):
+        for conn, process in zip(self.conns, self.processes):
+            try:
+                conn.send(("stop",))
+                conn.close()
+            except OSError:
+                pass
+            process.join(timeout=1)
+        self.conns, self.processes = [], []
+
+    def __broadcast(self, name: str, *args):
+        for conn in self.conns:
+            conn.send(("cast", name, args))
+
+    def __call(self, worker: int, name: str, *args):
+        self.conns[worker].send(("call", name, args))
+        return self.__receive(worker)
+
+    def __receive(self, worker: int):
+        status, result = self.conns[worker].recv()
+        if status == "error":
+            raise result
+        return result
+
+    def __receive_all(self, workers: Iterable[int]) -> dict:
+        '''
+        Receives the replies of all `workers` before raising the first error among them, so that
+        no reply is left in a pipe to be taken for the answer to a later call.
+        '''
+        replies = {worker: self.conns[worker].recv() for worker in workers}
+        for status, result in replies.values():
+            if status == "error":
+                raise result
+        return {worker: result for worker, (_, result) in replies.items()}
+
+    def add_argument(self, arg: int | str):
+        self.__broadcast("add_argument", arg)
+
+    def del_argument(self, arg: int | str):
+        self.__broadcast("del_argument", arg)
+
+    def add_attack(self, source: int | str, target: int | str):
+        self.__broadcast("add_attack", source, target)
+
+    def del_attack(self, source: int | str, target: int | str):
+        self.__broadcast("del_attack", source, target)
+
+    def add_arguments(self, args: Iterable[int | str]):
+        self.__broadcast("add_arguments", list(args))
+
+    def del_arguments(self, args: Iterable[int | str]):
+        self.__broadcast("del_arguments", list(args))
+
+    def add_attacks(self, attacks: Iterable[Tuple[int | str, int | str]]):
+        self.__broadcast("add_attacks", list(attacks))
+
+    def del_attacks(self, attacks: Iterable[Tuple[int | str, int | str]]):
+        self.__broadcast("del_attacks", list(attacks))
+
+    def solve_cred(self, assumps: List[int] = []) -> bool:
+        '''
+        Solves the current AF instance credulously on the next worker in turn, see `IncrAFSolver.solve_cred`.
+        '''
+        self.last, self.next = self.next, (self.next + 1) % len(self.conns)
+        return self.__call(self.last, "solve_cred", assumps)
+
+    def solve_skept(self, assumps: List[int] = []) -> bool:
+        '''
+        Solves the current AF instance skeptically on the next worker in turn, see `IncrAFSolver.solve_skept`.
+        '''
+        self.last, self.next = self.next, (self.next + 1) % len(self.conns)
+        return self.__call(self.last, "solve_skept", assumps)
+
+    def solve_cred_many(self, queries: List[List[int]]) -> List[bool]:
+        '''
+        Answers the independent credulous queries, each given by its assumptions, in parallel.
+        The answers are returned in the order of `queries`.
+        '''
+        return self.__solve_many("cred", queries)
+
+    def solve_skept_many(self, queries: List[List[int]]) -> List[bool]:
+        '''
+        Answers the independent skeptical queries, each given by its assumptions, in parallel.
+        The answers are returned in the order of `queries`.
+        '''
+        return self.__solve_many("skept", queries)
+
+    def __solve_many(self, mode: str, queries: List[List[int]]) -> List[bool]:
+        # Every worker gets every n-th query in a single message, so that costly queries
+        # clustered in `queries` are still spread over all workers.
+        n = len(self.conns)
+        chunks = [queries[i::n] for i in range(n)]
+        for worker, chunk in enumerate(chunks):
+            if chunk: self.conns[worker].send(("call", "solve_many", (mode, chunk)))
+
+        results: List[bool] = [False] * len(queries)
+        for worker, answers in self.__receive_all(worker for worker, chunk in enumerate(chunks) if chunk).items():
+            results[worker::n] = answers
+        # The last query is the last one of its worker, which thus holds its witness.
+        if queries:
+            self.last = (len(queries) - 1) % n
+        return results
+
+    def extract_witness(self) -> List[int | str]:
+        '''
+        Returns the witness of the last `solve_cred` or `solve_skept` call as a list of argument ids.
+        After `solve_cred_many` or `solve_skept_many`, it is the witness of the last query of the batch.
+        '''
+        return self.__call(self.last, "witness")
@@ -0,0 +1,304 @@
+"""
+An `AFSolver` for the admissible and stable semantics that does not ground the attacks at all.
+
+The program only has a choice `{ in(x) }` per argument. The attacks are kept in the adjacency index
+of the solver, and `AttackPropagator` checks conflict-freeness, defeat and defense against it
+during search, adding the clauses it needs for the arguments the search actually touches.
+"""
+from ipafair import AFSolver
+
+from clingo.core import TruthValue
+from clingo.control import Control
+from clingo.propagator import PropagateControl, PropagateInit
+from clingo.solving import Model
+from clingo.symbol import Function, Symbol
+
+from clingox.backend import SymbolicBackend
+
+from incraf import SymbolTable, argument_id, to_attack
+from ipafair.loaders import read_af
+
+from collections import defaultdict
+from typing import Dict, Iterable, List, Sequence, Set, Tuple
+
+ENCODING = "incr-dung/propagator.lp"
+
+SEMANTICS = ("adm", "stable")
+
+class AttackPropagator:
+    """
+    Checks the attacks of the AF in a `PropagatorAFSolver` during search.
+    Attacks from or on arguments that are not in the AF are ignored, as in the grounded encodings.
+
+    The first time `in(a)` is assigned in a solving step, the clauses for `a` are added:
+    when it becomes true, `-in(a) | -in(b)` for every attacker and target `b` of `a` and, for `adm`,
+    the defense `-in(a) | in(c1) | ... | in(ck)` for every attacker `b` of `a` with the attackers `c1..ck` of `b`;
+    when it becomes false, for `stable`, `in(a) | in(b1) | ... | in(bk)` with the attackers `b1..bk` of `a`.
+
+    The clauses only hold for the current AF, so they are tagged to be dropped after the step,
+    and locked so they are added only once per step.
+    """
+    def __init__(self, solver: "PropagatorAFSolver"):
+        self.solver = solver
+
+    def init(self, init: PropagateInit):
+        solver = self.solver
+
+        # The solver literal of `in(x)` for every live argument `x`, and the arguments watched
+        # for a literal becoming true (`ins`) or false (`outs`).
+        self.lits: Dict[int, int] = {}
+        self.ins: Dict[int, List[int]] = defaultdict(list)
+        self.outs: Dict[int, List[int]] = defaultdict(list)
+        for x in solver.arguments:
+            lit = self.lits[x] = init.solver_literal(solver.literals[x])
+            self.ins[lit].append(x)
+            init.add_watch(lit)
+            if solver.sigma == "stable":
+                self.outs[-lit].append(x)
+                init.add_watch(-lit)
+
+        # The arguments whose clauses have been added in this step, per solver thread.
+        self.added_in: List[Set[int]] = [set() for _ in range(init.number_of_threads)]
+        self.added_out: List[Set[int]] = [set() for _ in range(init.number_of_threads)]
+
+    def propagate(self, control: PropagateControl, changes: Sequence[int]):
+        added_in = self.added_in[control.thread_id]
+        added_out = self.added_out[control.thread_id]
+        # An argument only counts as done once all of its clauses are in, since a conflict
+        # stops the propagation after any of them.
+        for lit in changes:
+            for x in self.ins.get(lit, ()):
+                if x not in added_in:
+                    if not self.__add(control, self.__in_clauses(x)):
+                        return
+                    added_in.add(x)
+            for x in self.outs.get(lit, ()):
+                if x not in added_out:
+                    if not self.__add(control, [self.__defeat_clause(x)]):
+                        return
+                    added_out.add(x)
+
+    def __add(self, control: PropagateControl, clauses: Iterable[List[int]]) -> bool:
+        for clause in clauses:
+            if not control.add_clause(clause, tag=True, lock=True) or not control.propagate():
+                return False
+        return True
+
+    def __in_clauses(self, x: int) -> Iterable[List[int]]:
+        '''
+        Yields the clauses that must hold once `x` is in the set.
+        '''
+        lits, attackers = self.lits, self.solver.attackers
+        lx = lits[x]
+        for y in (*attackers.get(x, ()), *self.solver.targets.get(x, ())):
+            if y in lits:
+                yield [-lx] if y == x else [-lx, -lits[y]]
+
+        if self.solver.sigma == "adm":
+            for y in attackers.get(x, ()):
+                if y in lits:
+                    yield [-lx, *(lits[z] for z in attackers.get(y, ()) if z in lits)]
+
+    def __defeat_clause(self, x: int) -> List[int]:
+        '''
+        Returns the clause that `x` is in the set or attacked by it.
+        '''
+        lits = self.lits
+        return [lits[x], *(lits[y] for y in self.solver.attackers.get(x, ()) if y in lits)]
+
+class PropagatorAFSolver(AFSolver):
+    def __init__(self, sigma: str, af_file: str | None = None):
+        """
+        Initializes an `AFSolver` instance for the semantics `sigma` (`adm` or `stable`)
+        using the initial argumentation framework (AF) in `af_file`, see `ipafair.loaders.read_af`.
+        If `af_file` is `None`, the initial AF is assumed to be empty.
+
+        Only the arguments are grounded, so adding or deleting an attack only updates the index,
+        and the ground program does not grow with the attacks. They are checked by an `AttackPropagator`.
+        """
+        if sigma not in SEMANTICS:
+            raise KeyError("Semantics name is not known")
+        self.sigma = sigma
+
+        # The arguments and live attacks by their indices in `table`, like in `IncrAFSolver`.
+        self.table = SymbolTable()
+        self.attackers: Dict[int, Set[int]] = defaultdict(set)
+        self.targets: Dict[int, Set[int]] = defaultdict(set)
+        self.arguments: Set[int] = set()
+
+        # The program literals of the `in(x)` atoms of all arguments ever grounded, by index.
+        self.literals: Dict[int, int] = {}
+
+        self.ctl = Control(arguments=["--models=0"])
+        self.ctl.load(ENCODING)
+        self.ctl.add("output_filter", [], "#show in/1.")
+        self.propagator = AttackPropagator(self)
+        self.ctl.register_propagator(self.propagator)
+        self.ctl.ground()
+
+        if af_file:
+            args, attacks = read_af(af_file)
+            self.add_arguments(args)
+            self.add_attacks(attacks)
+
+        # The witness of the last `solve_cred` or `solve_skept` call, as argument ids.
+        self.witness: List[int | str] = []
+
+    def __del__(self):
+        pass
+
+    def add_argument(self, arg: int | str | Symbol):
+        '''
+        Adds the argument `arg` to the current AF instance.
+        '''
+        self.add_arguments([arg])
+
+    def del_argument(self, arg: int | str | Symbol):
+        '''
+        Deletes the argument `arg`, together with its incident attacks, from the current AF instance.
+        '''
+        self.del_arguments([arg])
+
+    def add_attack(self, source: int | str | None = None, target: int | str | None = None, attack: Symbol | None = None):
+        '''
+        Adds an attack from arguments `source` to `target` to the current AF instance.
+        '''
+        self.add_attacks([(source, target) if attack is None else to_attack(source, target, attack)])
+
+    def del_attack(self, source: int | str | None = None, target: int | str | None = None, attack: Symbol | None = None):
+        '''
+        Deletes an attack from arguments `source` to `target` from the current AF instance.
+        '''
+        self.del_attacks([(source, target) if attack is None else to_attack(source, target, attack)])
+
+    def add_arguments(self, args: Iterable[int | str | Symbol]):
+        '''
+        Adds all arguments in `args` to the current AF instance.
+        The choices for arguments that have never been grounded are grounded in a single `ground` call.
+        '''
+        new = []
+        for arg in args:
+            x = self.table.intern(arg)
+            if x not in self.arguments:
+                self.arguments.add(x)
+                new.append(x)
+        if not new:
+            return
+
+        table = self.table
+        with SymbolicBackend(self.ctl.backend()) as backend:
+            for x in new:
+                backend.add_external(table.atoms[x], TruthValue(True))
+
+        parts = [x for x in new if x not in self.literals]
+        if parts:
+            self.ctl.ground([("add_argument", [table.terms[x]]) for x in parts])
+            for x in parts:
+                self.literals[x] = self.ctl.symbolic_atoms[Function("in", [table.terms[x]])].literal
+
+    def del_arguments(self, args: Iterable[int | str | Symbol]):
+        '''
+        Deletes all arguments in `args`, together with their incident attacks, from the current AF instance.
+        '''
+        for arg in args:
+            x = self.table.find(arg)
+            if x is None or x not in self.arguments:
+                continue
+            self.arguments.discard(x)
+            self.ctl.assign_external(self.table.atoms[x], False)
+
+            for s in self.attackers.pop(x, ()):
+                self.targets[s].discard(x)
+            for t in self.targets.pop(x, ()):
+                self.attackers[t].discard(x)
+
+    def add_attacks(self, attacks: Iterable[Tuple[int | str, int | str] | Symbol]):
+        '''
+        Adds all attacks in `attacks`, given as pairs `(source, target)` or as clingo `Symbol`s,
+        to the current AF instance. Nothing is grounded for them.
+        '''
+        for attack in attacks:
+            if isinstance(attack, Symbol):
+                attack = map(argument_id, attack.arguments)
+            s, t = map(self.table.intern, attack)
+            self.attackers[t].add(s)
+            self.targets[s].add(t)
+
+    def del_attacks(self, attacks: Iterable[Tuple[int | str, int | str] | Symbol]):
+        '''
+        Deletes all attacks in `attacks`, given as pairs `(source, target)` or as clingo `Symbol`s,
+        from the current AF instance.
+        '''
+        for attack in attacks:
+            if isinstance(attack, Symbol):
+                attack = map(argument_id, attack.arguments)
+            s, t = map(self.table.find, attack)
+            if s is not None and s in self.attackers.get(t, ()):
+                self.attackers[t].discard(s)
+                self.targets[s].discard(t)
+
+    def __literal(self, arg: int | str) -> int | None:
+        '''
+        Returns the program literal of `in(x)` for the argument `arg`, or `None` if it is not in the AF.
+        '''
+        x = self.table.find(arg)
+        return self.literals[x] if x in self.arguments else None
+
+    def __first_model(self, assumptions: List[int]) -> List[int | str] | None:
+        self.ctl.configuration.solve.enum_mode = "auto"
+
+        model: List[int | str] | None = None
+        def on_model(m: Model):
+            nonlocal model
+            model = self.table.extension(m.symbols(shown=True))
+            return False
+
+        self.ctl.solve(assumptions, on_model=on_model)
+        return model
+
+    def solve_enum(self, assumps: List[int] = []) -> List[List[int | str]]:
+        '''
+        Returns the argument ids of every extension that contains all arguments in `assumps`.
+        '''
+        literals = [self.__literal(arg) for arg in assumps]
+        if None in literals:
+            return []
+
+        self.ctl.configuration.solve.enum_mode = "auto"
+        models = []
+        with self.ctl.solve(literals, yield_=True) as handle:
+            for m in handle:
+                models.append(self.table.extension(m.symbols(shown=True)))
+        return models
+
+    def solve_cred(self, assumps: List[int] = []) -> bool:
+        '''
+        Returns whether there is an extension containing all arguments in `assumps`,
+        which becomes the witness.
+        '''
+        literals = [self.__literal(arg) for arg in assumps]
+        model = self.__first_model(literals) if None not in literals else None
+        self.witness = model if model is not None else []
+        return model is not None
+
+    def solve_skept(self, assumps: List[int] = []) -> bool:
+        '''
+        Returns whether all arguments in `assumps` are contained in every extension.
+        An extension missing one of them becomes the witness.
+        '''
+        model = None
+        for arg in assumps:
+            literal = self.__literal(arg)
+            model = self.__first_model([-literal] if literal is not None else [])
+            if model is not None:
+                break
+
+        self.witness = model if model is not None else []
+        return model is None
+
+    def extract_witness(self) -> List[int | str]:
+        '''
+        If the previous call of `solve_cred` returned `True`, or the previous call to
+        `solve_skept` returned `False`, returns the argument ids of the witnessing extension.
+        '''
+        return self.witness
@@ -0,0 +1,463 @@
+"""
+The condensation of an AF into its strongly connected components (SCCs), maintained incrementally
+alongside the index of a solver, and the SCC-recursive search for stable extensions on top of it.
+
+Under the stable semantics, the arguments of a component that are attacked by the extension upstream
+are out, and the remaining ones must form a stable extension of their own subframework. So the components
+can be solved one at a time in topological order, and the local extensions of a component only depend
+on the arguments that are left of it, which are cached across queries and mutations.
+"""
+from bisect import bisect_left
+from typing import Callable, Dict, FrozenSet, Iterable, List, Set, Tuple
+
+# Change records `(key, before, after)` of arguments and attacks, as passed to `IncrAFSolver.keep_cached`.
+Change = Tuple[int | Tuple[int, int], bool, bool]
+
+# Returns the stable extensions of the subframework on the given arguments,
+# or `None` if it is too large to solve on its own, or there are too many.
+Local = Callable[[FrozenSet[int]], List[FrozenSet[int]] | None]
+
+# Positions are renumbered once they get this deep, see `Condensation.position`.
+MAX_DEPTH = 8
+
+class SearchLimit(Exception):
+    """
+    Raised by `Condensation.search` when it runs out of its budget, or a component has too many local extensions.
+    """
+
+def strongly_connected(nodes: Iterable[int], targets: Dict[int, Set[int]], within: Set[int]) -> List[List[int]]:
+    """
+    Returns the SCCs reachable from `nodes` of the graph given by `targets`, restricted to the nodes in `within`,
+    in reverse topological order. This is Tarjan's algorithm, without recursion.
+    """
+    index: Dict[int, int] = {}
+    low: Dict[int, int] = {}
+    stack: List[int] = []
+    on_stack: Set[int] = set()
+    components: List[List[int]] = []
+
+    for root in nodes:
+        if root in index:
+            continue
+        index[root] = low[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(targets.get(root, ())))]
+        while work:
+            v, successors = work[-1]
+            for w in successors:
+                if w not in within:
+                    continue
+                if w not in index:
+                    index[w] = low[w] = len(index)
+                    stack.append(w)
+                    on_stack.add(w)
+                    work.append((w, iter(targets.get(w, ()))))
+                    break
+                if w in on_stack and index[w] < low[v]:
+                    low[v] = index[w]
+            else:
+                work.pop()
+                if work and low[v] < low[work[-1][0]]:
+                    low[work[-1][0]] = low[v]
+                if low[v] == index[v]:
+                    component = []
+                    while True:
+                        w = stack.pop()
+                        on_stack.discard(w)
+                        component.append(w)
+                        if w == v:
+                            break
+                    components.append(component)
+    return components
+
+class Condensation:
+    """
+    The SCCs of the AF given by `arguments`, `attackers` and `targets`, which are the live index
+    of a solver by argument indices, as in `IncrAFSolver`, kept in a topological order.
+
+    Mutations are recorded by `touch` and processed by the next `update`:
+    a component that loses an argument or an inner attack is split up by running Tarjan's algorithm
+    on it alone, and an attack against the order merges the components on the cycles it closes,
+    found by the Pearce-Kelly search, which also repairs the order. Only the components between
+    the two ends of such an attack are visited.
+    """
+    def __init__(self, arguments: Set[int], attackers: Dict[int, Set[int]], targets: Dict[int, Set[int]]):
+        self.arguments = arguments
+        self.attackers = attackers
+        self.targets = targets
+
+        # The component of every live argument, and the arguments of every component, by component id.
+        self.component: Dict[int, int] = {}
+        self.members: Dict[int, Set[int]] = {}
+        self.next_id = 0
+
+        # The position of every component in a topological order. Positions are tuples and compare
+        # lexicographically, so the pieces of a component that is split up can take its place
+        # with its position extended by their own order. `top` is the next position at the end.
+        self.position: Dict[int, Tuple[int, ...]] = {}
+        self.top = 0
+
+        # The components in topological order, with their positions and their levels in it, see `components`.
+        self.sorted: List[int] | None = None
+        self.positions: List[Tuple[int, ...]] = []
+        self.level: Dict[int, int] = {}
+
+        # The changes since the last update, or `None` if everything has to be recomputed,
+        # and the added attacks that `update` has not inserted into the order yet.
+        self.pending: List[Change] | None = None
+        self.unprocessed: Set[Tuple[int, int]] = set()
+
+        # The local stable extensions of every component, by the arguments left of it.
+        # An entry stays valid until the attacks inside the component change.
+        self.local: Dict[int, Dict[FrozenSet[int], List[FrozenSet[int]] | None]] = {}
+
+        # The state of the last search that found an extension, by level: the local extensions of every component,
+        # the index of the chosen one, and the levels of the components attacking it, and the extension itself.
+        # It stays valid for the components before the first position whose component or inputs changed since,
+        # `stale`, which is `None` if none did.
+        self.options: List[List[FrozenSet[int]]] = []
+        self.chosen: List[int] = []
+        self.parents: List[Set[int]] = []
+        self.extension: Set[int] = set()
+        self.stale: Tuple[int, ...] | None = ()
+
+        # Statistics: the number of splits and merges, of local extension lists computed and reused,
+        # and of searches that ran out of their budget.
+        self.splits = 0
+        self.merges = 0
+        self.solved = 0
+        self.reused = 0
+        self.abandoned = 0
+
+    def touch(self, changes: List[Change]):
+        '''
+        Records the changes `(key, before, after)` of arguments and attacks made by a mutation.
+        '''
+        if self.pending is not None:
+            self.pending.extend(changes)
+
+    def reset(self):
+        '''
+        Marks the whole AF as changed.
+        '''
+        self.pending = None
+
+    def components(self) -> List[int]:
+        '''
+        Returns the ids of all components in topological order.
+        '''
+        self.update()
+        if self.sorted is None:
+            self.sorted = sorted(self.members, key=self.position.__getitem__)
+            self.positions = [self.position[c] for c in self.sorted]
+            self.level = {c: i for i, c in enumerate(self.sorted)}
+        return self.sorted
+
+    def update(self):
+        '''
+        Brings the components and their order up to date with the AF.
+        '''
+        if self.pending is None:
+            self.__rebuild()
+            return
+        if not self.pending:
+            return
+        changes, self.pending = self.pending, []
+        component, arguments = self.component, self.arguments
+
+        split: Set[int] = set()
+        added: List[Tuple[int, int]] = []
+        new: List[int] = []
+        for key, _, after in changes:
+            if isinstance(key, int):
+                if not after and key in component:
+                    split.add(component[key])
+                elif after:
+                    new.append(key)
+            elif after:
+                added.append(key)
+            else:
+                s, t = key
+                if s in component and component.get(t) == component[s]:
+                    split.add(component[s])
+                elif t in component:
+                    # Fewer arguments of the target's component may be attacked from upstream.
+                    self.__mark(self.position[component[t]])
+
+        deep = False
+        for c in split:
+            deep = deep or len(self.position[c]) >= MAX_DEPTH
+            self.__split(c)
+        for x in new:
+            if x in arguments and x not in component:
+                self.__add_component([x], (self.top,))
+                self.__mark((self.top,))
+                self.top += 1
+                # Attacks on or by an argument may be added while it is deleted.
+                added.extend((s, x) for s in self.attackers.get(x, ()))
+                added.extend((x, t) for t in self.targets.get(x, ()))
+
+        # The order only has to hold for the attacks inserted so far, so the searches skip the others.
+        targets = self.targets
+        self.unprocessed = {(s, t) for s, t in added if s in component and t in component and t in targets.get(s, ())}
+        for s, t in added:
+            if (s, t) in self.unprocessed:
+                self.unprocessed.discard((s, t))
+                self.__insert(component[s], component[t])
+
+        if deep:
+            self.__renumber()
+
+    def __rebuild(self):
+        self.pending = []
+        self.component.clear()
+        self.members.clear()
+        self.position.clear()
+        self.local.clear()
+        self.sorted = None
+        self.__mark(())
+
+        pieces = strongly_connected(self.arguments, self.targets, self.arguments)
+        for i, piece in enumerate(reversed(pieces)):
+            self.__add_component(piece, (i,))
+        self.top = len(pieces)
+
+    def __mark(self, position: Tuple[int, ...]):
+        if self.stale is None or position < self.stale:
+            self.stale = position
+
+    def __renumber(self):
+        self.__mark(())
+        for i, c in enumerate(sorted(self.members, key=self.position.__getitem__)):
+            self.position[c] = (i,)
+        self.top = len(self.members)
+
+    def __add_component(self, arguments: Iterable[int], position: Tuple[int, ...]) -> int:
+        c = self.next_id
+        self.next_id += 1
+        members = self.members[c] = set(arguments)
+        for x in members:
+            self.component[x] = c
+        self.position[c] = position
+        self.sorted = None
+        return c
+
+    def __remove_component(self, c: int) -> Set[int]:
+        members = self.members.pop(c)
+        del self.position[c]
+        self.local.pop(c, None)
+        self.sorted = None
+        return members
+
+    def __split(self, c: int):
+        '''
+        Replaces the component `c` by the SCCs of its live arguments, in its place in the order.
+        '''
+        position = self.position[c]
+        self.__mark(position)
+        members = self.__remove_component(c)
+        for x in members:
+            del self.component[x]
+        live = {x for x in members if x in self.arguments}
+        pieces = strongly_connected(live, self.targets, live)
+        for i, piece in enumerate(reversed(pieces)):
+            self.__add_component(piece, position + (i,))
+        self.splits += 1
+
+    def __successors(self, c: int) -> Set[int]:
+        component, unprocessed = self.component, self.unprocessed
+        return {component[t] for x in self.members[c] for t in self.targets.get(x, ())
+                if t in component and not (unprocessed and (x, t) in unprocessed)} - {c}
+
+    def __predecessors(self, c: int) -> Set[int]:
+        component, unprocessed = self.component, self.unprocessed
+        return {component[s] for x in self.members[c] for s in self.attackers.get(x, ())
+                if s in component and not (unprocessed and (s, x) in unprocessed)} - {c}
+
+    def __reach(self, start: int, bound: Tuple[int, ...], forward: bool) -> Set[int]:
+        '''
+        Returns the components reachable from `start` forward (or backward) through positions up to (or from) `bound`.
+        '''
+        step = self.__successors if forward else self.__predecessors
+        position = self.position
+        seen = {start}
+        queue = [start]
+        while queue:
+            for d in step(queue.pop()):
+                if d not in seen and (position[d] <= bound if forward else position[d] >= bound):
+                    seen.add(d)
+                    queue.append(d)
+        return seen
+
+    def __insert(self, cs: int, ct: int):
+        '''
+        Updates the components and the order for an attack from component `cs` on component `ct`.
+        '''
+        position = self.position
+        if cs == ct:
+            # The local extensions of the component change with its inner attacks.
+            self.local.pop(cs, None)
+            self.__mark(position[cs])
+            return
+        if position[cs] < position[ct]:
+            # More arguments of `ct` may be attacked from upstream.
+            self.__mark(position[ct])
+            return
+
+        forward = self.__reach(ct, position[cs], True)
+        backward = self.__reach(cs, position[ct], False)
+        slots = sorted(position[d] for d in forward | backward)
+        by_position = position.__getitem__
+        self.__mark(slots[0])
+
+        if cs in forward:
+            # The components that reach `cs` from `ct` form a cycle with the attack, and are merged.
+            cycle = forward & backward
+            merged = set().union(*(self.__remove_component(d) for d in cycle))
+            front = sorted(backward - cycle, key=by_position) + [self.__add_component(merged, slots[0])]
+            back = sorted(forward - cycle, key=by_position)
+            self.merges += 1
+        else:
+            front = sorted(backward, key=by_position)
+            back = sorted(forward, key=by_position)
+        # The components reaching `cs` take the first of their joint positions and those reachable from `ct`
+        # the last ones, both in their previous order. A merge leaves the positions in between unused.
+        for d, slot in zip(front, slots):
+            position[d] = slot
+        for d, slot in zip(back, slots[len(slots) - len(back):]):
+            position[d] = slot
+        self.sorted = None
+
+    def extensions(self, c: int, region: FrozenSet[int], local: Local) -> List[FrozenSet[int]]:
+        '''
+        Returns the stable extensions of the subframework on `region`, the arguments of component `c`
+        that are not attacked from upstream, computed by `local` unless they are cached.
+        Raises `SearchLimit` if `local` did not list them.
+        '''
+        cache = self.local.setdefault(c, {})
+        if region in cache:
+            self.reused += 1
+            result = cache[region]
+            if result is None:
+                raise SearchLimit()
+            return result
+
+        self.solved += 1
+        if len(region) > 1:
+            result = cache[region] = local(region)
+            if result is None:
+                raise SearchLimit()
+            return result
+        elif region:
+            x, = region
+            result = [] if x in self.attackers.get(x, ()) else [region]
+        else:
+            result = [region]
+        cache[region] = result
+        return result
+
+    def search(self, local: Local, inn: Set[int] = set(), out: Set[int] = set(), budget: int | None = None) -> Set[int] | None:
+        '''
+        Returns a stable extension, as argument indices, that contains the live arguments in `inn`
+        and none in `out`, or `None` if there is none. `local(region)` returns the stable extensions
+        of the subframework on `region`, or `None` if it is too large or there are too many, see `extensions`.
+
+        The components are assigned local extensions in topological order. When one has none left,
+        the search jumps back to the latest component that attacks it or that an earlier failure
+        below it depended on (conflict-directed backjumping), since the ones in between cannot help.
+        Deciding stable acceptance is NP-hard, so this may still take exponentially many jumps.
+        After `budget` of them, `SearchLimit` is raised.
+
+        The assignment of the last successful search is kept for the components upstream of every change
+        since, unless it violates `inn` or `out`, so only the rest is searched again. This includes the components
+        before one that made a search raise `SearchLimit`.
+        '''
+        order = self.components()
+        options, chosen, parents, extension = self.options, self.chosen, self.parents, self.extension
+        members, attackers, component, level_of = self.members, self.attackers, self.component, self.level
+
+        start = len(options)
+        if self.stale is not None:
+            start = min(start, bisect_left(self.positions, self.stale))
+
+        # The arguments that must be in and out of the local extension, by the level of their component.
+        need: Dict[int, Tuple[Set[int], Set[int]]] = {}
+        for x in inn:
+            need.setdefault(level_of[component[x]], (set(), set()))[0].add(x)
+        for x in out:
+            need.setdefault(level_of[component[x]], (set(), set()))[1].add(x)
+        def fits(level: int, e: FrozenSet[int]) -> bool:
+            required, excluded = need.get(level, (set(), set()))
+            return required <= e and excluded.isdisjoint(e)
+        for level in need:
+            if level < start and not fits(level, options[level][chosen[level]]):
+                start = level
+
+        for level in range(start, len(options)):
+            extension -= options[level][chosen[level]]
+        del options[start:], chosen[start:], parents[start:]
+        self.stale = None
+
+        # The levels kept from the last search have only tried their chosen option for this one.
+        kept = start
+        conflicts: Dict[int, Set[int]] = {}
+        level = start
+        while level < len(order):
+            if level == len(options):
+                # If this raises `SearchLimit`, the state is still valid up to here for the next search.
+                c = order[level]
+                region = frozenset(x for x in members[c] if extension.isdisjoint(attackers.get(x, ())))
+                options.append(self.extensions(c, region, local))
+                chosen.append(-1)
+                parents.append({level_of[component[s]] for x in members[c] for s in attackers.get(x, ())
+                                if s in component and component[s] != c})
+            else:
+                extension -= options[level][chosen[level]]
+
+            current = options[level]
+            k = chosen[level] + 1
+            while k < len(current) and not fits(level, current[k]):
+                k += 1
+            chosen[level] = k
+            if k < len(current):
+                extension |= current[k]
+                level += 1
+                continue
+
+            # Every local extension failed, for reasons that only depend on these earlier components.
+            conflict = conflicts.pop(level, set()) | parents[level]
+            if not conflict:
+                self.__forget()
+                return None
+            if budget is not None:
+                budget -= 1
+                if budget < 0:
+                    self.abandoned += 1
+                    self.__forget()
+                    raise SearchLimit()
+            target = max(conflict)
+            for skipped in range(target + 1, level):
+                extension -= options[skipped][chosen[skipped]]
+                conflicts.pop(skipped, None)
+            del options[target + 1:], chosen[target + 1:], parents[target + 1:]
+            conflicts[target] = conflicts.get(target, set()) | (conflict - {target})
+            level = target
+
+            if level < kept:
+                # The other options of a kept level all remain to be tried, so the chosen one goes first.
+                e = options[level][chosen[level]]
+                options[level] = [e] + [f for f in options[level] if f is not e]
+                chosen[level] = 0
+                kept = level
+
+        return set(extension)
+
+    def __forget(self):
+        '''
+        Drops the state of the last search.
+        '''
+        self.options.clear()
+        self.chosen.clear()
+        self.parents.clear()
+        self.extension.clear()
@@ -0,0 +1,517 @@
+"""
+An `AFSolver` for very large AFs that fall apart into many weakly connected components.
+
+The components are spread over worker processes (shards), each with an `IncrAFSolver` of the subframework
+made up of the components it owns. Under all semantics of `IncrAFSolver`, the extensions of an AF are exactly
+the unions of one extension of each of its components, so a query only needs the shards owning its
+assumptions, and the extensions of the whole AF are the product of those of the shards.
+"""
+from ipafair import AFSolver
+
+from clingo.symbol import Symbol
+
+from incraf import ENCODINGS, argument_id
+from ipafair.loaders import Id, read_af
+from parallel import serve
+
+import multiprocessing
+import os
+from collections import defaultdict
+from multiprocessing.connection import Connection
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+# The number of extensions fetched from a shard at a time while enumerating.
+CHUNK_SIZE = 256
+
+class ShardedAFSolver(AFSolver):
+    def __init__(self, sigma: str, af_file: str | None = None, workers: int | None = None, **options):
+        """
+        Initializes an `AFSolver` that spreads the weakly connected components of the AF over `workers`
+        processes (by default one per core), each with its own `IncrAFSolver` for the components it owns.
+        The `options` are passed on to the `IncrAFSolver` of every worker.
+
+        New arguments are only placed on a shard before the next query, together with everything
+        connected to them, the largest groups first and each on the shard with the fewest arguments.
+        An attack between two shards moves the smaller of the components it connects to the shard of the larger.
+        Components that fall apart after deletions stay on their shard.
+        """
+        if sigma not in ENCODINGS:
+            raise KeyError("Semantics name is not known")
+        self.sigma = sigma
+
+        # Workers forked later inherit a copy of this object, whose `__del__` must not stop the workers.
+        self.pid = os.getpid()
+        self.conns: List[Connection] = []
+        self.processes: List[multiprocessing.Process] = []
+        for _ in range(workers or os.cpu_count() or 1):
+            conn, child = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=serve, args=(child, sigma, None, options), daemon=True)
+            process.start()
+            child.close()
+            self.conns.append(conn)
+            self.processes.append(process)
+
+        # The live arguments and all attacks of the AF by argument ids, like the index of `IncrAFSolver`.
+        self.arguments: Set[Id] = set()
+        self.attackers: Dict[Id, Set[Id]] = defaultdict(set)
+        self.targets: Dict[Id, Set[Id]] = defaultdict(set)
+
+        # The shard of every placed argument, including those that are only the source or target
+        # of an attack, and the number of live arguments of every shard.
+        self.owner: Dict[Id, int] = {}
+        self.sizes: List[int] = [0] * len(self.conns)
+
+        # The arguments not placed yet, and the attacks not sent to any shard yet,
+        # because they are incident to such an argument or connect two shards.
+        self.unplaced: Set[Id] = set()
+        self.pending: Set[Tuple[Id, Id]] = set()
+
+        # The shards holding their part of the witness of the last query, or `None` if there is none.
+        self.held: Set[int] | None = None
+
+        # Statistics: the number of components moved between shards and of the arguments in them.
+        self.moves = 0
+        self.moved = 0
+
+        if af_file:
+            args, attacks = read_af(af_file)
+            self.add_arguments(args)
+            self.add_attacks(attacks)
+
+    def __del__(self):
+        if os.getpid() != self.pid:
+            return
+        for conn, process in zip(self.conns, self.processes):
+            try:
+                conn.send(("stop",))
+                conn.close()
+            except OSError:
+                pass
+            process.join(timeout=1)
+        self.conns, self.processes = [], []
+
+    def __cast(self, shard: int, name: str, *args):
+        self.conns[shard].send(("cast", name, args))
+
+    def __call(self, calls: Dict[int, Tuple[str, tuple]]) -> Dict[int, object]:
+        '''
+        Sends the calls `shard: (name, args)` to all their shards first and then collects the results,
+        so that the shards work on them in parallel. The first error is raised once every reply has been read,
+        so that none is left in a pipe to be taken for the result of a later call.
+        '''
+        for shard, (name, args) in calls.items():
+            self.conns[shard].send(("call", name, args))
+        replies = {shard: self.conns[shard].recv() for shard in calls}
+        for status, result in replies.values():
+            if status == "error":
+                raise result
+        return {shard: result for shard, (_, result) in replies.items()}
+
+    @staticmethod
+    def __id(arg: Id | Symbol) -> Id:
+        return argument_id(arg.arguments[0]) if isinstance(arg, Symbol) else arg
+
+    @staticmethod
+    def __pair(attack: Tuple[Id, Id] | Symbol) -> Tuple[Id, Id]:
+        if isinstance(attack, Symbol):
+            s, t = map(argument_id, attack.arguments)
+            return s, t
+        return attack
+
+    def add_argument(self, arg: Id | Symbol):
+        self.add_arguments([arg])
+
+    def del_argument(self, arg: Id | Symbol):
+        self.del_arguments([arg])
+
+    def add_attack(self, source: Id, target: Id):
+        self.add_attacks([(source, target)])
+
+    def del_attack(self, source: Id, target: Id):
+        self.del_attacks([(source, target)])
+
+    def add_arguments(self, args: Iterable[Id | Symbol]):
+        '''
+        Adds all arguments in `args` to the current AF instance. Arguments already placed, because they
+        occurred in an attack, are sent to their shard, the others are placed before the next query.
+        '''
+        batches = defaultdict(list)
+        for x in map(self.__id, args):
+            if x in self.arguments:
+                continue
+            self.arguments.add(x)
+            if x in self.owner:
+                batches[self.owner[x]].append(x)
+                self.sizes[self.owner[x]] += 1
+            else:
+                self.unplaced.add(x)
+        for shard, batch in batches.items():
+            self.__cast(shard, "add_arguments", batch)
+
+    def del_arguments(self, args: Iterable[Id | Symbol]):
+        '''
+        Deletes all arguments in `args`, together with their incident attacks, from the current AF instance.
+        '''
+        batches = defaultdict(list)
+        for x in map(self.__id, args):
+            for s in self.attackers.pop(x, ()):
+                self.targets[s].discard(x)
+                self.pending.discard((s, x))
+            for t in self.targets.pop(x, ()):
+                self.attackers[t].discard(x)
+                self.pending.discard((x, t))
+
+            # Without attacks, the argument is placed again when it is added again.
+            self.unplaced.discard(x)
+            shard = self.owner.pop(x, None)
+            if shard is not None:
+                batches[shard].append(x)
+                if x in self.arguments:
+                    self.sizes[shard] -= 1
+            self.arguments.discard(x)
+        for shard, batch in batches.items():
+            self.__cast(shard, "del_arguments", batch)
+
+    def add_attacks(self, attacks: Iterable[Tuple[Id, Id] | Symbol]):
+        '''
+        Adds all attacks in `attacks`, given as pairs `(source, target)` or as clingo `Symbol`s,
+        to the current AF instance. Attacks within a shard are sent to it right away,
+        the others once their arguments are placed on the same shard before the next query.
+        '''
+        batches = defaultdict(list)
+        for s, t in map(self.__pair, attacks):
+            if s in self.attackers[t]:
+                continue
+            self.attackers[t].add(s)
+            self.targets[s].add(t)
+
+            shard = self.owner.get(s)
+            if shard is not None and shard == self.owner.get(t):
+                batches[shard].append((s, t))
+                continue
+            self.pending.add((s, t))
+            for x in (s, t):
+                if x not in self.owner:
+                    self.unplaced.add(x)
+        for shard, batch in batches.items():
+            self.__cast(shard, "add_attacks", batch)
+
+    def del_attacks(self, attacks: Iterable[Tuple[Id, Id] | Symbol]):
+        '''
+        Deletes all attacks in `attacks`, given as pairs `(source, target)` or as clingo `Symbol`s,
+        from the current AF instance.
+        '''
+        batches = defaultdict(list)
+        for s, t in map(self.__pair, attacks):
+            if s not in self.attackers.get(t, ()):
+                continue
+            self.attackers[t].discard(s)
+            self.targets[s].discard(t)
+            if (s, t) in self.pending:
+                self.pending.discard((s, t))
+            else:
+                batches[self.owner[s]].append((s, t))
+        for shard, batch in batches.items():
+            self.__cast(shard, "del_attacks", batch)
+
+    def __place(self):
+        '''
+        Places the unplaced arguments and sends the pending attacks to their shards.
+        Every group of arguments connected by pending attacks ends up on a single shard.
+        '''
+        if not self.unplaced and not self.pending:
+            return
+
+        parent = {x: x for x in self.unplaced}
+        def find(x: Id) -> Id:
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+        for s, t in self.pending:
+            parent.setdefault(s, s)
+            parent.setdefault(t, t)
+            parent[find(s)] = find(t)
+        groups = defaultdict(list)
+        for x in parent:
+            groups[find(x)].append(x)
+
+        owner, sizes = self.owner, self.sizes
+        for group in sorted(groups.values(), key=len, reverse=True):
+            placed = [x for x in group if x in owner]
+            shards = {owner[x] for x in placed}
+            if not shards:
+                shard = min(range(len(sizes)), key=sizes.__getitem__)
+            elif len(shards) == 1:
+                shard = shards.pop()
+            else:
+                shard = self.__merge(placed)
+
+            new = [x for x in group if x not in owner]
+            for x in new:
+                owner[x] = shard
+            live = [x for x in new if x in self.arguments]
+            if live:
+                self.__cast(shard, "add_arguments", live)
+                sizes[shard] += len(live)
+
+        batches = defaultdict(list)
+        for s, t in self.pending:
+            batches[owner[s]].append((s, t))
+        for shard, batch in batches.items():
+            self.__cast(shard, "add_attacks", batch)
+        self.unplaced.clear()
+        self.pending.clear()
+
+    def __neighbours(self, x: Id) -> Iterator[Id]:
+        '''
+        Yields the arguments attacking or attacked by `x` on the shard of `x`.
+        '''
+        shard = self.owner[x]
+        for y in (*self.attackers.get(x, ()), *self.targets.get(x, ())):
+            if self.owner.get(y) == shard:
+                yield y
+
+    def __merge(self, roots: List[Id]) -> int:
+        '''
+        Moves the components containing the placed arguments `roots` within their shards to a single shard,
+        the one of the largest component, which is returned.
+
+        The components are explored in lockstep, one argument each at a time, until at most one is left
+        unexplored. That one is the largest and stays, so it is never explored completely.
+        '''
+        # The arguments seen and the queue of every search, and the search that saw every argument.
+        # Searches that meet are merged into the first one and marked in `into`.
+        seen: List[Set[Id]] = []
+        queues: List[List[Id]] = []
+        into: List[int | None] = []
+        label: Dict[Id, int] = {}
+        def find(i: int) -> int:
+            while into[i] is not None:
+                i = into[i]
+            return i
+
+        for x in roots:
+            if x not in label:
+                label[x] = len(seen)
+                seen.append({x})
+                queues.append([x])
+                into.append(None)
+
+        active = [i for i in range(len(seen))]
+        while len(active) > 1:
+            for i in active:
+                if into[i] is not None or not queues[i]:
+                    continue
+                x = queues[i].pop()
+                for y in self.__neighbours(x):
+                    j = find(label[y]) if y in label else None
+                    if j is None:
+                        label[y] = i
+                        seen[i].add(y)
+                        queues[i].append(y)
+                    elif j != i:
+                        seen[i] |= seen[j]
+                        queues[i].extend(queues[j])
+                        seen[j], queues[j], into[j] = set(), [], i
+            active = [i for i in active if into[i] is None and queues[i]]
+
+        components = [i for i in range(len(seen)) if into[i] is None]
+        keep = active[0] if active else max(components, key=lambda i: len(seen[i]))
+        shard = self.owner[next(iter(seen[keep]))]
+        for i in components:
+            if i != keep:
+                self.__move(seen[i], shard)
+        return shard
+
+    def __move(self, component: Set[Id], shard: int):
+        '''
+        Moves the arguments in `component` and the attacks among them to `shard`.
+        '''
+        source = self.owner[next(iter(component))]
+        if source == shard:
+            return
+        attacks = [(s, t) for s in component for t in self.targets.get(s, ()) if t in component]
+        live = [x for x in component if x in self.arguments]
+
+        self.__cast(source, "del_attacks", attacks)
+        self.__cast(source, "del_arguments", list(component))
+        self.__cast(shard, "add_arguments", live)
+        self.__cast(shard, "add_attacks", attacks)
+        for x in component:
+            self.owner[x] = shard
+        self.sizes[source] -= len(live)
+        self.sizes[shard] += len(live)
+        self.moves += 1
+        self.moved += len(live)
+
+    def __shards(self) -> List[int]:
+        '''
+        Returns the shards with live arguments. The AF of any other shard only has the empty extension.
+        '''
+        return [shard for shard, size in enumerate(self.sizes) if size > 0]
+
+    def __route(self, assumps: List[Id]) -> Dict[int, List[Id]] | None:
+        '''
+        Groups the arguments in `assumps` by their shards, or returns `None` if one of them is not in the AF.
+        '''
+        routes = defaultdict(list)
+        for x in assumps:
+            if x not in self.arguments:
+                return None
+            routes[self.owner[x]].append(x)
+        return routes
+
+    def __consistent(self, shards: Iterable[int]) -> bool:
+        '''
+        Returns whether all `shards` have an extension. Under all semantics but `stable`, every AF has one.
+        '''
+        if self.sigma != "stable":
+            return True
+        return all(self.__call({shard: ("solve_cred", ([],)) for shard in shards}).values())
+
+    def solve_cred(self, assumps: List[Id] = []) -> bool:
+        '''
+        Returns whether there is an extension containing all arguments in `assumps`, i.e. whether
+        every shard has an extension containing those on it. Only the shards owning one of `assumps`
+        are asked, and under `stable` the others whether they have any extension.
+        '''
+        self.__place()
+        self.held = None
+        routes = self.__route(assumps)
+        if routes is None:
+            return False
+
+        calls = {shard: ("solve_cred", (args,)) for shard, args in routes.items()}
+        if self.sigma == "stable":
+            for shard in self.__shards():
+                calls.setdefault(shard, ("solve_cred", ([],)))
+        if not all(self.__call(calls).values()):
+            return False
+        self.held = set(calls)
+        return True
+
+    def solve_skept(self, assumps: List[Id] = []) -> bool:
+        '''
+        Returns whether all arguments in `assumps` are contained in every extension. An extension of
+        a shard missing one of those on it extends to a counter-example unless another shard has no extension.
+        '''
+        self.__place()
+        self.held = None
+        routes = self.__route(assumps)
+        # An argument that is not in the AF is in no extension, so any extension is a counter-example.
+        failed = set() if routes is None else {
+            shard for shard, accepted in self.__call({shard: ("solve_skept", (args,)) for shard, args in routes.items()}).items()
+            if not accepted}
+        if routes is not None and not failed:
+            return True
+
+        others = [shard for shard in self.__shards() if shard not in failed]
+        if not self.__consistent(others):
+            return True
+        self.held = failed | (set(others) if self.sigma == "stable" else set())
+        return False
+
+    def extract_witness(self) -> List[Id]:
+        '''
+        If the previous call of `solve_cred` returned `True`, or the previous call to `solve_skept`
+        returned `False`, returns the argument ids of the witnessing extension: the union of the witnesses
+        of the shards that were asked, and of any extension of the others.
+        '''
+        if self.held is None:
+            return []
+        calls = {shard: ("witness" if shard in self.held else "any_extension", ()) for shard in self.__shards()}
+        return [x for part in self.__call(calls).values() for x in part]
+
+    def iter_extensions(self, limit: int | None = None, assumps: List[Id] = []) -> Iterator[List[Id]]:
+        '''
+        Yields the argument ids of the extensions of the current AF instance that contain all arguments
+        in `assumps`, at most `limit` of them.
+
+        They are the product of the extensions of the shards, which stream theirs in chunks of `CHUNK_SIZE`
+        as the product reaches them. All but those of the first shard are kept for the next rounds.
+        No mutation may be made until the generator is exhausted or closed.
+        '''
+        self.__place()
+        routes = self.__route(assumps)
+        if routes is None or limit == 0:
+            return
+        shards = self.__shards()
+
+        self.__call({shard: ("open_extensions", (routes.get(shard, []),)) for shard in shards})
+        try:
+            # The extensions fetched from every shard so far, and whether these are all of them.
+            fetched: List[List[List[Id]]] = [[] for _ in shards]
+            done = [False] * len(shards)
+            def fetch(i: int) -> List[List[Id]]:
+                chunk = self.__call({shards[i]: ("next_extensions", (CHUNK_SIZE,))})[shards[i]]
+                done[i] = len(chunk) < CHUNK_SIZE
+                return chunk
+
+            # The product is empty if any shard has no extension, so the first chunks are fetched up front.
+            for i in range(len(shards)):
+                fetched[i] = fetch(i)
+                if not fetched[i]:
+                    return
+
+            def extensions(i: int) -> Iterator[List[Id]]:
+                if i == 0:
+                    chunk = fetched[0]
+                    while True:
+                        yield from chunk
+                        if done[0]:
+                            return
+                        chunk = fetch(0)
+                j = 0
+                while True:
+                    if j < len(fetched[i]):
+                        yield fetched[i][j]
+                        j += 1
+                    elif done[i]:
+                        return
+                    else:
+                        fetched[i].extend(fetch(i))
+
+            def product(i: int) -> Iterator[List[Id]]:
+                if i == len(shards):
+                    yield []
+                    return
+                for extension in extensions(i):
+                    for rest in product(i + 1):
+                        yield extension + rest
+
+            for count, extension in enumerate(product(0), start=1):
+                yield extension
+                if limit is not None and count >= limit:
+                    break
+        finally:
+            self.__call({shard: ("close_extensions", ()) for shard in shards})
+
+    def solve_enum(self, assumps: List[Id] = []) -> List[List[Id]]:
+        '''
+        Returns the argument ids of every extension that contains all arguments in `assumps`.
+        '''
+        return list(self.iter_extensions(assumps=assumps))
+
+    def count_extensions(self, cap: int | None = None, timeout: float | None = None,
+                         assumps: List[Id] = []) -> Tuple[int, bool]:
+        '''
+        Counts the extensions that contain all arguments in `assumps` as the product of the counts of
+        the shards, see `IncrAFSolver.count_extensions`. Returns the count, at most `cap`, and whether it is exact.
+        '''
+        self.__place()
+        routes = self.__route(assumps)
+        if routes is None:
+            return 0, True
+
+        results = self.__call({shard: ("count_extensions", (cap, timeout, routes.get(shard, [])))
+                               for shard in self.__shards()})
+        if any(count == 0 and exact for count, exact in results.values()):
+            return 0, True
+        total, exact = 1, True
+        for count, complete in results.values():
+            total *= count
+            exact = exact and complete
+        if cap is not None and total > cap:
+            return cap, False
+        return total, exact
@@ -0,0 +1,51 @@
+from incraf import IncrAFSolver
+import os
+import tempfile
+
+# An attack on a deleted argument, added after a rebuild of the ground program,
+# must still constrain the argument once it is added again.
+for compact in (False, True):
+    s = IncrAFSolver("stable")
+    s.add_arguments([4, 5])
+    s.del_argument(5)
+    if compact:
+        s.compact()
+    s.add_attack(5, 4)
+    s.add_argument(5)
+    assert(s.solve_enum() == [[5]])
+
+# The same for an attack added before its source.
+s = IncrAFSolver("stable")
+s.add_argument(4)
+s.add_attack(5, 4)
+assert(s.solve_enum() == [[4]])
+s.add_argument(5)
+assert(s.solve_enum() == [[5]])
+
+# The same after restoring a snapshot that holds attacks on arguments that are not in the AF.
+s = IncrAFSolver("stable")
+s.add_arguments([4, 5])
+s.add_attack(6, 4)
+s.del_argument(5)
+fd, path = tempfile.mkstemp()
+os.close(fd)
+try:
+    s.save(path)
+    s = IncrAFSolver.load(path)
+finally:
+    os.remove(path)
+s.add_attack(5, 4)
+s.add_argument(5)
+assert(s.solve_enum() == [[5]])
+s.add_argument(6)
+assert(sorted(map(sorted, s.solve_enum())) == [[5, 6]])
+
+# Credulous comp and pref queries decided on a relevance slice still have a complete witness.
+for sigma in ("comp", "pref"):
+    s = IncrAFSolver(sigma, slicing=1)
+    s.add_arguments(range(1, 11))
+    s.add_attack(2, 1)
+    s.add_attack(1, 2)
+    s.add_attack(4, 3)
+    assert(s.solve_cred([1]))
+    assert(sorted(s.extract_witness()) == [1, 4, 5, 6, 7, 8, 9, 10])
@@ -0,0 +1,250 @@
+"""
+Recording and replaying the calls made to an `AFSolver`, e.g. to reproduce a slow dynamic run offline.
+
+A trace is a text file with one JSON object per line. The first line is a header
+`{"trace": 1, "sigma": ..., "solver": ..., "af_file": ..., "af": ...}`, with the path and contents
+of the initial AF, if any, and every further line one call
+`{"call": <method>, "args": [...], "result": ..., "time": <seconds>}`.
+Files ending in `.gz` are compressed with gzip.
+"""
+from ipafair import AFSolver
+
+import argparse
+import gzip
+import json
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import IO, Iterable, Iterator, List, Tuple, cast
+
+TRACE_VERSION = 1
+
+# The calls that are recorded and replayed. `TraceRecorder` refuses all other methods of the solver,
+# since a replay could not reproduce their effect.
+TRACED_CALLS = ("add_argument", "del_argument", "add_attack", "del_attack",
+                "add_arguments", "del_arguments", "add_attacks", "del_attacks",
+                "solve_cred", "solve_skept", "solve_enum", "extract_witness")
+
+class TraceMismatch(Exception):
+    """
+    Raised by `replay` in verification mode if a call returns something else than recorded.
+    """
+    def __init__(self, line: int, call: str, params: list, recorded, result):
+        super().__init__(f"line {line}: {call}({', '.join(map(repr, params))}) returned {result!r}, recorded {recorded!r}")
+        self.line = line
+        self.call = call
+        self.params = params
+        self.recorded = recorded
+        self.result = result
+
+def open_trace(path: str, mode: str) -> IO[str]:
+    """
+    Opens the trace at `path` for reading (`"r"`) or writing (`"w"`), compressed if it ends in `.gz`.
+    """
+    if path.endswith(".gz"):
+        return cast(IO[str], gzip.open(path, mode + "t", encoding="utf-8"))
+    return open(path, mode, encoding="utf-8")
+
+class TraceRecorder(AFSolver):
+    """
+    Wraps any `AFSolver` and writes every call of `TRACED_CALLS` to the trace file at `path`,
+    with its arguments, result and wall time, before returning the result.
+    Other methods of the solver raise `AttributeError`; its other attributes can be read.
+
+    The `af_file` the solver was created with is stored in the header, so a replay starts from the same AF.
+
+    Use it as a context manager or call `close` to flush the file.
+    """
+    def __init__(self, solver: AFSolver, path: str, sigma: str | None = None, af_file: str | None = None):
+        self.solver = solver
+        self.file = None
+        header = {"trace": TRACE_VERSION, "sigma": sigma or getattr(solver, "sigma", None), "solver": type(solver).__name__,
+                  "af_file": af_file, "af": None}
+        if af_file:
+            with open(af_file, "r", encoding="utf-8") as f:
+                header["af"] = f.read()
+        self.file = open_trace(path, "w")
+        self.file.write(json.dumps(header) + "\n")
+
+    def __del__(self):
+        self.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __getattr__(self, name: str):
+        value = getattr(self.solver, name)
+        if callable(value):
+            raise AttributeError(f"{name} is not recorded by {type(self).__name__}")
+        return value
+
+    def close(self):
+        '''
+        Closes the trace file. Further calls are no longer recorded.
+        '''
+        if getattr(self, "file", None) is not None:
+            self.file.close()
+            self.file = None
+
+    def __record(self, call: str, *args):
+        start = time.perf_counter()
+        result = getattr(self.solver, call)(*args)
+        elapsed = time.perf_counter() - start
+
+        if self.file is not None:
+            entry = {"call": call, "args": list(args), "result": jsonable(result), "time": elapsed}
+            self.file.write(json.dumps(entry) + "\n")
+        return result
+
+    def add_argument(self, arg: int):
+        return self.__record("add_argument", arg)
+
+    def del_argument(self, arg: int):
+        return self.__record("del_argument", arg)
+
+    def add_attack(self, source: int, target: int):
+        return self.__record("add_attack", source, target)
+
+    def del_attack(self, source: int, target: int):
+        return self.__record("del_attack", source, target)
+
+    def add_arguments(self, args: Iterable[int]):
+        return self.__record("add_arguments", list(args))
+
+    def del_arguments(self, args: Iterable[int]):
+        return self.__record("del_arguments", list(args))
+
+    def add_attacks(self, attacks: Iterable[Tuple[int, int]]):
+        return self.__record("add_attacks", [tuple(attack) for attack in attacks])
+
+    def del_attacks(self, attacks: Iterable[Tuple[int, int]]):
+        return self.__record("del_attacks", [tuple(attack) for attack in attacks])
+
+    def solve_cred(self, assumps: List[int] = []) -> bool:
+        return self.__record("solve_cred", list(assumps))
+
+    def solve_skept(self, assumps: List[int] = []) -> bool:
+        return self.__record("solve_skept", list(assumps))
+
+    def solve_enum(self, assumps: List[int] = []) -> List[List[int]]:
+        return self.__record("solve_enum", list(assumps))
+
+    def extract_witness(self) -> List[int]:
+        return self.__record("extract_witness")
+
+def jsonable(result):
+    """
+    Converts a call result to plain JSON, e.g. the `SolveStatus` or a witness.
+    """
+    if result is None or isinstance(result, (bool, int, str, float)):
+        return result
+    if isinstance(result, (list, tuple, set, frozenset)):
+        return [jsonable(x) for x in result]
+    return str(result)
+
+def read_header(path: str) -> dict:
+    """
+    Returns the header of the trace at `path`.
+    """
+    with open_trace(path, "r") as f:
+        header = json.loads(f.readline())
+    if header.get("trace") != TRACE_VERSION:
+        raise ValueError(f"{path} is not a trace of version {TRACE_VERSION}")
+    return header
+
+@contextmanager
+def initial_af(header: dict) -> Iterator[str | None]:
+    """
+    Yields the path of a temporary copy of the initial AF recorded in `header`, with the extension
+    of the original file, or `None` if the trace started from an empty AF.
+    """
+    if header.get("af") is None:
+        yield None
+        return
+
+    suffix = os.path.splitext(header.get("af_file") or "")[1]
+    fd, path = tempfile.mkstemp(suffix=suffix)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(header["af"])
+        yield path
+    finally:
+        os.remove(path)
+
+def read_calls(path: str) -> Iterator[dict]:
+    """
+    Yields the calls of the trace at `path`, reading the file lazily, one line at a time.
+    """
+    read_header(path)
+    with open_trace(path, "r") as f:
+        f.readline()
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+def replay(path: str, solver: AFSolver, verify: bool = False) -> dict:
+    """
+    Streams the calls of the trace at `path` into `solver`.
+
+    The `solver` has to start from the initial AF of the trace, see `initial_af`.
+
+    In verification mode, the answers of `solve_cred` and `solve_skept` and the extensions of `solve_enum`
+    are checked against the recorded ones, raising `TraceMismatch` at the first difference.
+    Witnesses are not checked, since any extension may be returned.
+
+    Returns the number of calls, the replay time and the recorded time of every method.
+    """
+    summary: dict = {}
+    for line, entry in enumerate(read_calls(path), start=2):
+        call, args = entry["call"], entry["args"]
+        if call not in TRACED_CALLS:
+            raise ValueError(f"line {line}: unknown call {call!r}")
+        if call.endswith("_attacks"):
+            args = [[tuple(attack) for attack in args[0]]]
+
+        start = time.perf_counter()
+        result = getattr(solver, call)(*args)
+        elapsed = time.perf_counter() - start
+
+        if verify and call in ("solve_cred", "solve_skept") and bool(result) != bool(entry["result"]):
+            raise TraceMismatch(line, call, args, entry["result"], result)
+        if verify and call == "solve_enum" and extensions(result) != extensions(entry["result"]):
+            raise TraceMismatch(line, call, args, entry["result"], result)
+
+        stats = summary.setdefault(call, {"calls": 0, "time": 0.0, "recorded_time": 0.0})
+        stats["calls"] += 1
+        stats["time"] += elapsed
+        stats["recorded_time"] += entry.get("time", 0.0)
+
+    return summary
+
+def extensions(result: list) -> set:
+    """
+    Returns the extensions in a result of `solve_enum`, in any order, as recorded in a trace.
+    """
+    return {frozenset(jsonable(extension)) for extension in result}
+
+def main():
+    from incraf import IncrAFSolver
+
+    parser = argparse.ArgumentParser(description="Replays a trace against IncrAFSolver.")
+    parser.add_argument("trace")
+    parser.add_argument("--sigma", help="semantics, by default the one recorded in the trace")
+    parser.add_argument("--verify", action="store_true", help="check the answers against the recorded ones")
+    options = parser.parse_args()
+
+    header = read_header(options.trace)
+    with initial_af(header) as af_file:
+        solver = IncrAFSolver(options.sigma or header["sigma"], af_file)
+    summary = replay(options.trace, solver, options.verify)
+
+    print(f"{'call':>16} {'calls':>7} {'time [s]':>9} {'recorded [s]':>13}")
+    for call, stats in summary.items():
+        print(f"{call:>16} {stats['calls']:>7} {stats['time']:>9.3f} {stats['recorded_time']:>13.3f}")
+
+if __name__ == "__main__":
+    main()
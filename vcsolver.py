@@ -8,44 +8,34 @@ from clingo.solving import Model, SolveResult
 from clingox.program import Program, ProgramObserver
 from clingox.backend import SymbolicBackend
 
-from typing import List, cast
+from typing import List, Tuple, cast
+
+from contextlib import nullcontext
 
 from re import match
 
+from debug import count_models, program_stats
+from metrics import Metrics
+from ipafair.loaders import read_vc
+
+import time
+
+# Below this many vertex and edge atoms, a rebuild of the ground program is not worth it.
+COMPACT_MIN_ATOMS = 1024
+
 def load_dimacs_without_external(ctl: Control, instance: str) -> dict:
     """
     This method is only used internally. 
     It is meant to read the Vertex-Cover instance and feed it to clingo 
-    as external atoms.
+    as facts.
     """
-    result = dict()
-    with open(instance, "r", encoding="utf-8") as f:
-        parameters = f.readline().strip().split(" ")
-        while parameters[0] == "c":
-            parameters = f.readline().strip().split(" ")
-        if parameters[0] != "p" or parameters[1] != "vc":
-            raise Exception
+    n, undirected, edges = read_vc(instance)
 
-        n = int(parameters[2])
-        result["undirected"] = ("<->" in parameters)
+    facts = [f"vertex({v})." for v in range(1,n+1)]
+    facts.extend(f"edge({v}, {u})." for v, u in edges)
+    ctl.add("instance", [], "\n".join(facts))
 
-        for v in range(1,n+1):
-            ctl.add("instance", [], f"vertex({v}).")
-
-        for line in f:
-            if line[0] == "c":
-                continue
-
-            v, edge_list = line.split("|")
-            v = int(v)
-            
-            edge_list = edge_list.strip()
-            edge_list = [int(v) for v in edge_list.split(" ")]
-            
-            for u in edge_list:
-                ctl.add("instance", [], f"edge({v}, {u}).")
-
-    return result
+    return {"undirected": undirected}
 
 def load_dimacs_with_external(ctl: Control, instance: str) -> dict:
     """
@@ -53,37 +43,24 @@ def load_dimacs_with_external(ctl: Control, instance: str) -> dict:
     It is meant to read the Vertex-Cover instance and feed it to clingo 
     as external atoms.
     """
-    result = dict()
-    with open(instance, "r", encoding="utf-8") as f:
-        parameters = f.readline().strip().split(" ")
-        while parameters[0] == "c":
-            parameters = f.readline().strip().split(" ")
-        if parameters[0] != "p" or parameters[1] != "vc":
-            raise Exception
-
-        n = int(parameters[2])
-        result["undirected"] = ("<->" in parameters)
-
-        with SymbolicBackend(ctl.backend()) as backend:
-            for v in range(1,n+1):
-                backend.add_external(Function("vertex", [Number(v)]), TruthValue(True))
+    n, undirected, edges = read_vc(instance)
+    add_instance_externals(ctl, n, undirected, edges)
 
-            for line in f:
-                if line.strip().split(" ")[0] == "c":
-                    continue
+    return {"undirected": undirected}
 
-                v, edge_list = line.split("|")
-                v = int(v)
-                
-                edge_list = edge_list.strip()
-                edge_list = [int(v) for v in edge_list.split(" ")]
-                
-                for u in edge_list:
-                    backend.add_external(Function("edge", [Number(v), Number(u)]), TruthValue(True))
-                    if result["undirected"]:
-                        backend.add_external(Function("edge", [Number(u), Number(v)]), TruthValue(True))
+def add_instance_externals(ctl: Control, n: int, undirected: bool, edges: List[Tuple[int, int]]):
+    """
+    Adds the vertices `1..n` and the `edges`, in both directions if `undirected`,
+    as true externals in a single backend session.
+    """
+    with SymbolicBackend(ctl.backend()) as backend:
+        for v in range(1,n+1):
+            backend.add_external(Function("vertex", [Number(v)]), TruthValue(True))
 
-    return result
+        for v, u in edges:
+            backend.add_external(Function("edge", [Number(v), Number(u)]), TruthValue(True))
+            if undirected:
+                backend.add_external(Function("edge", [Number(u), Number(v)]), TruthValue(True))
 
 def load_asp(ctl: Control, instance: str):
     # We basically throw the instance into a temporary
@@ -197,12 +174,108 @@ class VertexCoverSolver(ABC):
         """
         raise NotImplementedError
 
+    @abstractmethod
+    def compact(self):
+        """
+        Rebuilds the ground program in a fresh `Control` from the live vertices and edges only,
+        dropping the rules of all deleted ones.
+        """
+        raise NotImplementedError
+
+    def make_control(self):
+        """
+        Sets up a fresh `Control`, with the program observer in debug mode
+        and the program counters of `metrics` if enabled.
+        """
+        self.ctl = Control(arguments=["--models=0"])
+        self.prg = None
+        if self.debug:
+            self.prg = Program()
+            self.ctl.register_observer(ProgramObserver(self.prg))
+        if self.metrics is not None:
+            self.metrics.attach(self.ctl)
+
+    def measure(self, op: str, **fields):
+        """
+        Returns a context manager recording the enclosed operation in `metrics`, if enabled.
+        """
+        if self.metrics is None:
+            return nullcontext({})
+        return self.metrics.measure(op, self, **fields)
+
+    def count_covers(self, assumptions: List[int] = [], cap: int | None = None, timeout: float | None = None) -> Tuple[int, bool]:
+        """
+        Counts the solutions of the current Vertex-Cover instance under `assumptions` inside clasp,
+        without the Python callback per model of `solve`, and stores the count in `model_count`.
+
+        Stops after `cap` solutions or `timeout` seconds. Returns the number of solutions found
+        (at most `cap`) and whether these are all of them.
+        """
+        self.maybe_compact()
+        with self.measure("solve", mode="count"):
+            self.model_count, complete = count_models(self.ctl, assumptions, cap, timeout)
+        self.finish_compaction_stats()
+        return self.model_count, complete
+
+    def dead_fraction(self) -> float:
+        """
+        Returns the fraction of the vertex and edge atoms in the ground program
+        that have been deleted since.
+        """
+        if self.grounded == 0:
+            return 0.0
+        return 1 - (len(self.vertices) + len(self.edges)) / self.grounded
+
+    def maybe_compact(self):
+        """
+        Calls `compact` if more than `compact_threshold` of the vertex and edge atoms are dead.
+        The program statistics before the rebuild are appended to `compactions`, and those after it
+        by `finish_compaction_stats`, since the statistics of a `Control` must not be read before its first `solve` call.
+        """
+        if self.compact_threshold is None or self.grounded < COMPACT_MIN_ATOMS \
+                or self.dead_fraction() <= self.compact_threshold:
+            return
+
+        stats = {"dead_fraction": self.dead_fraction(), "before": program_stats(self.ctl)}
+        start = time.perf_counter()
+        with self.measure("compact"):
+            self.compact()
+        stats["rebuild_time"] = time.perf_counter() - start
+        stats["after"] = None
+        self.compactions.append(stats)
+
+    def finish_compaction_stats(self):
+        """
+        Completes the statistics of a preceding rebuild with those of the first `solve` call after it.
+        """
+        if self.compactions and self.compactions[-1]["after"] is None:
+            self.compactions[-1]["after"] = program_stats(self.ctl)
+
+    def track_instance(self):
+        """
+        Initializes the live vertices and edges from the freshly loaded instance.
+        """
+        self.vertices = {x.symbol.arguments[0].number for x in self.ctl.symbolic_atoms.by_signature("vertex", 1)}
+        self.edges = {(x.symbol.arguments[0].number, x.symbol.arguments[1].number) for x in self.ctl.symbolic_atoms.by_signature("edge", 2)}
+        self.grounded = len(self.vertices) + len(self.edges)
+
+    def add_externals(self):
+        """
+        Adds the live vertices and edges as true externals to the ground program.
+        """
+        with SymbolicBackend(self.ctl.backend()) as backend:
+            for v in self.vertices:
+                backend.add_external(Function("vertex", [Number(v)]), TruthValue(True))
+            for v, u in self.edges:
+                backend.add_external(Function("edge", [Number(v), Number(u)]), TruthValue(True))
+        self.grounded = len(self.vertices) + len(self.edges)
+
 class BussSolver(VertexCoverSolver):
     '''
     A simple, incremental Vertex-Cover solver using clingo.
     It follows the structure of IPAFAIR, an incremental API for AF solvers.
     '''
-    def __init__(self, instance: str, k = 3):
+    def __init__(self, instance: str, k = 3, compact_threshold: float | None = 0.75, debug = False, metrics = False):
         """
         Instanciates a VertexCoverSolver for the specified instance
         and given instance k. This also prepares clingo with the 
@@ -215,9 +288,22 @@ class BussSolver(VertexCoverSolver):
         k
             The parameter for the Vertex-Cover size used in
             the initial computation of Buss's kernel.
+        compact_threshold
+            The fraction of deleted vertices and edges among the grounded ones
+            above which `solve` first rebuilds the ground program, see `compact`.
+            `None` disables the rebuild.
+        debug
+            Keeps a copy of the ground program in `prg` and prints it.
+        metrics
+            Records the wall time of every mutation, grounding step and solve call
+            in `metrics`, see `metrics.Metrics`.
         """
         self.undirected = True
+        self.debug = debug
+        self.metrics = Metrics() if metrics else None
         self.k = k
+        self.compact_threshold = compact_threshold
+        self.compactions: List[dict] = []
 
         def load_instance_with_external(instance: str):
             """
@@ -225,26 +311,8 @@ class BussSolver(VertexCoverSolver):
             It is meant to read the Vertex-Cover instance and feed it to clingo 
             as external atoms.
             """
-            with open(instance, "r", encoding="utf-8") as f:
-                parameters = f.readline().strip().split(" ")
-                n = int(parameters[0])
-                self.undirected = (parameters[1] == "<->")
-
-                with SymbolicBackend(self.ctl.backend()) as backend:
-                    for v in range(1,n+1):
-                        backend.add_external(Function("vertex", [Number(v)]), TruthValue(True))
-
-                    for line in f:
-                        v, edge_list = line.split("|")
-                        v = int(v)
-                        
-                        edge_list = edge_list.strip()
-                        edge_list = [int(v) for v in edge_list.split(" ")]
-                        
-                        for u in edge_list:
-                            backend.add_external(Function("edge", [Number(v), Number(u)]), TruthValue(True))
-                            if self.undirected:
-                                backend.add_external(Function("edge", [Number(u), Number(v)]), TruthValue(True))
+            n, self.undirected, edges = read_vc(instance)
+            add_instance_externals(self.ctl, n, self.undirected, edges)
 
         def parse_logic_program_instance(instance: str):
             vertices = []
@@ -264,29 +332,30 @@ class BussSolver(VertexCoverSolver):
 
             return vertices
                 
-        self.ctl = Control(arguments=["--models=0"])
+        self.make_control()
         # self.ctl = Control()
 
-        self.prg = Program()
-        self.ctl.register_observer(ProgramObserver(self.prg))
-        
         load_instance_with_external(instance)
+        self.track_instance()
         # self.ctl.load("asp/incr-vc.lp")
         self.ctl.load("asp/buss-kernel.lp")
-        print(" === Grounded program ===")
-        print(self.prg)
+        if self.debug:
+            print(" === Grounded program ===")
+            print(self.prg)
 
         # self.ctl.add("debug", [], "#show in/1. #show out/1. #show kernel/1. #show low/1. #show next_to_kernel/1. #show test/1.")
         self.ctl.add("debug", [], "#show in/1.")
 
-        self.ctl.ground([
-            # ("init", []),
-            ("init", [Number(k)]),
-            # ("instance", [])
-        ])
+        with self.measure("ground"):
+            self.ctl.ground([
+                # ("init", []),
+                ("init", [Number(k)]),
+                # ("instance", [])
+            ])
 
-        print(" === Grounded program ===")
-        print(self.prg)
+        if self.debug:
+            print(" === Grounded program ===")
+            print(self.prg)
 
     def add_vertex(self, v: int):
         """
@@ -300,11 +369,15 @@ class BussSolver(VertexCoverSolver):
         v
             The index of the added vertex.
         """
-        if Function("vertex", [Number(v)]) in self.ctl.symbolic_atoms:
-            self.ctl.assign_external(Function("vertex", [Number(v)]), True)
-        else:
-            self.ctl.ground([("add_vertex", [Number(v)])])
-            self.ctl.assign_external(Function("vertex", [Number(v)]), True)
+        with self.measure("mutate", method="add_vertex"):
+            if Function("vertex", [Number(v)]) in self.ctl.symbolic_atoms:
+                self.ctl.assign_external(Function("vertex", [Number(v)]), True)
+            else:
+                with self.measure("ground"):
+                    self.ctl.ground([("add_vertex", [Number(v)])])
+                self.ctl.assign_external(Function("vertex", [Number(v)]), True)
+                self.grounded += 1
+            self.vertices.add(v)
 
     def add_edge(self, v: int, u: int):
         """
@@ -323,11 +396,14 @@ class BussSolver(VertexCoverSolver):
         u
             The index of the target of the added edge. 
         """
-        self.ctl.ground([("add_edge", [Number(v), Number(u)])])
-        self.ctl.assign_external(Function("edge", [Number(v), Number(u)]), True)
-        if self.undirected:
-            self.ctl.ground([("add_edge", [Number(u), Number(v)])])
-            self.ctl.assign_external(Function("edge", [Number(u), Number(v)]), True)
+        with self.measure("mutate", method="add_edge"):
+            for e in ([(v, u), (u, v)] if self.undirected else [(v, u)]):
+                if Function("edge", [Number(e[0]), Number(e[1])]) not in self.ctl.symbolic_atoms:
+                    self.grounded += 1
+                with self.measure("ground"):
+                    self.ctl.ground([("add_edge", [Number(e[0]), Number(e[1])])])
+                self.ctl.assign_external(Function("edge", [Number(e[0]), Number(e[1])]), True)
+                self.edges.add(e)
 
     def del_vertex(self, v: int):
         """
@@ -340,19 +416,15 @@ class BussSolver(VertexCoverSolver):
         v
             The index of the deleted vertex.
         """
-        if Function("vertex", [Number(v)]) in self.ctl.symbolic_atoms:
-            self.ctl.assign_external(Function("vertex", [Number(v)]), False)
-
-        edges = [x.symbol for x in vc.ctl.symbolic_atoms.by_signature("edge", 2) if (x.symbol.arguments[0] == Number(v))]
+        with self.measure("mutate", method="del_vertex"):
+            if Function("vertex", [Number(v)]) in self.ctl.symbolic_atoms:
+                self.ctl.assign_external(Function("vertex", [Number(v)]), False)
+            self.vertices.discard(v)
 
-        for e in edges:
-            self.del_edge(e.arguments[0].number, e.arguments[1].number)
+            edges = [e for e in self.edges if v in e]
 
-        if not self.undirected:
-            edges = [x.symbol for x in vc.ctl.symbolic_atoms.by_signature("edge", 2) if (x.symbol.arguments[1] == Number(v))]
-        
             for e in edges:
-                self.del_edge(e.arguments[0].number, e.arguments[1].number)
+                self.__del_edge(e[0], e[1])
 
     def del_edge(self, v: int, u: int) -> None:
         """
@@ -370,12 +442,20 @@ class BussSolver(VertexCoverSolver):
         u
             The index of the target of the deleted edge. 
         """
+        with self.measure("mutate", method="del_edge"):
+            self.__del_edge(v, u)
+
+    def __del_edge(self, v: int, u: int):
         if Function("edge", [Number(v), Number(u)]) in self.ctl.symbolic_atoms:
             self.ctl.assign_external(Function("edge", [Number(v), Number(u)]), False)
 
             if self.undirected:
                 self.ctl.assign_external(Function("edge", [Number(u), Number(v)]), False)
 
+        self.edges.discard((v, u))
+        if self.undirected:
+            self.edges.discard((u, v))
+
     
     def solve(self, assumptions: List[int] = []) -> bool:
         """
@@ -386,8 +466,11 @@ class BussSolver(VertexCoverSolver):
             self.model_count += 1
             # print(m)
 
+        self.maybe_compact()
         self.model_count = 0
-        result = self.ctl.solve(assumptions, on_model=on_model)
+        with self.measure("solve"):
+            result = self.ctl.solve(assumptions, on_model=on_model)
+        self.finish_compaction_stats()
 
         print(self.model_count)
 
@@ -400,14 +483,25 @@ class BussSolver(VertexCoverSolver):
         """
         raise NotImplementedError
 
-class SimpleVertexCoverSolver(VertexCoverSolver):
-    def __init__(self, instance: str = "", debug = False, show_models = False, format: str = "dimacs_incr"):
-        self.ctl = Control(arguments=["--models=0"])
-        self.prg = Program()
-        self.ctl.register_observer(ProgramObserver(self.prg))
+    def compact(self):
+        """
+        Rebuilds the ground program in a fresh `Control` from the live vertices and edges only,
+        which also recomputes Buss's kernel for the current graph.
+        """
+        self.make_control()
+
+        self.add_externals()
+        self.ctl.load("asp/buss-kernel.lp")
+        self.ctl.add("debug", [], "#show in/1.")
+        self.ctl.ground([("init", [Number(self.k)])])
 
+class SimpleVertexCoverSolver(VertexCoverSolver):
+    def __init__(self, instance: str = "", debug = False, show_models = False, format: str = "dimacs_incr", compact_threshold: float | None = 0.75,
+                 metrics = False):
         self.debug = debug
         self.show_models = show_models
+        self.metrics = Metrics() if metrics else None
+        self.make_control()
 
         parameters = dict()
         if instance:
@@ -426,64 +520,102 @@ class SimpleVertexCoverSolver(VertexCoverSolver):
 
         self.undirected = parameters.get("undirected", True)
 
+        # Deleted vertices and edges can only be dropped from instances given as externals.
+        self.compact_threshold = compact_threshold if format != "dimacs" else None
+        self.compactions: List[dict] = []
+        self.track_instance()
+
         self.ctl.load("asp/vertex-cover.lp")
         self.ctl.add("debug", [], "#show in/1.")
-        self.ctl.ground([("init", [])])
+        with self.measure("ground"):
+            self.ctl.ground([("init", [])])
 
         if self.debug and instance:
             print("\n === Ground program ===")
             print(self.prg)
 
     def add_vertex(self, v: int):
-        old = Function("vertex", [Number(v)]) in self.ctl.symbolic_atoms
+        with self.measure("mutate", method="add_vertex"):
+            old = Function("vertex", [Number(v)]) in self.ctl.symbolic_atoms
 
-        # self.del_vertex(v)
-        with SymbolicBackend(self.ctl.backend()) as backend:
-            backend.add_external(Function("vertex", [Number(v)]), TruthValue(True))
+            # self.del_vertex(v)
+            with SymbolicBackend(self.ctl.backend()) as backend:
+                backend.add_external(Function("vertex", [Number(v)]), TruthValue(True))
 
-        if not old: self.ctl.ground([("add_vertex", [Number(v)])])
+            if not old:
+                with self.measure("ground"):
+                    self.ctl.ground([("add_vertex", [Number(v)])])
 
-    def add_edge(self, v: int, u: int):
-        old = Function("edge", [Number(v), Number(u)]) in self.ctl.symbolic_atoms
+            self.vertices.add(v)
+            if not old: self.grounded += 1
 
-        # self.del_edge(u,v)
-        with SymbolicBackend(self.ctl.backend()) as backend:
-            backend.add_external(Function("edge", [Number(v), Number(u)]), TruthValue(True))
-            if self.undirected:
-                backend.add_external(Function("edge", [Number(u), Number(v)]), TruthValue(True))
+    def add_edge(self, v: int, u: int):
+        with self.measure("mutate", method="add_edge"):
+            old = Function("edge", [Number(v), Number(u)]) in self.ctl.symbolic_atoms
+            edges = [(v, u), (u, v)] if self.undirected else [(v, u)]
+            self.grounded += sum(1 for e in set(edges) if Function("edge", [Number(e[0]), Number(e[1])]) not in self.ctl.symbolic_atoms)
+            self.edges.update(edges)
+
+            # self.del_edge(u,v)
+            with SymbolicBackend(self.ctl.backend()) as backend:
+                backend.add_external(Function("edge", [Number(v), Number(u)]), TruthValue(True))
+                if self.undirected:
+                    backend.add_external(Function("edge", [Number(u), Number(v)]), TruthValue(True))
 
-        if not old: self.ctl.ground([("add_edge", [Number(v), Number(u)])])
+            if not old:
+                with self.measure("ground"):
+                    self.ctl.ground([("add_edge", [Number(v), Number(u)])])
 
     def del_vertex(self, v: int):
-        # self.ctl.release_external(Function("vertex", [Number(v)]))
-        self.ctl.assign_external(Function("vertex", [Number(v)]), False)
+        with self.measure("mutate", method="del_vertex"):
+            # self.ctl.release_external(Function("vertex", [Number(v)]))
+            self.ctl.assign_external(Function("vertex", [Number(v)]), False)
+            self.vertices.discard(v)
 
-        for edge in self.ctl.symbolic_atoms.by_signature("edge", 2):
-            A, B = edge.symbol.arguments
-            if Number(v) == A or Number(v) == B:
-                self.ctl.assign_external(Function("edge", [A, B]), False)
+            for e in [e for e in self.edges if v in e]:
+                self.ctl.assign_external(Function("edge", [Number(e[0]), Number(e[1])]), False)
+                self.edges.discard(e)
 
 
     def del_edge(self, v: int, u: int):
-        # self.ctl.release_external(Function("edge", [Number(v), Number(u)]))
-        self.ctl.assign_external(Function("edge", [Number(v), Number(u)]), False)
-        if self.undirected:
-            # self.ctl.release_external(Function("edge", [Number(u), Number(v)]))
-            self.ctl.assign_external(Function("edge", [Number(u), Number(v)]), False)
+        with self.measure("mutate", method="del_edge"):
+            # self.ctl.release_external(Function("edge", [Number(v), Number(u)]))
+            self.ctl.assign_external(Function("edge", [Number(v), Number(u)]), False)
+            if self.undirected:
+                # self.ctl.release_external(Function("edge", [Number(u), Number(v)]))
+                self.ctl.assign_external(Function("edge", [Number(u), Number(v)]), False)
+
+            self.edges.discard((v, u))
+            if self.undirected:
+                self.edges.discard((u, v))
 
     def solve(self, assumptions: List[int] = []) -> bool:
         def on_model(m: Model):
             self.model_count += 1
             if self.show_models: print(m)
 
+        self.maybe_compact()
         self.model_count = 0
-        result = self.ctl.solve(assumptions, on_model=on_model)
+        with self.measure("solve"):
+            result = self.ctl.solve(assumptions, on_model=on_model)
+        self.finish_compaction_stats()
 
         return cast(SolveResult, result).satisfiable == True
 
     def extract_witness(self) -> List[int]:
         raise NotImplementedError
 
+    def compact(self):
+        """
+        Rebuilds the ground program in a fresh `Control` from the live vertices and edges only.
+        """
+        self.make_control()
+
+        self.add_externals()
+        self.ctl.load("asp/vertex-cover.lp")
+        self.ctl.add("debug", [], "#show in/1.")
+        self.ctl.ground([("init", [])])
+
 if __name__ == "__main__":
     def dump_ground_program(vc: SimpleVertexCoverSolver):
         print("\n === Ground program ===")